@@ -0,0 +1,23 @@
+"""
+Copyright (C) J Leadbetter <j@jleadbetter.com>
+Affero GPL v3
+"""
+
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from common.utils.cache import ChangeSignal
+
+from .models import AppSettings
+
+
+@receiver(post_save, sender=AppSettings)
+@receiver(post_delete, sender=AppSettings)
+def notify_app_settings_changed(sender, **kwargs):
+    """
+    Tell every process sharing this database that the settings changed,
+    so they can drop their cached copy.
+    This also covers changes made through the Django admin.
+    """
+    ChangeSignal(settings.APP_SETTINGS_SIGNAL_FILE).notify()
@@ -21,14 +21,12 @@ PROJECT_DIR = BASE_DIR.parent
 if str(PROJECT_DIR) not in sys.path:
     sys.path.append(str(PROJECT_DIR))
 
-from common.stores.config import ConfigStore
-from common.utils.files import get_upload_dir
+from common.utils.files import read_upload_dir
 
-SETTINGS_STORE_FILE = PROJECT_DIR / 'setup.cfg'
-SETTINGS_STORE_CFG = 'dev.django'
-SETTINGS_STORE = ConfigStore(SETTINGS_STORE_FILE, SETTINGS_STORE_CFG)
-
-MEDIA_ROOT = get_upload_dir().as_posix()
+# NOTE: This reads setup.cfg directly, with the DefaultConfig,
+# so importing the settings doesn't create the ConfigStore
+# before the app chooses its own config.
+MEDIA_ROOT = read_upload_dir().as_posix()
 
 ###############################################################################
 #                                                                             #
@@ -101,9 +99,25 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Several frontend workers can share the database (scripts/serve.py).
+        # WAL lets readers carry on while another process writes,
+        # and writers wait for the lock instead of failing right away.
+        'OPTIONS': {
+            'init_command': 'PRAGMA journal_mode=WAL;',
+            'transaction_mode': 'IMMEDIATE',
+            'timeout': 20,
+        },
     },
 }
 
+# Touched whenever AppSettings change,
+# so processes sharing the database can drop their cached settings.
+APP_SETTINGS_SIGNAL_FILE = BASE_DIR / 'app_settings.signal'
+
+# Touched whenever users are added or removed,
+# so processes sharing the database can drop their cached user checks.
+USERS_SIGNAL_FILE = BASE_DIR / 'users.signal'
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -0,0 +1,26 @@
+"""
+Copyright (C) J Leadbetter <j@jleadbetter.com>
+Affero GPL v3
+"""
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from common.utils.cache import ChangeSignal
+
+from .models.profile import UserProfile
+
+
+@receiver(post_save, sender=UserProfile)
+@receiver(post_delete, sender=UserProfile)
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def notify_users_changed(sender, **kwargs):
+    """
+    Tell every process sharing this database that users were added,
+    removed or (de)activated, so they can check for users again.
+    This also covers changes made through the Django admin.
+    """
+    ChangeSignal(settings.USERS_SIGNAL_FILE).notify()
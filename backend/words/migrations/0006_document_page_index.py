@@ -0,0 +1,18 @@
+# Generated by Django 5.1.5 on 2026-10-19 19:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+        ('words', '0005_wordform'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='document',
+            index=models.Index(fields=['user', 'language_code', 'display_name', 'id'], name='words_docum_user_id_ad9667_idx'),
+        ),
+    ]
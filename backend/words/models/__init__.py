@@ -4,3 +4,5 @@ Affero GPL v3
 """
 
 from .documents import Document
+from .sentences import Sentence
+from .words import Word, WordForm
@@ -23,6 +23,10 @@ class Document(models.Model):
     class Meta:
         ordering = ['language_code', 'display_name']
         unique_together = [['user', 'display_name', 'language_code']]
+        indexes = [
+            # For paging through a user's documents in order
+            models.Index(fields=['user', 'language_code', 'display_name', 'id']),
+        ]
 
     id = models.UUIDField(
         primary_key=True,
@@ -0,0 +1,63 @@
+"""
+Copyright (C) J Leadbetter <j@jleadbetter.com>
+Affero GPL v3
+"""
+
+import uuid
+
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+from common.utils.languages import language_code_choices
+
+from users.models.profile import UserProfile
+
+from .documents import Document
+
+
+class Sentence(models.Model):
+    """
+    Sentence from a document, or an example sentence.
+    """
+
+    class Meta:
+        ordering = ['document', 'ordering']
+        indexes = [
+            # Loading a window of a document's sentences
+            models.Index(fields=['document', 'ordering']),
+        ]
+
+    id = models.UUIDField(
+        primary_key=True,
+        blank=True,
+        editable=False,
+        default=uuid.uuid4,
+    )
+    user = models.ForeignKey(
+        UserProfile,
+        on_delete=models.CASCADE,
+        help_text=_('User who owns this sentence'),
+    )
+    document = models.ForeignKey(
+        Document,
+        on_delete=models.CASCADE,
+        blank=True,
+        null=True,
+        related_name='sentences',
+        help_text=_('Document the sentence comes from, if any'),
+    )
+    ordering = models.PositiveIntegerField(
+        blank=True,
+        null=True,
+        help_text=_('Position of the sentence in the document'),
+    )
+    language_code = models.CharField(
+        max_length=8,
+        choices=language_code_choices,
+        help_text=_('Language of the sentence'),
+    )
+    text = models.TextField()
+    enabled_for_study = models.BooleanField(default=False)
+
+    def __str__(self):
+        return self.text
@@ -0,0 +1,90 @@
+"""
+Copyright (C) J Leadbetter <j@jleadbetter.com>
+Affero GPL v3
+"""
+
+import uuid
+
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+from common.utils.languages import language_code_choices
+
+
+class Word(models.Model):
+    """
+    Base form of a word, e.g. from a frequency list,
+    with its grammar and translations.
+    """
+
+    class Meta:
+        # Also the index for looking up words by base word
+        unique_together = [['language_code', 'base_word']]
+
+    id = models.UUIDField(
+        primary_key=True,
+        blank=True,
+        editable=False,
+        default=uuid.uuid4,
+    )
+    language_code = models.CharField(
+        max_length=8,
+        choices=language_code_choices,
+        help_text=_('Language of the word'),
+    )
+    base_word = models.CharField(
+        max_length=255,
+        help_text=_('Base (non-conjugated) form of the word'),
+    )
+    frequency = models.PositiveIntegerField(
+        blank=True,
+        null=True,
+        help_text=_('Rank of the word in a frequency list'),
+    )
+    grammar_type = models.CharField(
+        max_length=32,
+        default='Unknown',
+        help_text=_('Name of the grammar model, e.g. Noun'),
+    )
+    type = models.JSONField(
+        default=dict,
+        help_text=_('Grammar of the word, e.g. its conjugations'),
+    )
+    translations = models.JSONField(
+        default=list,
+        blank=True,
+    )
+
+    def __str__(self):
+        return self.base_word
+
+
+class WordForm(models.Model):
+    """
+    Index of the forms of each word (its base word and inflections),
+    for finding words by any of their forms.
+    """
+
+    class Meta:
+        unique_together = [['word', 'text']]
+        indexes = [
+            models.Index(fields=['language_code', 'text']),
+        ]
+
+    word = models.ForeignKey(
+        Word,
+        on_delete=models.CASCADE,
+        related_name='forms',
+    )
+    # Copied from the word, so lookups don't need a join
+    language_code = models.CharField(
+        max_length=8,
+        choices=language_code_choices,
+    )
+    text = models.CharField(
+        max_length=255,
+        help_text=_('Base word or inflected form, e.g. a conjugation'),
+    )
+
+    def __str__(self):
+        return self.text
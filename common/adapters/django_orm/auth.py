@@ -5,13 +5,13 @@ Affero GPL v3
 
 from typing import Optional
 
-from django.contrib.auth import authenticate
 from django.contrib.auth.models import User
 
 from ...models.errors import ObjectNotFoundError
 from ...models.users import UserUI
 from ...ports.auth import AuthInvalidError, AuthPort
 from ...stores.adapter import AdapterStore
+from .passwords import PasswordHashPool, PasswordHashTimeoutError
 
 
 class AuthDjangoORMAdapter(AuthPort):
@@ -29,11 +29,19 @@ class AuthDjangoORMAdapter(AuthPort):
           Please create an AuthDjangoAPIAdapter
           if you wish to authenticate via http requests
           and let Django manage the session.
+
+    Password hashes are checked in the shared PasswordHashPool.
+    Configure it with `HashWorkers`, `HashQueue` and `HashTimeout`
+    in the `adapters.common` section of setup.cfg.
     """
     def __init__(self, **kwargs):
-        # Ignore any kwargs configuration.
-        # This uses the django settings.
+        # Everything except the hash pool uses the django settings.
         super().__init__()
+        self.password_pool = PasswordHashPool(
+            workers=kwargs.get('hashworkers'),
+            timeout=kwargs.get('hashtimeout'),
+            queue=kwargs.get('hashqueue'),
+        )
         self._app_settings = None
         self._user_db_adapter = None
         self._user_ui_adapter = None
@@ -65,6 +73,34 @@ class AuthDjangoORMAdapter(AuthPort):
             self._user_ui_adapter = AdapterStore().get('UserUIPort')
         return self._user_ui_adapter
 
+    def _authenticate(self, username: str, password: str) -> Optional[User]:
+        # Mirrors django.contrib.auth.backends.ModelBackend.authenticate,
+        # but hands the slow part to the hash pool.
+        try:
+            user = User.objects.get(username=username)
+        except User.DoesNotExist:
+            user = None
+
+        try:
+            if not user or not user.is_active:
+                # Hash anyway, so response times don't reveal
+                # whether the username exists.
+                self.password_pool.make_password(password)
+                return None
+
+            is_correct, needs_upgrade = self.password_pool.check_password(
+                password,
+                user.password,
+            )
+            if is_correct and needs_upgrade:
+                user.password = self.password_pool.make_password(password)
+                user.save(update_fields=['password'])
+        except PasswordHashTimeoutError:
+            # This message is only for internal logging.
+            raise AuthInvalidError('Timed out while checking password')
+
+        return user if is_correct else None
+
     def login(self, username: str, password: Optional[str]=None) -> UserUI:
         """
         Log a user in.
@@ -77,11 +113,7 @@ class AuthDjangoORMAdapter(AuthPort):
         """
         user = None
         if password:
-            user = authenticate(
-                request=None,
-                username=username,
-                password=password,
-            )
+            user = self._authenticate(username, password)
         elif self.app_settings.get().passwordless_login:
             # The app is configured with passwordless login.
             # We only need to get the user with the right username.
@@ -5,17 +5,26 @@ Affero GPL v3
 
 import uuid
 from pathlib import Path
-from typing import List
+from typing import Dict, Iterator, List, Optional
 
 from django.core.files import File
+from django.db.models import Count
 from django.db.utils import IntegrityError
 
 from users.models import UserProfile
-from words.models import Document
+from words.models import Document, Sentence
 
-from ...models.documents import DocumentDB
+from ...models.documents import DocumentDB, DocumentSummary
 from ...models.errors import ObjectNotFoundError
-from ...ports.documents import DocumentDBPort, DocumentUIPort
+from ...models.pages import Page
+from ...models.sentences import SentenceDB
+from ...ports.documents import (
+    DEFAULT_CHUNK_SIZE,
+    DEFAULT_PAGE_SIZE,
+    DocumentDBPort,
+    DocumentUIPort,
+)
+from .pagination import paginate_queryset
 
 
 class DocumentDBDjangoORMAdapter(DocumentDBPort):
@@ -30,13 +39,26 @@ class DocumentDBDjangoORMAdapter(DocumentDBPort):
     def _django_to_pydantic(self, document: Document) -> DocumentDB:
         docdb = DocumentDB(
             id=document.id,
-            user_id=document.user.id,
+            # Avoids fetching the user for every document
+            user_id=document.user_id,
             display_name=document.display_name,
             language_code=document.language_code,
             attrs=document.attrs,
         )
         return docdb
 
+    def _sentence_to_pydantic(self, sentence: Sentence) -> SentenceDB:
+        sentencedb = SentenceDB(
+            id=sentence.id,
+            user_id=sentence.user_id,
+            document_id=sentence.document_id,
+            ordering=sentence.ordering,
+            language_code=sentence.language_code,
+            text=sentence.text,
+            enabled_for_study=sentence.enabled_for_study,
+        )
+        return sentencedb
+
     def create_or_update(self, document: DocumentDB) -> DocumentDB:
         """
         Create a document in the database,
@@ -102,6 +124,43 @@ class DocumentDBDjangoORMAdapter(DocumentDBPort):
         docdb = self._django_to_pydantic(doc)
         return docdb
 
+    def find_by_name(
+        self,
+        user_id: uuid.UUID,
+        display_name: str,
+        language_code: str,
+    ) -> Optional[DocumentDB]:
+        """
+        Find a document by the fields that make it unique for a user,
+        without changing anything.
+
+        :user_id: The user's id that owns the document
+        :display_name: Display name of the document
+        :language_code: 2-letter language code of the document
+
+        :return: Matching DocumentDB, or None if there isn't one.
+        """
+        doc = Document.objects.filter(
+            user__id=user_id,
+            display_name=display_name,
+            language_code=language_code,
+        ).first()
+        return self._django_to_pydantic(doc) if doc else None
+
+    def delete(self, id: uuid.UUID, user_id: uuid.UUID) -> bool:
+        """
+        Delete a document and its sentences.
+
+        :id: The id of the document
+        :user_id: The user's id that owns the document
+
+        :return: boolean -- true if deleted, false if the document
+            does not exist for the user.
+        """
+        # Sentences are removed by the cascade
+        deleted, _ = Document.objects.filter(id=id, user__id=user_id).delete()
+        return bool(deleted)
+
     def get_all(self, user_id: uuid.UUID) -> List[DocumentDB]:
         """
         Get all documents for the specified user.
@@ -114,3 +173,219 @@ class DocumentDBDjangoORMAdapter(DocumentDBPort):
         docdbs = [self._django_to_pydantic(doc) for doc in docs]
         return docdbs
 
+    def iter_all(
+        self,
+        user_id: uuid.UUID,
+        chunk_size: Optional[int]=DEFAULT_CHUNK_SIZE,
+    ) -> Iterator[DocumentDB]:
+        """
+        Stream all documents for the specified user,
+        without loading them all at once.
+
+        :user_id: The user's id who owns the documents
+        :chunk_size: Number of documents fetched at a time.
+
+        :return: Generator of documents (may be empty)
+        """
+        docs = Document.objects.filter(user__id=user_id)
+        for doc in docs.iterator(chunk_size=chunk_size):
+            yield self._django_to_pydantic(doc)
+
+    def get_cursor_page(
+        self,
+        user_id: uuid.UUID,
+        language_code: Optional[str]=None,
+        cursor: Optional[str]=None,
+        limit: Optional[int]=DEFAULT_PAGE_SIZE,
+    ) -> Page[DocumentDB]:
+        """
+        Get one page of documents for the specified user,
+        ordered by language code, display name and id.
+        Unlike `get_page`, deep pages are as quick as the first one.
+
+        :user_id: The user's id who owns the documents
+        :language_code: Only get documents in this language.
+            Defaults to all languages.
+        :cursor: `next_cursor` of the previous page.
+            Defaults to the first page.
+        :limit: Maximum number of documents to return.
+
+        :return: Page of documents, with the cursor of the next page.
+        :raises: CursorError if the cursor is invalid.
+            ValueError if `limit` is less than 1.
+        """
+        docs = Document.objects.filter(user__id=user_id)
+        if language_code:
+            docs = docs.filter(language_code=language_code)
+        return paginate_queryset(
+            docs,
+            ('language_code', 'display_name', 'id'),
+            'documents',
+            cursor,
+            limit,
+            self._django_to_pydantic,
+        )
+
+    def get_page(
+        self,
+        user_id: uuid.UUID,
+        language_code: Optional[str]=None,
+        offset: Optional[int]=0,
+        limit: Optional[int]=DEFAULT_PAGE_SIZE,
+    ) -> List[DocumentDB]:
+        """
+        Get one page of documents for the specified user,
+        ordered by language code and display name.
+
+        :user_id: The user's id who owns the documents
+        :language_code: Only get documents in this language.
+            Defaults to all languages.
+        :offset: Number of documents to skip.
+        :limit: Maximum number of documents to return.
+
+        :return: List of documents (may be empty)
+        """
+        docs = Document.objects.filter(user__id=user_id)
+        if language_code:
+            docs = docs.filter(language_code=language_code)
+        docs = docs.order_by('language_code', 'display_name', 'id')
+        docdbs = [
+            self._django_to_pydantic(doc)
+            for doc in docs[offset:offset + limit]
+        ]
+        return docdbs
+
+    def get_summary_page(
+        self,
+        user_id: uuid.UUID,
+        language_code: Optional[str]=None,
+        offset: Optional[int]=0,
+        limit: Optional[int]=DEFAULT_PAGE_SIZE,
+    ) -> List[DocumentSummary]:
+        """
+        Like `get_page`, but only get the id, display name
+        and language code of each document.
+
+        :user_id: The user's id who owns the documents
+        :language_code: Only get documents in this language.
+            Defaults to all languages.
+        :offset: Number of documents to skip.
+        :limit: Maximum number of documents to return.
+
+        :return: List of document summaries (may be empty)
+        """
+        docs = Document.objects.filter(user__id=user_id)
+        if language_code:
+            docs = docs.filter(language_code=language_code)
+        rows = docs.order_by('language_code', 'display_name', 'id') \
+                .values_list('id', 'display_name', 'language_code')
+        return [
+            DocumentSummary._make(row)
+            for row in rows[offset:offset + limit]
+        ]
+
+    def count_by_language(self, user_id: uuid.UUID) -> Dict[str, int]:
+        """
+        Count the documents the specified user has in each language.
+
+        :user_id: The user's id who owns the documents
+
+        :return: Dictionary of language code to number of documents.
+            Languages without documents are left out.
+        """
+        counts = Document.objects.filter(user__id=user_id) \
+            .values('language_code') \
+            .annotate(count=Count('id')) \
+            .order_by('language_code')
+        return {row['language_code']: row['count'] for row in counts}
+
+    def add_sentences(
+        self,
+        id: uuid.UUID,
+        user_id: uuid.UUID,
+        sentences: List[SentenceDB],
+    ) -> List[SentenceDB]:
+        """
+        Add sentences to the end of a document.
+
+        :id: The id of the document
+        :user_id: The user's id that owns the document
+        :sentences: Sentences to add. Sentences without an ordering
+            are numbered after the last sentence in the document.
+
+        :return: The sentences that were added.
+        :raises: ObjectNotFoundError if no matching document is found
+            for the user
+        """
+        try:
+            doc = Document.objects.get(id=id, user__id=user_id)
+        except Document.DoesNotExist as exc:
+            raise ObjectNotFoundError(exc)
+
+        last = Sentence.objects.filter(document=doc) \
+            .order_by('-ordering') \
+            .values_list('ordering', flat=True) \
+            .first()
+        next_ordering = 0 if last is None else last + 1
+
+        new_sentences = []
+        for sentence in sentences:
+            ordering = sentence.ordering
+            if ordering is None:
+                ordering = next_ordering
+            next_ordering = max(next_ordering, ordering + 1)
+            new_sentences.append(Sentence(
+                user_id=doc.user_id,
+                document=doc,
+                ordering=ordering,
+                language_code=sentence.language_code,
+                text=sentence.text,
+                enabled_for_study=sentence.enabled_for_study,
+            ))
+
+        Sentence.objects.bulk_create(new_sentences, batch_size=500)
+        return [self._sentence_to_pydantic(sentence) for sentence in new_sentences]
+
+    def count_sentences(self, id: uuid.UUID, user_id: uuid.UUID) -> int:
+        """
+        Count the sentences in a document.
+
+        :id: The id of the document
+        :user_id: The user's id that owns the document
+
+        :return: Number of sentences (0 if the document doesn't exist).
+        """
+        return Sentence.objects.filter(document_id=id, user_id=user_id).count()
+
+    def get_sentences(
+        self,
+        id: uuid.UUID,
+        user_id: uuid.UUID,
+        start: Optional[int]=0,
+        stop: Optional[int]=None,
+    ) -> List[SentenceDB]:
+        """
+        Get a window of sentences from a document.
+        Uses the (document, ordering) index,
+        so the cost depends on the size of the window, not the document.
+
+        :id: The id of the document
+        :user_id: The user's id that owns the document
+        :start: First ordering to include.
+        :stop: Ordering to stop before. Defaults to the end of the document.
+
+        :return: Sentences with start <= ordering < stop,
+            sorted by ordering (may be empty).
+        """
+        sentences = Sentence.objects.filter(
+            document_id=id,
+            user_id=user_id,
+            ordering__gte=start,
+        )
+        if stop is not None:
+            sentences = sentences.filter(ordering__lt=stop)
+        sentencedbs = [
+            self._sentence_to_pydantic(sentence)
+            for sentence in sentences.order_by('ordering')
+        ]
+        return sentencedbs
@@ -0,0 +1,87 @@
+"""
+Copyright (C) J Leadbetter <j@jleadbetter.com>
+Affero GPL v3
+"""
+
+from operator import attrgetter
+from typing import Any, Callable, List, Optional, Sequence
+
+from django.db.models import Model, Q, QuerySet
+
+from ...models.pages import Page
+from ...utils.cursors import check_limit, decode_cursor, make_page
+
+
+def after_key(fields: Sequence[str], key: Sequence[Any]) -> List[Q]:
+    """
+    Filters for the rows that sort after a key.
+    For fields (a, b), that's (a = x AND b > y), then (a > x).
+
+    Each filter is a single range of the index on `fields`,
+    and all the rows it matches sort before the rows of the next filter.
+    (A single OR of the filters would be simpler, but SQLite then scans
+    the index from the start, instead of seeking to the key.)
+
+    :fields: Fields the rows are sorted by, in order.
+    :key: Value of each field.
+
+    :return: Filters, in sort order.
+    """
+    return [
+        Q(
+            **dict(zip(fields[:index], key)),
+            **{f'{fields[index]}__gt': key[index]},
+        )
+        for index in reversed(range(len(fields)))
+    ]
+
+
+def paginate_queryset(
+    queryset: QuerySet,
+    fields: Sequence[str],
+    kind: str,
+    cursor: Optional[str],
+    limit: int,
+    convert: Callable[[Model], Any],
+) -> Page:
+    """
+    Get a page of a QuerySet, starting after the cursor.
+    The database uses the index on `fields` to find the start of the page,
+    instead of skipping rows like with an offset.
+    Usually one query is enough; more are only needed when a page
+    crosses into a new value of the first fields (e.g. a new language).
+
+    :queryset: Rows to page through.
+    :fields: Fields to sort by, which together must be unique.
+        Related fields can be used, e.g. 'user__username'.
+    :kind: Name of the list, for the cursor.
+    :cursor: Cursor of the previous page, or None for the first page.
+    :limit: Number of items on the page.
+    :convert: Converts a row to the item that is returned.
+
+    :return: Page of at most `limit` items.
+    :raises: CursorError if the cursor is invalid.
+        ValueError if the limit is less than 1.
+    """
+    # Check before slicing, because a negative slice would reach the database
+    check_limit(limit)
+    queryset = queryset.order_by(*fields)
+    if cursor is None:
+        rows = list(queryset[:limit + 1])
+    else:
+        key = decode_cursor(kind, cursor, len(fields))
+        rows = []
+        for query in after_key(fields, key):
+            rows.extend(queryset.filter(query)[:limit + 1 - len(rows)])
+            if len(rows) > limit:
+                break
+
+    getters = [attrgetter(field.replace('__', '.')) for field in fields]
+    page = make_page(
+        rows,
+        limit,
+        kind,
+        lambda row: [getter(row) for getter in getters],
+    )
+    page.items = [convert(row) for row in page.items]
+    return page
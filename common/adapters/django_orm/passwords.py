@@ -0,0 +1,143 @@
+"""
+Copyright (C) J Leadbetter <j@jleadbetter.com>
+Affero GPL v3
+
+Run Django's password hashing outside of the calling thread.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Optional, Tuple
+
+from django.contrib.auth.hashers import check_password, make_password
+
+from ...utils.singleton import Singleton
+
+
+DEFAULT_HASH_WORKERS = 4
+DEFAULT_HASH_QUEUE = 64
+DEFAULT_HASH_TIMEOUT = 10.0
+
+
+class PasswordHashTimeoutError(Exception):
+    """
+    Indicates that a password could not be hashed in the allotted time.
+    Raised when the pool is saturated or the hash itself takes too long.
+    """
+    pass
+
+
+class PasswordHashPool(metaclass=Singleton):
+    """
+    Dedicated worker pool for password hashing.
+
+    Django's hashers are deliberately slow (PBKDF2 by default).
+    Running them in a bounded pool keeps a burst of logins
+    from starving everything else in the process,
+    and the timeout keeps a stuck hash from hanging callers forever.
+
+    A request holds its slot in the pool until its hash finishes,
+    even if the caller has already given up waiting for it,
+    so there are never more than `workers + queue` hashes in flight.
+
+    NOTE: Only the hashing runs in the pool.
+          Database access stays in the calling thread,
+          because Django connections are per-thread.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int]=None,
+        timeout: Optional[float]=None,
+        queue: Optional[int]=None,
+    ):
+        """
+        :workers: Maximum number of hashes computed at the same time.
+        :timeout: Seconds to wait for a single hash, once it is running.
+        :queue: Number of requests that may wait for a free worker.
+            Size it for the largest burst of logins you expect.
+        """
+        self.workers = int(workers or DEFAULT_HASH_WORKERS)
+        self.timeout = float(timeout or DEFAULT_HASH_TIMEOUT)
+        self.queue = int(DEFAULT_HASH_QUEUE if queue is None else queue)
+
+        # Every request ahead of us in the queue may use its full timeout,
+        # so waiting any less could reject a valid login.
+        rounds = -(-self.queue // self.workers) + 1
+        self.queue_timeout = self.timeout * rounds
+
+        self._slots = threading.BoundedSemaphore(self.workers + self.queue)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.workers,
+            thread_name_prefix='password-hash',
+        )
+
+    def _run(self, func: Callable, *args) -> Any:
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            raise PasswordHashTimeoutError('Password hash pool is full')
+
+        started = threading.Event()
+
+        def _hash():
+            started.set()
+            return func(*args)
+
+        try:
+            future = self._executor.submit(_hash)
+        except BaseException:
+            self._slots.release()
+            raise
+        # Only give the slot back once the hash can no longer run,
+        # because a running hash can't be cancelled.
+        future.add_done_callback(lambda _: self._slots.release())
+
+        # A queued hash can still be cancelled;
+        # if it started in the meantime, wait for it as usual.
+        if not started.wait(timeout=self.queue_timeout) and future.cancel():
+            raise PasswordHashTimeoutError('Password hash pool is full')
+
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            raise PasswordHashTimeoutError('Password hash timed out')
+
+    def check_password(self, password: str, encoded: str) -> Tuple[bool, bool]:
+        """
+        Verify a raw password against a stored hash.
+
+        :password: The raw password supplied by the user.
+        :encoded: The hash stored in the database.
+
+        :return: Tuple of (password is correct, hash should be upgraded)
+        :raises: PasswordHashTimeoutError
+        """
+        needs_upgrade = []
+
+        def _check():
+            return check_password(
+                password,
+                encoded,
+                setter=lambda raw_password: needs_upgrade.append(True),
+            )
+
+        is_correct = self._run(_check)
+        return is_correct, bool(needs_upgrade)
+
+    def make_password(self, password: str) -> str:
+        """
+        Hash a raw password for storage.
+
+        :password: The raw password to hash.
+
+        :return: Encoded hash, ready to be stored on the User.
+        :raises: PasswordHashTimeoutError
+        """
+        return self._run(make_password, password)
+
+    def shutdown(self):
+        """
+        Stop the worker threads.
+        Waits for hashes that are already running.
+        """
+        self._executor.shutdown(wait=True, cancel_futures=True)
@@ -5,21 +5,33 @@ Affero GPL v3
 
 from typing import Union
 
+from django.conf import settings as django_settings
+
 from app.models import AppSettings
 
 from ...models.settings import AppSettingsDB
 from ...ports.settings import AppSettingsDBPort
+from ...utils.cache import ChangeSignal, SettingsCache
 
 
 class AppSettingsDjangoORMAdapter(AppSettingsDBPort):
     """
-    Uses the Django ORM to manage settings
+    Uses the Django ORM to manage settings.
+
+    Settings are cached in memory.
+    Saving AppSettings from any process touches APP_SETTINGS_SIGNAL_FILE,
+    which tells the other processes to drop their copy.
+    `SignalCheckInterval` sets how often (in seconds) the file is checked.
     """
 
     def __init__(self, **kwargs):
-        # Ignore any kwargs configuration.
-        # This uses the django settings.
+        # Everything except the cache uses the django settings.
         super().__init__()
+        signal = ChangeSignal(
+            django_settings.APP_SETTINGS_SIGNAL_FILE,
+            check_interval=kwargs.get('signalcheckinterval') or 1.0,
+        )
+        self.cache = SettingsCache(signal=signal)
 
     def _django_to_pydantic(self, app_settings: AppSettings):
         app_settings_db = AppSettingsDB(
@@ -29,6 +41,12 @@ class AppSettingsDjangoORMAdapter(AppSettingsDBPort):
         )
         return app_settings_db
 
+    def _load(self) -> Union[AppSettingsDB, None]:
+        app = AppSettings.objects.first()
+        if not app:
+            return None
+        return self._django_to_pydantic(app)
+
     def get(self) -> Union[AppSettingsDB, None]:
         """
         Get the settings.
@@ -36,12 +54,9 @@ class AppSettingsDjangoORMAdapter(AppSettingsDBPort):
 
         :return: AppSettingsDB object, or None
         """
-        app = AppSettings.objects.first()
-        if not app:
-            return None
-
-        app_db = self._django_to_pydantic(app)
-        return app_db
+        app_db = self.cache.get(self._load)
+        # Hand out a copy, so callers can't change the cached settings
+        return app_db.model_copy() if app_db else None
 
     def get_or_default(self) -> AppSettingsDB:
         """
@@ -50,13 +65,7 @@ class AppSettingsDjangoORMAdapter(AppSettingsDBPort):
 
         :return: AppSettingsDB
         """
-        app = AppSettings.objects.first()
-        if app:
-            app_db = self._django_to_pydantic(app)
-        else:
-            app_db = AppSettingsDB()
-
-        return app_db
+        return self.get() or AppSettingsDB()
 
     def create_or_update(self, settings: AppSettingsDB) -> AppSettingsDB:
         """
@@ -81,4 +90,5 @@ class AppSettingsDjangoORMAdapter(AppSettingsDBPort):
             )
             app_db = self._django_to_pydantic(app)
 
-        return app_db
+        self.cache.set(app_db)
+        return app_db.model_copy()
@@ -3,8 +3,9 @@ Copyright (C) J Leadbetter <j@jleadbetter.com>
 Affero GPL v3
 """
 
-from typing import List, Optional, Union
+from typing import Iterator, List, Optional, Union
 
+from django.conf import settings as django_settings
 from django.contrib.auth.models import User
 from django.contrib.auth.password_validation import validate_password
 from django.core.exceptions import ValidationError
@@ -18,19 +19,40 @@ from ...models.errors import (
     ObjectNotFoundError,
     ObjectValidationError,
 )
-from ...models.users import UserDB
-from ...ports.users import UserDBPort
+from ...models.pages import Page
+from ...models.users import UserDB, UserSummary
+from ...ports.users import (
+    DEFAULT_USER_CHUNK_SIZE,
+    DEFAULT_USER_PAGE_SIZE,
+    UserDBPort,
+)
+from ...utils.cache import ChangeSignal, SettingsCache
+from .pagination import paginate_queryset
+from .passwords import PasswordHashPool
 
 
 class UserDBDjangoORMAdapter(UserDBPort):
     """
     Handles CRUD for users in the database
+
+    Whether there are any users is cached in memory.
+    Adding or removing users from any process touches USERS_SIGNAL_FILE,
+    which tells the other processes to check again.
     """
 
     def __init__(self, **kwargs):
-        # Ignore any kwargs configuration.
-        # This uses the django profile.
+        # Everything except the hash pool uses the django profile.
         super().__init__()
+        self.password_pool = PasswordHashPool(
+            workers=kwargs.get('hashworkers'),
+            timeout=kwargs.get('hashtimeout'),
+            queue=kwargs.get('hashqueue'),
+        )
+        signal = ChangeSignal(
+            django_settings.USERS_SIGNAL_FILE,
+            check_interval=kwargs.get('signalcheckinterval') or 1.0,
+        )
+        self.has_users_cache = SettingsCache(signal=signal)
 
     def _django_to_pydantic(self, user: UserProfile) -> UserDB:
         # We don't return the password here,
@@ -53,6 +75,7 @@ class UserDBDjangoORMAdapter(UserDBPort):
 
         :return: Created user object.
         :raises: ObjectExistsError if the object already exists.
+        :raises: PasswordHashTimeoutError if the hash pool is saturated.
         """
 
         # We should validate the password *before* we try to create it
@@ -83,7 +106,7 @@ class UserDBDjangoORMAdapter(UserDBPort):
             new_user = User.objects.create(username=user.username)
 
         if user.password:
-            new_user.set_password(user.password)
+            new_user.password = self.password_pool.make_password(user.password)
 
         if user.is_admin:
             new_user.is_staff = True
@@ -159,6 +182,17 @@ class UserDBDjangoORMAdapter(UserDBPort):
         userdb = self._django_to_pydantic(user) if user else None
         return userdb
 
+    def has_users(self) -> bool:
+        """
+        Check whether there are any users in the database.
+        Cheap enough to call on every page load.
+
+        :return: True if at least one user exists.
+        """
+        return self.has_users_cache.get(
+            UserProfile.objects.filter(user__is_active=True).exists,
+        )
+
     def get_by_username(self, username: str) -> UserDB:
         """
         Get a user from the database using a username.
@@ -190,6 +224,63 @@ class UserDBDjangoORMAdapter(UserDBPort):
         usersdb = [self._django_to_pydantic(user) for user in users]
         return usersdb
 
+    def get_summaries(self) -> List[UserSummary]:
+        """
+        Like `get_all`, but only get the id, username and display name
+        of each user.
+
+        :return: List of user summaries (may be empty)
+        """
+        rows = UserProfile.objects.filter(user__is_active=True) \
+                .values_list('id', 'user__username', 'display_name')
+        return [UserSummary._make(row) for row in rows]
+
+    def iter_all(
+        self,
+        chunk_size: Optional[int]=DEFAULT_USER_CHUNK_SIZE,
+    ) -> Iterator[UserDB]:
+        """
+        Stream all users from the database,
+        without loading them all at once.
+
+        :chunk_size: Number of users fetched at a time.
+
+        :return: Generator of user objects (may be empty)
+        """
+        users = UserProfile.objects.filter(
+            user__is_active=True,
+        ).select_related('user')
+        for user in users.iterator(chunk_size=chunk_size):
+            yield self._django_to_pydantic(user)
+
+    def get_cursor_page(
+        self,
+        cursor: Optional[str]=None,
+        limit: Optional[int]=DEFAULT_USER_PAGE_SIZE,
+    ) -> Page[UserDB]:
+        """
+        Get one page of users, ordered by username.
+
+        :cursor: `next_cursor` of the previous page.
+            Defaults to the first page.
+        :limit: Maximum number of users to return.
+
+        :return: Page of users, with the cursor of the next page.
+        :raises: CursorError if the cursor is invalid.
+            ValueError if `limit` is less than 1.
+        """
+        users = UserProfile.objects.filter(
+            user__is_active=True,
+        ).select_related('user')
+        return paginate_queryset(
+            users,
+            ('user__username',),
+            'users',
+            cursor,
+            limit,
+            self._django_to_pydantic,
+        )
+
     def update(self, user: UserDB) -> UserDB:
         """
         Update an existing user.
@@ -216,7 +307,9 @@ class UserDBDjangoORMAdapter(UserDBPort):
         userdb.display_name = user.display_name
         userdb.user.is_superuser = user.is_admin
         if user.password:
-            userdb.user.set_password(user.password)
+            userdb.user.password = self.password_pool.make_password(
+                user.password,
+            )
 
         userdb.user.save()
         userdb.save()
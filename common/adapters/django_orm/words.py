@@ -0,0 +1,438 @@
+"""
+Copyright (C) J Leadbetter <j@jleadbetter.com>
+Affero GPL v3
+"""
+
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from django.db import transaction
+from django.db.models import Q
+from django.db.utils import IntegrityError
+from pydantic import BaseModel
+
+from words.models import Word as WordModel, WordForm
+
+from ...models.errors import ObjectExistsError, ObjectNotFoundError
+from ...models.pages import Page
+from ...models.words import Translation, Word, make_grammar_model
+from ...ports.words import DEFAULT_BATCH_SIZE, WordPort, with_ids, word_key
+from .pagination import paginate_queryset
+
+
+# Fields that can change when a word is saved again
+_UPDATE_FIELDS = ['frequency', 'grammar_type', 'type', 'translations']
+
+
+@lru_cache(maxsize=None)
+def _grammar_models(language_code: str, grammar_type: str) -> Tuple[Any, Any]:
+    """
+    Grammar model and grammar data model for a type of word.
+    Creating the models is slow, so they're only created once.
+    """
+    return (
+        make_grammar_model(language_code, grammar_type),
+        make_grammar_model(language_code, f'{grammar_type}Data'),
+    )
+
+
+class WordDjangoORMAdapter(WordPort):
+    """
+    Manages Words in the Django database.
+    """
+
+    def __init__(self, **kwargs):
+        # Ignore kwargs, as they're not needed
+        super().__init__()
+
+    def _grammar_type(self, word: Word) -> str:
+        if isinstance(word.type, BaseModel):
+            # Grammar models are named after the type and language,
+            # e.g. NounNL
+            name = word.type.__class__.__name__
+            return name.removesuffix(word.languageCode.upper())
+        return 'Unknown'
+
+    def _pydantic_to_fields(self, word: Word) -> Dict[str, Any]:
+        if isinstance(word.type, BaseModel):
+            grammar = word.type.model_dump(mode='json')
+        else:
+            grammar = word.type or {}
+
+        return {
+            'language_code': word.languageCode,
+            'base_word': word.baseWord,
+            'frequency': word.frequency,
+            'grammar_type': self._grammar_type(word),
+            'type': grammar,
+            'translations': [
+                translation.model_dump(mode='json')
+                for translation in word.translations or []
+            ],
+        }
+
+    def _django_to_pydantic(self, word: WordModel) -> Word:
+        grammar = word.type
+        grammar_model, data_model = _grammar_models(
+            word.language_code,
+            word.grammar_type,
+        )
+        if grammar_model:
+            data = grammar.get('data', [])
+            if data_model:
+                data = [data_model(**item) for item in data]
+            grammar = grammar_model(**{**grammar, 'data': data})
+        return Word(
+            id=str(word.id),
+            frequency=word.frequency,
+            languageCode=word.language_code,
+            baseWord=word.base_word,
+            translations=[
+                Translation(**translation)
+                for translation in word.translations
+            ] or None,
+            type=grammar,
+        )
+
+    def _form_records(self, word_id: str, word: Word) -> List[WordForm]:
+        return [
+            WordForm(word_id=word_id, language_code=word.languageCode, text=form)
+            for form in self.get_index_forms(word)
+        ]
+
+    def _index(self, words: Dict[str, Word]):
+        """
+        Bring the forms of words in the index up to date.
+        Only the words whose forms changed are rewritten,
+        so saving translations or frequencies costs a single select.
+
+        :words: Words to index, by the id of their record.
+        """
+        indexed = {}
+        for word_id, text in WordForm.objects.filter(
+            word_id__in=list(words),
+        ).values_list('word_id', 'text'):
+            indexed.setdefault(str(word_id), set()).add(text)
+
+        changed = {
+            word_id: word
+            for word_id, word in words.items()
+            if indexed.get(str(word_id), set()) != set(self.get_index_forms(word))
+        }
+        if not changed:
+            return
+
+        WordForm.objects.filter(word_id__in=list(changed)).delete()
+        WordForm.objects.bulk_create([
+            form
+            for word_id, word in changed.items()
+            for form in self._form_records(word_id, word)
+        ])
+
+    def _save(self, word: Word, existing: WordModel=None) -> Word:
+        word = with_ids(word)
+        fields = self._pydantic_to_fields(word)
+        if existing is None:
+            existing = WordModel(id=word.id, **fields)
+        else:
+            for field, value in fields.items():
+                setattr(existing, field, value)
+        with transaction.atomic():
+            existing.save()
+            self._index({existing.id: word})
+        return self._django_to_pydantic(existing)
+
+    def _filter_base_words(self, keys: Iterable[Tuple[str, str]]):
+        """
+        :keys: (languageCode, baseWord) of the words to find.
+
+        :return: QuerySet of the words, with one condition per language.
+        """
+        base_words = {}
+        for language_code, base_word in keys:
+            base_words.setdefault(language_code, set()).add(base_word)
+        query = Q()
+        for language_code, language_words in base_words.items():
+            query |= Q(language_code=language_code, base_word__in=language_words)
+        return WordModel.objects.filter(query)
+
+    def create(self, word: Word) -> Word:
+        """
+        Create a new word in the database.
+
+        :word: New Word object to add to the database.
+            Word is counted as a duplicate when it has the same
+            languageCode and baseWord.
+
+        :return: Created Word object.
+        :raises: ObjectExistsError if the object already exists.
+        """
+        try:
+            with transaction.atomic():
+                return self._save(word)
+        except IntegrityError as exc:
+            raise ObjectExistsError(exc)
+
+    def create_in_batch(self, words: List[Word]) -> List[Word]:
+        """
+        Batch create multiple words.
+        Ignores words that already exist.
+
+        Words are checked and inserted DEFAULT_BATCH_SIZE at a time,
+        with one query to find the existing words and bulk inserts
+        of the words and their forms per batch.
+
+        :word: New Word object to add to the database.
+            Word is counted as a duplicate when it has the same
+            languageCode and baseWord.
+
+        :return: List of words that were created.
+        """
+        words = self.dedupe(words)
+        created = []
+        for start in range(0, len(words), DEFAULT_BATCH_SIZE):
+            batch = words[start:start + DEFAULT_BATCH_SIZE]
+
+            existing = set(
+                self._filter_base_words(
+                    (word.languageCode, word.baseWord) for word in batch
+                ).values_list('language_code', 'base_word')
+            )
+
+            new_words = [
+                with_ids(word)
+                for word in batch
+                if word_key(word) not in existing
+            ]
+            records = [
+                WordModel(id=word.id, **self._pydantic_to_fields(word))
+                for word in new_words
+            ]
+            with transaction.atomic():
+                WordModel.objects.bulk_create(records)
+                WordForm.objects.bulk_create([
+                    form
+                    for word in new_words
+                    for form in self._form_records(word.id, word)
+                ])
+            created.extend(new_words)
+        return created
+
+    def create_or_update(self, word: Word) -> Word:
+        """
+        Create a new word, or update an existing word in the database.
+
+        :word: New Word object to add to the database.
+            Word is counted as a duplicate when it has the same
+            languageCode and baseWord.
+
+        :return: Created Word object.
+        """
+        existing = WordModel.objects.filter(
+            language_code=word.languageCode,
+            base_word=word.baseWord,
+        ).first()
+        if existing and not word.id:
+            word = word.model_copy(update={'id': str(existing.id)})
+        return self._save(word, existing)
+
+    def read(self, language_code: str, base_word: str) -> Word:
+        """
+        Retrieve a word from the database.
+
+        :language_code: 2-letter language code of the Word.
+        :base_word: Base word (non-conjugated) of the Word.
+
+        :return: Word object, if it exists.
+        :raises: ObjectNotFoundError
+        """
+        try:
+            word = WordModel.objects.get(
+                language_code=language_code,
+                base_word=base_word,
+            )
+        except WordModel.DoesNotExist as exc:
+            raise ObjectNotFoundError(exc)
+        return self._django_to_pydantic(word)
+
+    def read_multiple(self, number: int=100, offset: int=0) -> List[Word]:
+        """
+        Retrieve multiple words from the database.
+
+        :number: Return a specified number of entries from the database.
+        :offset: Where in the database to start the retrieval.
+
+        :return: list of Word objects,
+            sorted by languageCode and baseWord.
+        """
+        words = WordModel.objects.order_by('language_code', 'base_word')
+        return [
+            self._django_to_pydantic(word)
+            for word in words[offset:offset + number]
+        ]
+
+    def read_page(
+        self,
+        number: int=100,
+        cursor: Optional[str]=None,
+    ) -> Page[Word]:
+        """
+        Retrieve a page of words, ordered by languageCode and baseWord.
+        Unlike `read_multiple`, the last page is as quick as the first.
+
+        :number: Maximum number of words to return.
+        :cursor: `next_cursor` of the previous page.
+            Defaults to the first page.
+
+        :return: Page of Word objects, with the cursor of the next page.
+        :raises: CursorError if the cursor is invalid.
+            ValueError if `number` is less than 1.
+        """
+        return paginate_queryset(
+            WordModel.objects.all(),
+            ('language_code', 'base_word'),
+            'words',
+            cursor,
+            number,
+            self._django_to_pydantic,
+        )
+
+    def update(self, word: Word) -> Word:
+        """
+        Update an existing word in the database.
+
+        :word: Word object to update.
+            Words are considered the same when they have the same
+            languageCode and baseWord.
+
+        :return: Updated Word object.
+        :raises: ObjectNotFoundError if Word isn't already in the database.
+            Use `create_or_update` if you're not sure the Word exists.
+        """
+        try:
+            existing = WordModel.objects.get(
+                language_code=word.languageCode,
+                base_word=word.baseWord,
+            )
+        except WordModel.DoesNotExist as exc:
+            raise ObjectNotFoundError(exc)
+        word = word.model_copy(update={'id': str(existing.id)})
+        return self._save(word, existing)
+
+    def delete(self, word: Word) -> bool:
+        """
+        Remove an existing word in the database.
+
+        :word: Word object to delete.
+            Words are considered the same when they have the same
+            languageCode and baseWord.
+
+        :return: boolean -- true if deleted, false if Word does not exist.
+            No errors should be thrown if the Word doesn't exist.
+        """
+        deleted, _ = WordModel.objects.filter(
+            language_code=word.languageCode,
+            base_word=word.baseWord,
+        ).delete()
+        return bool(deleted)
+
+    def find_by_form(self, language_code: str, text: str) -> List[Word]:
+        """
+        Find the words that have a base word or inflected form.
+        Uses an index of forms, rather than searching every word.
+
+        :language_code: 2-letter language code of the Words.
+        :text: Form to look for, e.g. 'liep'.
+
+        :return: Matching words, sorted by baseWord (may be empty).
+        """
+        words = WordModel.objects.filter(
+            forms__language_code=language_code,
+            forms__text=text,
+        ).order_by('base_word')
+        return [self._django_to_pydantic(word) for word in words]
+
+    def merge_existing_in_batch(self, words: List[Word]) -> List[Word]:
+        """
+        Merge existing words into each of the words, like `merge_existing`.
+        Words in the batch are never merged into each other,
+        and a word that matches more than one of the words is merged into
+        the first one.
+
+        Words are merged DEFAULT_BATCH_SIZE at a time, with one query
+        to find the words to merge and a few bulk queries to save them,
+        whatever the number of forms.
+
+        :words: Words to be merged.
+            Duplicates are ignored, like in `create_in_batch`.
+
+        :return: New/updated Words, in the same order.
+        """
+        words = self.dedupe(words)
+        keys = {word_key(word) for word in words}
+        merged = []
+        for start in range(0, len(words), DEFAULT_BATCH_SIZE):
+            batch = words[start:start + DEFAULT_BATCH_SIZE]
+            merged.extend(self._merge_batch(batch, keys))
+        return merged
+
+    def _merge_batch(
+        self,
+        words: List[Word],
+        keys: Set[Tuple[str, str]],
+    ) -> List[Word]:
+        forms = {word_key(word): self.get_forms(word) for word in words}
+        # The words themselves, and the words to merge into them.
+        # Words are merged when their baseWord is one of the forms,
+        # which the unique (language_code, base_word) index finds
+        # with one IN query. WordForm answers the opposite question,
+        # which words have a form, for `find_by_form`.
+        lookup = [
+            (word.languageCode, form)
+            for word in words
+            for form in self.get_index_forms(word)
+        ]
+        found = {
+            (record.language_code, record.base_word): record
+            for record in self._filter_base_words(lookup)
+        }
+
+        with transaction.atomic():
+            claimed = set()
+            to_create = []
+            to_update = []
+            indexed = {}
+            merged = []
+            for word in words:
+                others = []
+                for form in forms[word_key(word)]:
+                    key = (word.languageCode, form)
+                    if key in found and key not in keys and key not in claimed:
+                        claimed.add(key)
+                        others.append(self._django_to_pydantic(found[key]))
+
+                record = found.get(word_key(word))
+                if record is not None and not word.id:
+                    word = word.model_copy(update={'id': str(record.id)})
+                word = self.merge_words(with_ids(word), others)
+                fields = self._pydantic_to_fields(word)
+                if record is None:
+                    record = WordModel(id=word.id, **fields)
+                    to_create.append(record)
+                else:
+                    for field, value in fields.items():
+                        setattr(record, field, value)
+                    to_update.append(record)
+                indexed[record.id] = word
+                merged.append(record)
+
+            if claimed:
+                WordModel.objects.filter(
+                    pk__in=[found[key].pk for key in claimed],
+                ).delete()
+            WordModel.objects.bulk_create(to_create)
+            if to_update:
+                WordModel.objects.bulk_update(to_update, _UPDATE_FIELDS)
+            self._index(indexed)
+
+        return [self._django_to_pydantic(record) for record in merged]
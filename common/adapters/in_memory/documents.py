@@ -3,17 +3,24 @@ Copyright (C) J Leadbetter <j@jleadbetter.com>
 Affero GPL v3
 """
 
-import os
+import bisect
 import shutil
 import uuid
 from pathlib import Path
-from typing import List, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
 
-from ...models.documents import DocumentDB, DocumentUI
+from ...models.documents import DocumentDB, DocumentSummary, DocumentUI
 from ...models.errors import ObjectNotFoundError
+from ...models.pages import Page
+from ...models.sentences import SentenceDB
 from ...models.users import UserDB
-from ...ports.documents import DocumentDBPort
+from ...ports.documents import (
+    DEFAULT_CHUNK_SIZE,
+    DEFAULT_PAGE_SIZE,
+    DocumentDBPort,
+)
 from ...stores.data.in_memory import InMemoryDBStore
+from ...utils.cursors import paginate
 
 
 class DocumentDBInMemoryAdapter(DocumentDBPort):
@@ -100,6 +107,49 @@ class DocumentDBInMemoryAdapter(DocumentDBPort):
 
         return docdb
 
+    def find_by_name(
+        self,
+        user_id: uuid.UUID,
+        display_name: str,
+        language_code: str,
+    ) -> Optional[DocumentDB]:
+        """
+        Find a document by the fields that make it unique for a user,
+        without changing anything.
+
+        :user_id: The user's id that owns the document
+        :display_name: Display name of the document
+        :language_code: 2-letter language code of the document
+
+        :return: Matching DocumentDB, or None if there isn't one.
+        """
+        for doc in self.store.db.documents.get(str(user_id), []):
+            if (
+                doc.display_name == display_name
+                and doc.language_code == language_code
+            ):
+                return doc
+        return None
+
+    def delete(self, id: uuid.UUID, user_id: uuid.UUID) -> bool:
+        """
+        Delete a document and its sentences.
+
+        :id: The id of the document
+        :user_id: The user's id that owns the document
+
+        :return: boolean -- true if deleted, false if the document
+            does not exist for the user.
+        """
+        documents = self.store.db.documents.get(str(user_id), [])
+        remaining = [doc for doc in documents if doc.id != id]
+        if len(remaining) == len(documents):
+            return False
+
+        self.store.db.documents[str(user_id)] = remaining
+        self.store.db.document_sentences.pop(str(id), None)
+        return True
+
     def get_all(self, user_id: uuid.UUID) -> List[DocumentDB]:
         """
         Get all documents for the specified user.
@@ -114,3 +164,210 @@ class DocumentDBInMemoryAdapter(DocumentDBPort):
         except KeyError:
             docdbs = []
         return docdbs
+
+    def iter_all(
+        self,
+        user_id: uuid.UUID,
+        chunk_size: Optional[int]=DEFAULT_CHUNK_SIZE,
+    ) -> Iterator[DocumentDB]:
+        """
+        Stream all documents for the specified user,
+        without loading them all at once.
+
+        :user_id: The user's id who owns the documents
+        :chunk_size: Number of documents fetched at a time.
+
+        :return: Generator of documents (may be empty)
+        """
+        # Documents are already in memory, so there's nothing to chunk
+        yield from self.store.db.documents.get(str(user_id), [])
+
+    def get_cursor_page(
+        self,
+        user_id: uuid.UUID,
+        language_code: Optional[str]=None,
+        cursor: Optional[str]=None,
+        limit: Optional[int]=DEFAULT_PAGE_SIZE,
+    ) -> Page[DocumentDB]:
+        """
+        Get one page of documents for the specified user,
+        ordered by language code, display name and id.
+        Unlike `get_page`, deep pages are as quick as the first one.
+
+        :user_id: The user's id who owns the documents
+        :language_code: Only get documents in this language.
+            Defaults to all languages.
+        :cursor: `next_cursor` of the previous page.
+            Defaults to the first page.
+        :limit: Maximum number of documents to return.
+
+        :return: Page of documents, with the cursor of the next page.
+        :raises: CursorError if the cursor is invalid.
+            ValueError if `limit` is less than 1.
+        """
+        docdbs = self.get_all(user_id)
+        if language_code:
+            docdbs = [doc for doc in docdbs if doc.language_code == language_code]
+        return paginate(
+            docdbs,
+            lambda doc: (doc.language_code, doc.display_name, str(doc.id)),
+            'documents',
+            cursor,
+            limit,
+        )
+
+    def get_page(
+        self,
+        user_id: uuid.UUID,
+        language_code: Optional[str]=None,
+        offset: Optional[int]=0,
+        limit: Optional[int]=DEFAULT_PAGE_SIZE,
+    ) -> List[DocumentDB]:
+        """
+        Get one page of documents for the specified user,
+        ordered by language code and display name.
+
+        :user_id: The user's id who owns the documents
+        :language_code: Only get documents in this language.
+            Defaults to all languages.
+        :offset: Number of documents to skip.
+        :limit: Maximum number of documents to return.
+
+        :return: List of documents (may be empty)
+        """
+        docdbs = self.get_all(user_id)
+        if language_code:
+            docdbs = [doc for doc in docdbs if doc.language_code == language_code]
+        docdbs = sorted(
+            docdbs,
+            key=lambda x: (x.language_code, x.display_name, str(x.id)),
+        )
+        return docdbs[offset:offset + limit]
+
+    def get_summary_page(
+        self,
+        user_id: uuid.UUID,
+        language_code: Optional[str]=None,
+        offset: Optional[int]=0,
+        limit: Optional[int]=DEFAULT_PAGE_SIZE,
+    ) -> List[DocumentSummary]:
+        """
+        Like `get_page`, but only get the id, display name
+        and language code of each document.
+
+        :user_id: The user's id who owns the documents
+        :language_code: Only get documents in this language.
+            Defaults to all languages.
+        :offset: Number of documents to skip.
+        :limit: Maximum number of documents to return.
+
+        :return: List of document summaries (may be empty)
+        """
+        return [
+            DocumentSummary(doc.id, doc.display_name, doc.language_code)
+            for doc in self.get_page(user_id, language_code, offset, limit)
+        ]
+
+    def count_by_language(self, user_id: uuid.UUID) -> Dict[str, int]:
+        """
+        Count the documents the specified user has in each language.
+
+        :user_id: The user's id who owns the documents
+
+        :return: Dictionary of language code to number of documents.
+            Languages without documents are left out.
+        """
+        counts = {}
+        for doc in self.get_all(user_id):
+            counts[doc.language_code] = counts.get(doc.language_code, 0) + 1
+        return dict(sorted(counts.items()))
+
+    def add_sentences(
+        self,
+        id: uuid.UUID,
+        user_id: uuid.UUID,
+        sentences: List[SentenceDB],
+    ) -> List[SentenceDB]:
+        """
+        Add sentences to the end of a document.
+
+        :id: The id of the document
+        :user_id: The user's id that owns the document
+        :sentences: Sentences to add. Sentences without an ordering
+            are numbered after the last sentence in the document.
+
+        :return: The sentences that were added.
+        :raises: ObjectNotFoundError if no matching document is found
+            for the user
+        """
+        doc = self.get(id, user_id)
+        doc_sentences = self.store.db.document_sentences.setdefault(str(id), [])
+        next_ordering = doc_sentences[-1].ordering + 1 if doc_sentences else 0
+
+        new_sentences = []
+        for sentence in sentences:
+            ordering = sentence.ordering
+            if ordering is None:
+                ordering = next_ordering
+            next_ordering = max(next_ordering, ordering + 1)
+            new_sentences.append(sentence.model_copy(update={
+                'id': uuid.uuid4(),
+                'user_id': doc.user_id,
+                'document_id': doc.id,
+                'ordering': ordering,
+            }))
+
+        doc_sentences.extend(new_sentences)
+        # Usually already in order, which makes this cheap
+        doc_sentences.sort(key=lambda x: x.ordering)
+        return new_sentences
+
+    def count_sentences(self, id: uuid.UUID, user_id: uuid.UUID) -> int:
+        """
+        Count the sentences in a document.
+
+        :id: The id of the document
+        :user_id: The user's id that owns the document
+
+        :return: Number of sentences (0 if the document doesn't exist).
+        """
+        return len(self._get_document_sentences(id, user_id))
+
+    def get_sentences(
+        self,
+        id: uuid.UUID,
+        user_id: uuid.UUID,
+        start: Optional[int]=0,
+        stop: Optional[int]=None,
+    ) -> List[SentenceDB]:
+        """
+        Get a window of sentences from a document.
+        The sentences are kept sorted by ordering,
+        so the window is found with a binary search.
+
+        :id: The id of the document
+        :user_id: The user's id that owns the document
+        :start: First ordering to include.
+        :stop: Ordering to stop before. Defaults to the end of the document.
+
+        :return: Sentences with start <= ordering < stop,
+            sorted by ordering (may be empty).
+        """
+        sentences = self._get_document_sentences(id, user_id)
+        key = lambda x: x.ordering
+        first = bisect.bisect_left(sentences, start, key=key)
+        if stop is None:
+            last = len(sentences)
+        else:
+            last = bisect.bisect_left(sentences, stop, key=key)
+        return sentences[first:last]
+
+    def _get_document_sentences(
+        self,
+        id: uuid.UUID,
+        user_id: uuid.UUID,
+    ) -> List[SentenceDB]:
+        sentences = self.store.db.document_sentences.get(str(id), [])
+        if sentences and sentences[0].user_id != user_id:
+            return []
+        return sentences
@@ -8,6 +8,7 @@ from typing import Union
 from ...models.settings import AppSettingsDB
 from ...ports.settings import AppSettingsDBPort
 from ...stores.data.in_memory import InMemoryDBStore
+from ...utils.cache import SettingsCache
 
 
 class AppSettingsInMemoryAdapter(AppSettingsDBPort):
@@ -20,6 +21,9 @@ class AppSettingsInMemoryAdapter(AppSettingsDBPort):
         # This uses the django settings.
         super().__init__()
         self.store = InMemoryDBStore()
+        # Loading data or dropping the store swaps out the database,
+        # which has to invalidate the cache.
+        self.cache = SettingsCache(version=lambda: self.store.version)
 
     def get(self) -> Union[AppSettingsDB, None]:
         """
@@ -28,7 +32,9 @@ class AppSettingsInMemoryAdapter(AppSettingsDBPort):
 
         :return: AppSettingsDB object, or None
         """
-        return self.store.db.app_settings
+        app_db = self.cache.get(lambda: self.store.db.app_settings)
+        # Hand out a copy, so callers can't change the cached settings
+        return app_db.model_copy() if app_db else None
 
     def get_or_default(self) -> AppSettingsDB:
         """
@@ -37,10 +43,7 @@ class AppSettingsInMemoryAdapter(AppSettingsDBPort):
 
         :return: AppSettingsDB
         """
-        app_db = self.store.db.app_settings
-        if not app_db:
-            app_db = AppSettingsDB()
-        return app_db
+        return self.get() or AppSettingsDB()
 
     def create_or_update(self, settings: AppSettingsDB) -> AppSettingsDB:
         """
@@ -49,5 +52,8 @@ class AppSettingsInMemoryAdapter(AppSettingsDBPort):
 
         :return: AppSettingsDB object.
         """
+        # Keep our own copy, so the caller can't change the stored settings
+        settings = settings.model_copy()
         self.store.db.app_settings = settings
-        return settings
+        self.cache.set(settings)
+        return settings.model_copy()
@@ -4,16 +4,22 @@ Affero GPL v3
 """
 
 import uuid
-from typing import List, Optional, Union
+from typing import Iterator, List, Optional, Union
 
 from ...models.errors import (
     ObjectExistsError,
     ObjectNotFoundError,
     ObjectValidationError,
 )
-from ...models.users import UserDB
-from ...ports.users import UserDBPort
+from ...models.pages import Page
+from ...models.users import UserDB, UserSummary
+from ...ports.users import (
+    DEFAULT_USER_CHUNK_SIZE,
+    DEFAULT_USER_PAGE_SIZE,
+    UserDBPort,
+)
 from ...stores.data.in_memory import InMemoryDBStore
+from ...utils.cursors import paginate
 
 
 class UserDBInMemoryAdapter(UserDBPort):
@@ -110,6 +116,15 @@ class UserDBInMemoryAdapter(UserDBPort):
         userdb = self._user_to_return_value(user)
         return userdb
 
+    def has_users(self) -> bool:
+        """
+        Check whether there are any users in the database.
+        Cheap enough to call on every page load.
+
+        :return: True if at least one user exists.
+        """
+        return bool(self.store.db.users)
+
     def get_by_username(self, username: str) -> UserDB:
         """
         Get a user from the database using a username.
@@ -143,6 +158,60 @@ class UserDBInMemoryAdapter(UserDBPort):
         ]
         return usersdb
 
+    def get_summaries(self) -> List[UserSummary]:
+        """
+        Like `get_all`, but only get the id, username and display name
+        of each user.
+
+        :return: List of user summaries (may be empty)
+        """
+        return [
+            UserSummary(user.id, user.username, user.display_name)
+            for user in self.store.db.users
+        ]
+
+    def iter_all(
+        self,
+        chunk_size: Optional[int]=DEFAULT_USER_CHUNK_SIZE,
+    ) -> Iterator[UserDB]:
+        """
+        Stream all users from the database,
+        without loading them all at once.
+
+        :chunk_size: Number of users fetched at a time.
+
+        :return: Generator of user objects (may be empty)
+        """
+        # Users are already in memory, so there's nothing to chunk
+        for user in self.store.db.users:
+            yield self._user_to_return_value(user)
+
+    def get_cursor_page(
+        self,
+        cursor: Optional[str]=None,
+        limit: Optional[int]=DEFAULT_USER_PAGE_SIZE,
+    ) -> Page[UserDB]:
+        """
+        Get one page of users, ordered by username.
+
+        :cursor: `next_cursor` of the previous page.
+            Defaults to the first page.
+        :limit: Maximum number of users to return.
+
+        :return: Page of users, with the cursor of the next page.
+        :raises: CursorError if the cursor is invalid.
+            ValueError if `limit` is less than 1.
+        """
+        page = paginate(
+            self.store.db.users,
+            lambda user: (user.username,),
+            'users',
+            cursor,
+            limit,
+        )
+        page.items = [self._user_to_return_value(user) for user in page.items]
+        return page
+
     def get_password(self, id: uuid.UUID) -> str:
         """
         Get the password of a user.
@@ -0,0 +1,260 @@
+"""
+Copyright (C) J Leadbetter <j@jleadbetter.com>
+Affero GPL v3
+"""
+
+from typing import Dict, List, Optional
+
+from ...models.errors import ObjectExistsError, ObjectNotFoundError
+from ...models.pages import Page
+from ...models.words import Word
+from ...ports.words import WordPort, with_ids, word_key
+from ...stores.data.in_memory import InMemoryDBStore
+from ...utils.cursors import paginate
+
+
+class WordInMemoryAdapter(WordPort):
+    """
+    Manages Words in the in-memory store.
+    """
+
+    def __init__(self, **kwargs):
+        # Ignore kwargs, as they're not needed
+        super().__init__()
+        self.store = InMemoryDBStore()
+
+    def _words(self, language_code: str) -> Dict[str, Word]:
+        return self.store.db.base_words.setdefault(language_code, {})
+
+    def _forms(self, language_code: str) -> Dict[str, List[str]]:
+        return self.store.db.word_forms.setdefault(language_code, {})
+
+    def _index(self, word: Word):
+        forms = self._forms(word.languageCode)
+        for form in self.get_index_forms(word):
+            forms.setdefault(form, []).append(word.baseWord)
+
+    def _unindex(self, word: Word):
+        forms = self._forms(word.languageCode)
+        for form in self.get_index_forms(word):
+            base_words = forms.get(form, [])
+            if word.baseWord in base_words:
+                base_words.remove(word.baseWord)
+            if not base_words:
+                forms.pop(form, None)
+
+    def _save(self, word: Word) -> Word:
+        # Store a copy, so callers can't change the stored word by accident
+        word = with_ids(word)
+        words = self._words(word.languageCode)
+        existing = words.get(word.baseWord)
+        if existing is not None:
+            self._unindex(existing)
+        words[word.baseWord] = word
+        self._index(word)
+        return word.model_copy(deep=True)
+
+    def create(self, word: Word) -> Word:
+        """
+        Create a new word in the database.
+
+        :word: New Word object to add to the database.
+            Word is counted as a duplicate when it has the same
+            languageCode and baseWord.
+
+        :return: Created Word object.
+        :raises: ObjectExistsError if the object already exists.
+        """
+        if word.baseWord in self._words(word.languageCode):
+            raise ObjectExistsError(
+                f'Word {word.languageCode}:{word.baseWord} already exists',
+            )
+        return self._save(word)
+
+    def create_in_batch(self, words: List[Word]) -> List[Word]:
+        """
+        Batch create multiple words.
+        Ignores words that already exist.
+
+        :word: New Word object to add to the database.
+            Word is counted as a duplicate when it has the same
+            languageCode and baseWord.
+
+        :return: List of words that were created.
+        """
+        created = []
+        for word in self.dedupe(words):
+            if word.baseWord not in self._words(word.languageCode):
+                created.append(self._save(word))
+        return created
+
+    def create_or_update(self, word: Word) -> Word:
+        """
+        Create a new word, or update an existing word in the database.
+
+        :word: New Word object to add to the database.
+            Word is counted as a duplicate when it has the same
+            languageCode and baseWord.
+
+        :return: Created Word object.
+        """
+        existing = self._words(word.languageCode).get(word.baseWord)
+        if existing and not word.id:
+            word = word.model_copy(update={'id': existing.id})
+        return self._save(word)
+
+    def read(self, language_code: str, base_word: str) -> Word:
+        """
+        Retrieve a word from the database.
+
+        :language_code: 2-letter language code of the Word.
+        :base_word: Base word (non-conjugated) of the Word.
+
+        :return: Word object, if it exists.
+        :raises: ObjectNotFoundError
+        """
+        try:
+            word = self._words(language_code)[base_word]
+        except KeyError:
+            raise ObjectNotFoundError(
+                f'Word {language_code}:{base_word} does not exist',
+            )
+        return word.model_copy(deep=True)
+
+    def read_multiple(self, number: int=100, offset: int=0) -> List[Word]:
+        """
+        Retrieve multiple words from the database.
+
+        :number: Return a specified number of entries from the database.
+        :offset: Where in the database to start the retrieval.
+
+        :return: list of Word objects,
+            sorted by languageCode and baseWord.
+        """
+        words = sorted(
+            (
+                word
+                for language_words in self.store.db.base_words.values()
+                for word in language_words.values()
+            ),
+            key=word_key,
+        )
+        return [
+            word.model_copy(deep=True)
+            for word in words[offset:offset + number]
+        ]
+
+    def read_page(
+        self,
+        number: int=100,
+        cursor: Optional[str]=None,
+    ) -> Page[Word]:
+        """
+        Retrieve a page of words, ordered by languageCode and baseWord.
+        Unlike `read_multiple`, the last page is as quick as the first.
+
+        :number: Maximum number of words to return.
+        :cursor: `next_cursor` of the previous page.
+            Defaults to the first page.
+
+        :return: Page of Word objects, with the cursor of the next page.
+        :raises: CursorError if the cursor is invalid.
+            ValueError if `number` is less than 1.
+        """
+        page = paginate(
+            (
+                word
+                for language_words in self.store.db.base_words.values()
+                for word in language_words.values()
+            ),
+            word_key,
+            'words',
+            cursor,
+            number,
+        )
+        page.items = [word.model_copy(deep=True) for word in page.items]
+        return page
+
+    def update(self, word: Word) -> Word:
+        """
+        Update an existing word in the database.
+
+        :word: Word object to update.
+            Words are considered the same when they have the same
+            languageCode and baseWord.
+
+        :return: Updated Word object.
+        :raises: ObjectNotFoundError if Word isn't already in the database.
+            Use `create_or_update` if you're not sure the Word exists.
+        """
+        existing = self._words(word.languageCode).get(word.baseWord)
+        if existing is None:
+            raise ObjectNotFoundError(
+                f'Word {word.languageCode}:{word.baseWord} does not exist',
+            )
+        return self._save(word.model_copy(update={'id': existing.id}))
+
+    def delete(self, word: Word) -> bool:
+        """
+        Remove an existing word in the database.
+
+        :word: Word object to delete.
+            Words are considered the same when they have the same
+            languageCode and baseWord.
+
+        :return: boolean -- true if deleted, false if Word does not exist.
+            No errors should be thrown if the Word doesn't exist.
+        """
+        existing = self._words(word.languageCode).pop(word.baseWord, None)
+        if existing is None:
+            return False
+        self._unindex(existing)
+        return True
+
+    def find_by_form(self, language_code: str, text: str) -> List[Word]:
+        """
+        Find the words that have a base word or inflected form.
+        Uses an index of forms, rather than searching every word.
+
+        :language_code: 2-letter language code of the Words.
+        :text: Form to look for, e.g. 'liep'.
+
+        :return: Matching words, sorted by baseWord (may be empty).
+        """
+        words = self._words(language_code)
+        return [
+            words[base_word].model_copy(deep=True)
+            for base_word in sorted(self._forms(language_code).get(text, []))
+        ]
+
+    def merge_existing_in_batch(self, words: List[Word]) -> List[Word]:
+        """
+        Merge existing words into each of the words, like `merge_existing`.
+        Words in the batch are never merged into each other,
+        and a word that matches more than one of the words is merged into
+        the first one.
+
+        :words: Words to be merged.
+            Duplicates are ignored, like in `create_in_batch`.
+
+        :return: New/updated Words, in the same order.
+        """
+        words = self.dedupe(words)
+        keys = {word_key(word) for word in words}
+
+        merged = []
+        for word in words:
+            stored = self._words(word.languageCode)
+            others = [
+                stored[form]
+                for form in self.get_forms(word)
+                if form in stored and (word.languageCode, form) not in keys
+            ]
+            existing = stored.get(word.baseWord)
+            if existing is not None and not word.id:
+                word = word.model_copy(update={'id': existing.id})
+            word = self.merge_words(with_ids(word), others)
+            for other in others:
+                self.delete(other)
+            merged.append(self.create_or_update(word))
+        return merged
@@ -5,7 +5,13 @@ Affero GPL v3
 
 from typing import List, Tuple
 
-from ...models.documents import DocumentDB, DocumentUI
+from ...models.documents import (
+    DocumentDB,
+    DocumentSummary,
+    DocumentUI,
+    DocumentUISummary,
+)
+from ...models.sentences import SentenceDB, SentenceUI
 from ...models.users import UserUI
 from ...ports.documents import DocumentUIPort
 from ...stores.adapter import AdapterStore
@@ -72,3 +78,46 @@ class DocumentUIAdapter(DocumentUIPort):
             ) for docdb in documents
         ]
         return docuis
+
+    def get_summaries(
+        self,
+        summaries: List[DocumentSummary],
+    ) -> List[DocumentUISummary]:
+        """
+        Convert document summaries for listing them in the UI.
+        These are plain tuples, so a page of them is cheap to build.
+
+        :summaries: Summaries from `DocumentDBPort.get_summary_page`.
+
+        :return: List of DocumentUISummary tuples.
+        """
+        return [
+            DocumentUISummary(
+                summary.id,
+                summary.display_name,
+                language_code_choices.get(summary.language_code, 'Unknown'),
+            ) for summary in summaries
+        ]
+
+    def get_sentences(self, sentences: List[SentenceDB]) -> List[SentenceUI]:
+        """
+        Convert a list of database sentences into a list of UI objects.
+
+        :sentences: SentenceDB instances
+        :return: List of SentenceUI objects.
+        """
+        # TODO: add the display text, once words are extracted
+        sentenceuis = [
+            SentenceUI(
+                id=sentencedb.id,
+                language=language_code_choices.get(
+                    sentencedb.language_code,
+                    'Unknown',
+                ),
+                ordering=sentencedb.ordering,
+                text=sentencedb.text,
+                enabledForStudy=sentencedb.enabled_for_study,
+                displayText=[],
+            ) for sentencedb in sentences
+        ]
+        return sentenceuis
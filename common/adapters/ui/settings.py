@@ -3,9 +3,8 @@ Copyright (C) J Leadbetter <j@jleadbetter.com>
 Affero GPL v3
 """
 
-from typing import Optional
+from typing import Optional, Tuple
 
-from common.adapters.in_memory.users import UserDBInMemoryAdapter
 from common.models.settings import AppSettingsDB, AppSettingsUI
 from common.ports.settings import AppSettingsUIPort
 from common.stores.adapter import AdapterStore
@@ -14,8 +13,34 @@ from common.stores.adapter import AdapterStore
 class AppSettingsUIAdapter(AppSettingsUIPort):
     """
     Handle conversion of AppSettingsDB objects to UI format
+
+    The converted settings are kept as a snapshot.
+    It is only rebuilt when the settings change,
+    or when the database gains its first user or loses its last one.
     """
 
+    def __init__(self, **kwargs):
+        # We catch and ignore the kwargs passed,
+        # because this doesn't need any more setup.
+        super().__init__()
+        self._user_db_adapter = None
+        # (settings, has_users, AppSettingsUI)
+        self._snapshot: Optional[Tuple[AppSettingsDB, bool, AppSettingsUI]] = None
+
+    @property
+    def user_db_adapter(self):
+        # We can't instantiate these during __init__
+        # because it interferes with AdapterStore.initialize.
+        # Lazy load this adapters.
+        if not self._user_db_adapter:
+            self._user_db_adapter = AdapterStore().get('UserDBPort')
+        return self._user_db_adapter
+
+    def _get_has_users(self) -> bool:
+        # The user adapter caches this,
+        # and drops its copy when users are added or removed.
+        return self.user_db_adapter.has_users()
+
     def get(self, settings: Optional[AppSettingsDB] = None) -> AppSettingsUI:
         """
         Convert an AppSettingsDB object into an AppSettingsUI object
@@ -28,21 +53,32 @@ class AppSettingsUIAdapter(AppSettingsUIPort):
 
         :return: AppSettingsUI
         """
-        settings_ui = AppSettingsUI()
         if not settings:
-            return settings_ui
+            return AppSettingsUI()
 
-        user_db_adapter = UserDBInMemoryAdapter()
+        has_users = self._get_has_users()
+        snapshot = self._snapshot
+        if (
+            snapshot
+            and snapshot[0] == settings
+            and snapshot[1] == has_users
+        ):
+            return snapshot[2].model_copy()
 
+        settings_ui = self._build(settings, has_users)
+        self._snapshot = (settings.model_copy(), has_users, settings_ui)
+        return settings_ui.model_copy()
+
+    def _build(self, settings: AppSettingsDB, has_users: bool) -> AppSettingsUI:
+        settings_ui = AppSettingsUI()
         settings_ui.is_configured = True
         settings_ui.show_login = True
         settings_ui.show_registration = settings.multiuser_mode
         settings_ui.show_password_field = not settings.passwordless_login
         settings_ui.show_user_select = settings.show_users_on_login_screen
 
-        userdb = user_db_adapter.get_first()
         if (
-            userdb
+            has_users
             and settings.passwordless_login
             and not settings.multiuser_mode
         ):
@@ -58,7 +94,7 @@ class AppSettingsUIAdapter(AppSettingsUIPort):
 
         # We need to be able to add a user after initial configuration.
         # Enable registration form, even if not explicitly enabled
-        if not settings.multiuser_mode and not userdb:
+        if not settings.multiuser_mode and not has_users:
             settings_ui.show_login = True
             settings_ui.show_registration = True
             # This is the exception to logout = login.
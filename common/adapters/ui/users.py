@@ -3,7 +3,7 @@ Copyright (C) J Leadbetter <j@jleadbetter.com>
 Affero GPL v3
 """
 
-from typing import List
+from typing import Iterable, Iterator, List
 
 from ...models.users import UserDB, UserUI
 from ...ports.users import UserUIPort
@@ -50,3 +50,15 @@ class UserUIAdapter(UserUIPort):
 
         usersui = [self._db_to_ui(user) for user in users]
         return usersui
+
+    def iter_all(self, users: Iterable[UserDB]) -> Iterator[UserUI]:
+        """
+        Convert database users to users for the UI, one at a time.
+        Works with the generator from `UserDBPort.iter_all`.
+
+        :users: Database representations of users.
+
+        :return: Generator of UI representations of the users.
+        """
+        for user in users:
+            yield self._db_to_ui(user)
@@ -11,6 +11,7 @@ from .documents import DocumentDB
 from .settings import AppSettingsDB
 from .sentences import DisplayTextDB, SentenceDB, WordDB
 from .users import UserDB
+from .words import Word
 
 
 class Database(BaseModel):
@@ -28,7 +29,16 @@ class Database(BaseModel):
     # * words: get all by user.id and status for practice
     # * display_text: get for showing sentences in editing views
     # * sentences: get a list of sentences by word for practice
+    # * document_sentences: get a window of a document's sentences for editing
+    # * base_words: get a Word by language code and base word
+    # * word_forms: find Words by language code and any of their forms
     documents: Optional[Dict[str, List[DocumentDB]]] = {}  # Key is user.id
     words: Optional[Dict[str, List[WordDB]]] = {}  # Key is (user.id, status)
     display_text: Optional[Dict[str, List[DisplayTextDB]]] = {}  # Key: sentence.id
     sentences: Optional[Dict[str, List[SentenceDB]]] = {}  # Key is word.id
+    # Key is document.id; each list is sorted by ordering
+    document_sentences: Optional[Dict[str, List[SentenceDB]]] = {}
+    # Key is languageCode, then baseWord
+    base_words: Optional[Dict[str, Dict[str, Word]]] = {}
+    # Key is languageCode, then form; values are baseWords
+    word_forms: Optional[Dict[str, Dict[str, List[str]]]] = {}
@@ -4,7 +4,7 @@ Affero GPL v3
 """
 
 import uuid
-from typing import Dict, List, Optional
+from typing import Dict, List, NamedTuple, Optional
 
 from pydantic import BaseModel, validator
 
@@ -38,6 +38,29 @@ class DocumentDB(HashableMixin, BaseModel):
         return ['user_id', 'display_name', 'language_code']
 
 
+class DocumentSummary(NamedTuple):
+    """
+    Just enough of a document to list it, e.g. in the sidebar.
+    A plain tuple, so it's built straight from database rows,
+    without validation.
+    """
+
+    id: uuid.UUID
+    display_name: str
+    language_code: str
+
+
+class DocumentUISummary(NamedTuple):
+    """
+    Just enough of a document to list it in the UI,
+    with the same field names as DocumentUI.
+    """
+
+    id: uuid.UUID
+    displayName: str
+    language: str
+
+
 class DocumentUI(HashableMixin, BaseModel):
     """
     Full document for display in the UI
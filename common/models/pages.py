@@ -0,0 +1,21 @@
+"""
+Copyright (C) J Leadbetter <j@jleadbetter.com>
+Affero GPL v3
+"""
+
+from typing import Generic, List, Optional, TypeVar
+
+from pydantic import BaseModel
+
+
+ItemT = TypeVar('ItemT')
+
+
+class Page(BaseModel, Generic[ItemT]):
+    """
+    One page of a list, for keyset pagination.
+    """
+
+    items: List[ItemT]
+    # Cursor for the next page, or None if this is the last page
+    next_cursor: Optional[str] = None
@@ -4,7 +4,7 @@ Affero GPL v3
 """
 
 import uuid
-from typing import Optional
+from typing import NamedTuple, Optional
 
 from pydantic import BaseModel
 
@@ -40,6 +40,18 @@ class UserDB(UserBase, BaseModel):
         return ['username']
 
 
+class UserSummary(NamedTuple):
+    """
+    Just enough of a user to list them, e.g. on the login screen.
+    A plain tuple, so it's built straight from database rows,
+    without validation.
+    """
+
+    id: uuid.UUID
+    username: str
+    display_name: Optional[str]
+
+
 class UserUI(UserBase, BaseModel):
     """
     Representation of a logged-in user in the UI.
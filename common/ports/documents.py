@@ -3,16 +3,60 @@ Copyright (C) J Leadbetter <j@jleadbetter.com>
 Affero GPL v3
 """
 
-import os
+import re
 import uuid
 from abc import ABC, abstractmethod
-from typing import Dict, List, Tuple
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple, Union
 
-from ..models.documents import DocumentDB, DocumentUI
+from ..models.documents import (
+    DocumentDB,
+    DocumentSummary,
+    DocumentUI,
+    DocumentUISummary,
+)
 from ..models.files import BinaryFileData
+from ..models.pages import Page
+from ..models.sentences import SentenceDB, SentenceUI
 from ..models.users import UserUI
 
 
+# Number of documents per page, when the caller doesn't say
+DEFAULT_PAGE_SIZE = 25
+
+# Number of documents fetched at a time by iter_all
+DEFAULT_CHUNK_SIZE = 500
+
+# Longest attribute line that is read from a stream
+MAX_ATTR_LINE = 64 * 1024
+
+# An attribute line, e.g. `:Some Attr: some string value`,
+# with its line ending (\n, \r\n or \r, whatever the platform)
+_ATTR_LINE = re.compile(
+    rb'[ \t]*:(?P<key>[^:\r\n]*):(?P<value>[^\r\n]*)(?:\r\n|\r|\n|$)',
+)
+
+
+def is_attr_line(line: Union[str, bytes]) -> bool:
+    """
+    Check whether a line is an attribute line, e.g. `:Some Attr: value`,
+    the same way the attributes are parsed.
+
+    :line: Line of the document, with or without its line ending.
+
+    :return: True if the line is an attribute line.
+    """
+    if isinstance(line, str):
+        line = line.encode('utf-8')
+    return _ATTR_LINE.match(line) is not None
+
+
+def _parse_attr(match: re.Match) -> Tuple[str, str]:
+    return (
+        match['key'].decode('utf-8').strip(),
+        match['value'].decode('utf-8').strip(),
+    )
+
+
 class DocumentDBPort(ABC):
     """
     Represents a document in the system
@@ -46,6 +90,38 @@ class DocumentDBPort(ABC):
         """
         pass
 
+    @abstractmethod
+    def find_by_name(
+        self,
+        user_id: uuid.UUID,
+        display_name: str,
+        language_code: str,
+    ) -> Optional[DocumentDB]:
+        """
+        Find a document by the fields that make it unique for a user,
+        without changing anything.
+
+        :user_id: The user's id that owns the document
+        :display_name: Display name of the document
+        :language_code: 2-letter language code of the document
+
+        :return: Matching DocumentDB, or None if there isn't one.
+        """
+        pass
+
+    @abstractmethod
+    def delete(self, id: uuid.UUID, user_id: uuid.UUID) -> bool:
+        """
+        Delete a document and its sentences.
+
+        :id: The id of the document
+        :user_id: The user's id that owns the document
+
+        :return: boolean -- true if deleted, false if the document
+            does not exist for the user.
+        """
+        pass
+
     @abstractmethod
     def get_all(self, user_id: uuid.UUID) -> List[DocumentDB]:
         """
@@ -57,6 +133,164 @@ class DocumentDBPort(ABC):
         """
         pass
 
+    @abstractmethod
+    def get_page(
+        self,
+        user_id: uuid.UUID,
+        language_code: Optional[str]=None,
+        offset: Optional[int]=0,
+        limit: Optional[int]=DEFAULT_PAGE_SIZE,
+    ) -> List[DocumentDB]:
+        """
+        Get one page of documents for the specified user,
+        ordered by language code and display name.
+
+        :user_id: The user's id who owns the documents
+        :language_code: Only get documents in this language.
+            Defaults to all languages.
+        :offset: Number of documents to skip.
+        :limit: Maximum number of documents to return.
+
+        :return: List of documents (may be empty)
+        """
+        pass
+
+    @abstractmethod
+    def iter_all(
+        self,
+        user_id: uuid.UUID,
+        chunk_size: Optional[int]=DEFAULT_CHUNK_SIZE,
+    ) -> Iterator[DocumentDB]:
+        """
+        Stream all documents for the specified user,
+        without loading them all at once.
+
+        :user_id: The user's id who owns the documents
+        :chunk_size: Number of documents fetched at a time.
+
+        :return: Generator of documents (may be empty)
+        """
+        pass
+
+    @abstractmethod
+    def get_cursor_page(
+        self,
+        user_id: uuid.UUID,
+        language_code: Optional[str]=None,
+        cursor: Optional[str]=None,
+        limit: Optional[int]=DEFAULT_PAGE_SIZE,
+    ) -> Page[DocumentDB]:
+        """
+        Get one page of documents for the specified user,
+        ordered by language code, display name and id.
+        Unlike `get_page`, deep pages are as quick as the first one.
+
+        :user_id: The user's id who owns the documents
+        :language_code: Only get documents in this language.
+            Defaults to all languages.
+        :cursor: `next_cursor` of the previous page.
+            Defaults to the first page.
+        :limit: Maximum number of documents to return.
+
+        :return: Page of documents, with the cursor of the next page.
+        :raises: CursorError if the cursor is invalid.
+            ValueError if `limit` is less than 1.
+        """
+        pass
+
+    @abstractmethod
+    def get_summary_page(
+        self,
+        user_id: uuid.UUID,
+        language_code: Optional[str]=None,
+        offset: Optional[int]=0,
+        limit: Optional[int]=DEFAULT_PAGE_SIZE,
+    ) -> List[DocumentSummary]:
+        """
+        Like `get_page`, but only get the id, display name
+        and language code of each document.
+
+        :user_id: The user's id who owns the documents
+        :language_code: Only get documents in this language.
+            Defaults to all languages.
+        :offset: Number of documents to skip.
+        :limit: Maximum number of documents to return.
+
+        :return: List of document summaries (may be empty)
+        """
+        pass
+
+    @abstractmethod
+    def count_by_language(self, user_id: uuid.UUID) -> Dict[str, int]:
+        """
+        Count the documents the specified user has in each language.
+
+        :user_id: The user's id who owns the documents
+
+        :return: Dictionary of language code to number of documents.
+            Languages without documents are left out.
+        """
+        pass
+
+    @abstractmethod
+    def add_sentences(
+        self,
+        id: uuid.UUID,
+        user_id: uuid.UUID,
+        sentences: List[SentenceDB],
+    ) -> List[SentenceDB]:
+        """
+        Add sentences to the end of a document.
+
+        NOTE: Only the sentences are saved, not their display text.
+              The port has no way to store DisplayTextDB and WordDB yet,
+              which is why uploads don't run the BatchTokenizer.
+
+        :id: The id of the document
+        :user_id: The user's id that owns the document
+        :sentences: Sentences to add. Sentences without an ordering
+            are numbered after the last sentence in the document.
+
+        :return: The sentences that were added.
+        :raises: ObjectNotFoundError if no matching document is found
+            for the user
+        """
+        pass
+
+    @abstractmethod
+    def count_sentences(self, id: uuid.UUID, user_id: uuid.UUID) -> int:
+        """
+        Count the sentences in a document.
+
+        :id: The id of the document
+        :user_id: The user's id that owns the document
+
+        :return: Number of sentences (0 if the document doesn't exist).
+        """
+        pass
+
+    @abstractmethod
+    def get_sentences(
+        self,
+        id: uuid.UUID,
+        user_id: uuid.UUID,
+        start: Optional[int]=0,
+        stop: Optional[int]=None,
+    ) -> List[SentenceDB]:
+        """
+        Get a window of sentences from a document,
+        so long documents don't have to be loaded all at once.
+
+        :id: The id of the document
+        :user_id: The user's id that owns the document
+        :start: First ordering to include.
+        :stop: Ordering to stop before. Defaults to the end of the document.
+
+        :return: Sentences with start <= ordering < stop,
+            sorted by ordering (may be empty).
+        """
+        pass
+
     def parse_binary_data_attrs(
         self,
         binary_data: BinaryFileData,
@@ -70,18 +304,38 @@ class DocumentDBPort(ABC):
 
             :Some Attr: some string value
 
+        Only the attribute lines are read and decoded,
+        so the cost doesn't depend on the length of the document.
+
         :binary_data: The data to parse.
         :return: dictionary of attr-to-values
         """
+        data = memoryview(binary_data.data)
+        attrs = {}
+        pos = 0
+        while match := _ATTR_LINE.match(data, pos):
+            key, value = _parse_attr(match)
+            attrs[key] = value
+            pos = match.end()
+        return attrs
+
+    def parse_stream_attrs(self, stream: BinaryIO) -> Dict[str, str]:
+        """
+        Parse the attributes at the start of a binary file,
+        like `parse_binary_data_attrs`, without reading the rest of it.
+
+        :stream: File opened for reading in binary mode,
+            positioned at the start of the document.
+            It's left somewhere after the attributes.
+        :return: dictionary of attr-to-values
+        """
         attrs = {}
-        data = binary_data.data.decode('utf-8')
-        text = data.split(os.linesep)
-        for line in text:
-            line = line.strip()
-            if not line.startswith(':'):
-                return attrs
-            key, value = line.split(':', 2)[1:]
-            attrs[key.strip()] = value.strip()
+        while line := stream.readline(MAX_ATTR_LINE):
+            match = _ATTR_LINE.match(line)
+            if not match:
+                break
+            key, value = _parse_attr(match)
+            attrs[key] = value
         return attrs
 
 
@@ -117,3 +371,28 @@ class DocumentUIPort(ABC):
         :return: List of DocumentUI objects.
         """
         pass
+
+    @abstractmethod
+    def get_summaries(
+        self,
+        summaries: List[DocumentSummary],
+    ) -> List[DocumentUISummary]:
+        """
+        Convert document summaries for listing them in the UI.
+        Open a document with `get` to see the rest of it.
+
+        :summaries: Summaries from `DocumentDBPort.get_summary_page`.
+
+        :return: List of DocumentUISummary tuples.
+        """
+        pass
+
+    @abstractmethod
+    def get_sentences(self, sentences: List[SentenceDB]) -> List[SentenceUI]:
+        """
+        Convert a list of database sentences into a list of UI objects.
+
+        :sentences: SentenceDB instances
+        :return: List of SentenceUI objects.
+        """
+        pass
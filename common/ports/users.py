@@ -4,9 +4,17 @@ Affero GPL v3
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Optional, Union
+from typing import Iterable, Iterator, List, Optional, Union
 
-from common.models.users import UserDB, UserUI
+from common.models.pages import Page
+from common.models.users import UserDB, UserSummary, UserUI
+
+
+# Number of users per page, when the caller doesn't say
+DEFAULT_USER_PAGE_SIZE = 100
+
+# Number of users fetched at a time by iter_all
+DEFAULT_USER_CHUNK_SIZE = 500
 
 
 class UserDBPort(ABC):
@@ -50,6 +58,16 @@ class UserDBPort(ABC):
         """
         pass
 
+    @abstractmethod
+    def has_users(self) -> bool:
+        """
+        Check whether there are any users in the database.
+        Cheap enough to call on every page load.
+
+        :return: True if at least one user exists.
+        """
+        pass
+
     @abstractmethod
     def get_by_username(self, username: str) -> UserDB:
         """
@@ -71,6 +89,50 @@ class UserDBPort(ABC):
         """
         pass
 
+    @abstractmethod
+    def get_summaries(self) -> List[UserSummary]:
+        """
+        Like `get_all`, but only get the id, username and display name
+        of each user.
+
+        :return: List of user summaries (may be empty)
+        """
+        pass
+
+    @abstractmethod
+    def iter_all(
+        self,
+        chunk_size: Optional[int]=DEFAULT_USER_CHUNK_SIZE,
+    ) -> Iterator[UserDB]:
+        """
+        Stream all users from the database,
+        without loading them all at once.
+
+        :chunk_size: Number of users fetched at a time.
+
+        :return: Generator of user objects (may be empty)
+        """
+        pass
+
+    @abstractmethod
+    def get_cursor_page(
+        self,
+        cursor: Optional[str]=None,
+        limit: Optional[int]=DEFAULT_USER_PAGE_SIZE,
+    ) -> Page[UserDB]:
+        """
+        Get one page of users, ordered by username.
+
+        :cursor: `next_cursor` of the previous page.
+            Defaults to the first page.
+        :limit: Maximum number of users to return.
+
+        :return: Page of users, with the cursor of the next page.
+        :raises: CursorError if the cursor is invalid.
+            ValueError if `limit` is less than 1.
+        """
+        pass
+
 
 class UserUIPort(ABC):
     """
@@ -98,3 +160,15 @@ class UserUIPort(ABC):
         :return: List of UI representations of the users.
         """
         pass
+
+    @abstractmethod
+    def iter_all(self, users: Iterable[UserDB]) -> Iterator[UserUI]:
+        """
+        Convert database users to users for the UI, one at a time.
+        Works with the generator from `UserDBPort.iter_all`.
+
+        :users: Database representations of users.
+
+        :return: Generator of UI representations of the users.
+        """
+        pass
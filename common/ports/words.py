@@ -5,10 +5,49 @@ Affero GPL v3
 Interface for retrieving words from storage.
 """
 
+import uuid
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Any, Iterable, List, Optional, Tuple
 
-from common.models.words import Word
+from pydantic import BaseModel
+
+from common.models.pages import Page
+from common.models.words import Translation, Word
+
+
+# Words saved at a time by create_in_batch
+DEFAULT_BATCH_SIZE = 500
+
+
+def word_key(word: Word) -> Tuple[str, str]:
+    """
+    :return: What makes a word unique: its languageCode and baseWord.
+    """
+    return (word.languageCode, word.baseWord)
+
+
+def with_ids(word: Word) -> Word:
+    """
+    Copy a word, and give it and its grammar data ids if they don't have any.
+
+    :word: Word to copy.
+
+    :return: Copy of the word, ready to be saved.
+    """
+    word = word.model_copy(deep=True)
+    if isinstance(word.type, BaseModel):
+        word.set_id()
+    elif not word.id:
+        # Grammar loaded from a file as a plain dict
+        word.id = str(uuid.uuid4())
+    return word
+
+
+def _get_text(item: Any) -> str:
+    # Grammar data can be a model, or a dict if it was loaded from a file
+    if isinstance(item, dict):
+        return item.get('text')
+    return getattr(item, 'text', None)
 
 
 class WordPort(ABC):
@@ -82,6 +121,26 @@ class WordPort(ABC):
         """
         pass
 
+    @abstractmethod
+    def read_page(
+        self,
+        number: int=100,
+        cursor: Optional[str]=None,
+    ) -> Page[Word]:
+        """
+        Retrieve a page of words, ordered by languageCode and baseWord.
+        Unlike `read_multiple`, the last page is as quick as the first.
+
+        :number: Maximum number of words to return.
+        :cursor: `next_cursor` of the previous page.
+            Defaults to the first page.
+
+        :return: Page of Word objects, with the cursor of the next page.
+        :raises: CursorError if the cursor is invalid.
+            ValueError if `number` is less than 1.
+        """
+        pass
+
     @abstractmethod
     def update(self, word: Word) -> Word:
         """
@@ -111,7 +170,96 @@ class WordPort(ABC):
         """
         pass
 
+    def dedupe(self, words: Iterable[Word]) -> List[Word]:
+        """
+        Remove duplicates from a list of words, in one pass.
+
+        :words: Words to check.
+
+        :return: The first of each word with the same languageCode
+            and baseWord, in their original order.
+        """
+        unique = {}
+        for word in words:
+            unique.setdefault(word_key(word), word)
+        return list(unique.values())
+
+    def get_forms(self, word: Word) -> List[str]:
+        """
+        Get the inflected forms of a word (e.g., the text of each VerbData).
+
+        :word: Word to check.
+
+        :return: Texts in the word's grammar data, except the baseWord,
+            without duplicates, in the order of the data.
+        """
+        data = getattr(word.type, 'data', None)
+        if data is None and isinstance(word.type, dict):
+            data = word.type.get('data')
+
+        forms = dict.fromkeys(_get_text(item) for item in data or [])
+        forms.pop(None, None)
+        forms.pop(word.baseWord, None)
+        return list(forms)
+
+    def get_index_forms(self, word: Word) -> List[str]:
+        """
+        Get the texts a word can be found by with `find_by_form`.
+
+        :word: Word to check.
+
+        :return: The baseWord, followed by the inflected forms.
+        """
+        return [word.baseWord, *self.get_forms(word)]
+
+    def merge_words(self, word: Word, others: Iterable[Word]) -> Word:
+        """
+        Fold the translations and frequency of other words into a word.
+        Nothing is saved.
+
+        :word: Word to merge into.
+        :others: Words to merge.
+
+        :return: The updated word.
+        """
+        translations = {
+            translation.languageCode: translation
+            for translation in word.translations or []
+        }
+        for other in others:
+            if word.frequency is None:
+                word.frequency = other.frequency
+
+            for translation in other.translations or []:
+                existing = translations.get(translation.languageCode)
+                if existing is None:
+                    translations[translation.languageCode] = Translation(
+                        word=word.id,
+                        languageCode=translation.languageCode,
+                        meanings=list(translation.meanings),
+                    )
+                    continue
+                for meaning in translation.meanings:
+                    if meaning not in existing.meanings:
+                        existing.meanings.append(meaning)
+
+        if translations:
+            word.translations = list(translations.values())
+        return word
+
     @abstractmethod
+    def find_by_form(self, language_code: str, text: str) -> List[Word]:
+        """
+        Find the words that have a base word or inflected form.
+        Uses an index of forms, rather than searching every word.
+
+        :language_code: 2-letter language code of the Words.
+        :text: Form to look for, e.g. 'liep'.
+
+        :return: Matching words, sorted by baseWord (may be empty).
+        """
+        pass
+
     def merge_existing(self, word: Word) -> Word:
         """
         Search the database for baseWords matching the text in WordData.
@@ -119,9 +267,30 @@ class WordPort(ABC):
         This is especially useful when fixing words that were previously
         imported as 'unknown' type.
 
+        NOTE: Display text is linked to the user's WordDB, not to Words,
+              so there are no links to rewire when Words are merged.
+              Once WordDB is linked to Words, those links need to be
+              moved in bulk here as well.
+
         :word: Word to be merged.
             Should safely handle if Words do not exist, or if the list is empty.
 
         :return: New/updated Word.
         """
+        return self.merge_existing_in_batch([word])[0]
+
+    @abstractmethod
+    def merge_existing_in_batch(self, words: List[Word]) -> List[Word]:
+        """
+        Merge existing words into each of the words, like `merge_existing`,
+        with a fixed number of queries for the whole batch.
+        Words in the batch are never merged into each other,
+        and a word that matches more than one of the words is merged into
+        the first one.
+
+        :words: Words to be merged.
+            Duplicates are ignored, like in `create_in_batch`.
+
+        :return: New/updated Words, in the same order.
+        """
         pass
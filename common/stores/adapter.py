@@ -7,9 +7,11 @@ import configparser
 import importlib
 import os
 import sys
-from typing import Any, Dict, Optional
+import threading
+from typing import Any, Dict, List, Optional
 
 from common.stores.config import ConfigStore
+from common.utils.profiler import measure
 from common.utils.singleton import Singleton
 
 
@@ -31,29 +33,58 @@ class AdapterNotFoundError(Exception):
 
 class AdapterStore(metaclass=Singleton):
     """
-    Singleton that instantiates all adapters using the specified config
+    Singleton that instantiates adapters using the specified config
+
+    Adapters are imported and built the first time they are requested,
+    so processes only pay for the adapters they actually use.
+    Ports listed in the `WarmUp` option are built during initialization.
+    Use `WarmUp = *` to build every configured adapter up front.
     """
 
-    def __init__(self):
+    def __init__(self, warmup: Optional[str]=None, **kwargs):
+        """
+        :warmup: Comma-separated list of ports to build during initialization,
+            or '*' for all ports.
+        """
         self._adapters = {}
+        # Reentrant, because adapters may request other adapters
+        # while they are being built.
+        self._lock = threading.RLock()
         self._config = ConfigStore()
+        self.warmup = [
+            port.strip().lower()
+            for port in (warmup or '').split(',')
+            if port.strip()
+        ]
         self.initialize()
 
-    def initialize(self, force: bool=False):
+    @property
+    def ports(self) -> List[str]:
+        return list(self._config.get('ports', default=[]))
+
+    def initialize(self, force: bool=False, ports: Optional[List[str]]=None):
         """
-        Initialize adapters for use in the app.
+        Build adapters ahead of their first use.
 
         This is done as a separate step from __init__
         so we can troubleshoot individual adapter initializations.
 
         :force: Re-import the adapters.
             If false, ignores build if adapters already exist.
+        :ports: Ports to build. Defaults to the warm-up list.
         """
 
-        if force:
-            self._adapters = {}
+        with self._lock:
+            if force:
+                self._adapters = {}
+
+            if ports is None:
+                ports = self.warmup
+            if '*' in ports:
+                ports = self.ports
+            self._build_adapters([port.lower() for port in ports])
 
-        ports = self._config.get('ports', default=[])
+    def _build_adapters(self, ports: List[str]):
         port_exceptions = {}
         for port in ports:
             # Don't override existing adapters
@@ -77,30 +108,37 @@ class AdapterStore(metaclass=Singleton):
 
         :return: the configured adapter for the port
         :raise: AdapterNotFoundError, if port is not configured
+        :raise: AdapterInitializationError, if the adapter fails to build
         """
 
-        try:
-            adapter = self._adapters[port_name.lower()]
-        except KeyError:
-            raise AdapterNotFoundError(f'Unable to find adapter for {port_name}.')
+        key = port_name.lower()
+        adapter = self._adapters.get(key)
+        if adapter is not None:
+            return adapter
 
-        return adapter
+        with self._lock:
+            # Another thread may have built it while we waited
+            adapter = self._adapters.get(key)
+            if adapter is not None:
+                return adapter
 
-    def _get_adapter_options(self, adapter_name: str) -> Dict[str, Any]:
-        options = {}
+            if key not in self._config.snapshot.section('ports'):
+                raise AdapterNotFoundError(
+                    f'Unable to find adapter for {port_name}.',
+                )
 
-        common_key = 'adapters.common'
-        general_opts = self._config.get(common_key, default=[])
-        for key in general_opts:
-            value = self._config.get(common_key, key)
-            options[key] = value
+            try:
+                adapter = self._make_adapter(key)
+            except Exception as exc:
+                raise AdapterInitializationError(str({key: exc})) from exc
+            self._adapters[key] = adapter
 
-        adapter_key = f'adapters.{adapter_name}'
-        adapter_opts = self._config.get(adapter_key, default=[])
-        for key in adapter_opts:
-            value = self._config.get(adapter_key, key)
-            options[key] = value
+        return adapter
 
+    def _get_adapter_options(self, adapter_name: str) -> Dict[str, Any]:
+        snapshot = self._config.snapshot
+        options = dict(snapshot.section('adapters.common'))
+        options.update(snapshot.section(f'adapters.{adapter_name}'))
         return options
 
     def _get_adapter_cls(self, adapter_name: str) -> Any:
@@ -111,7 +149,8 @@ class AdapterStore(metaclass=Singleton):
         return AdapterCls
 
     def _make_adapter(self, adapter_name: str):
-        AdapterCls = self._get_adapter_cls(adapter_name)
-        options = self._get_adapter_options(adapter_name)
-        adapter = AdapterCls(**options)
+        with measure('adapter', adapter_name):
+            AdapterCls = self._get_adapter_cls(adapter_name)
+            options = self._get_adapter_options(adapter_name)
+            adapter = AdapterCls(**options)
         return adapter
@@ -9,6 +9,7 @@ from typing import Any, Dict, Optional
 
 from ..models.settings import AppSettingsDB
 from ..stores.config import ConfigStore
+from ..utils.profiler import measure
 from ..utils.singleton import Singleton
 
 
@@ -82,23 +83,26 @@ class AppStore(metaclass=Singleton):
                 Singleton.destroy(store.__class__)
             self._stores = {}
 
-        config_store = ConfigStore(
-            config=self._config_file,
-            subsection=self._subsection,
-        )
+        with measure('store', 'configstore'):
+            config_store = ConfigStore(
+                config=self._config_file,
+                subsection=self._subsection,
+            )
         self._config = config_store
         self._stores['configstore'] = config_store
 
         init_script = self._config.get('', 'InitScript')
         if init_script:
-            script = self._get_init_script(init_script)
-            script()
+            with measure('init script', init_script):
+                script = self._get_init_script(init_script)
+                script()
 
         exceptions = {}
         for store in self.STORES:
             try:
                 if not store in self._stores:
-                    self._stores[store] = self._make_store(store)
+                    with measure('store', store):
+                        self._stores[store] = self._make_store(store)
             except Exception as exc:
                 exceptions[store] = exc
 
@@ -140,20 +144,9 @@ class AppStore(metaclass=Singleton):
         return script
 
     def _get_store_options(self, store_name: str) -> Dict[str, Any]:
-        options = {}
-
-        common_key = 'stores.common'
-        general_opts = self._config.get(common_key, default=[])
-        for key in general_opts:
-            value = self._config.get(common_key, key)
-            options[key] = value
-
-        store_key = f'stores.{store_name}'
-        store_opts = self._config.get(store_key, default=[])
-        for key in store_opts:
-            value = self._config.get(store_key, key)
-            options[key] = value
-
+        snapshot = self._config.snapshot
+        options = dict(snapshot.section('stores.common'))
+        options.update(snapshot.section(f'stores.{store_name}'))
         return options
 
     def _get_store_cls(self, store_name: str) -> Any:
@@ -4,8 +4,10 @@ Affero GPL v3
 """
 
 import configparser
+import threading
 from pathlib import Path
-from typing import Any, Optional
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional, Tuple
 
 from common.utils.singleton import Singleton
 
@@ -13,6 +15,110 @@ from common.utils.singleton import Singleton
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
 DEFAULT_CONFIG = BASE_DIR / 'setup.cfg'
 
+# Marks a value that is missing or can't be converted,
+# because None is a valid default
+_MISSING = object()
+
+
+def _dotted_key(section: str, key: str) -> str:
+    return f'{section}.{key}' if section else key
+
+
+class ConfigSnapshot:
+    """
+    Compiled, read-only copy of one subsection of setup.cfg
+
+    Section names are relative to the subsection
+    (e.g., 'ports' for '[dev.django.ports]'; '' for '[dev.django]' itself),
+    and both section names and keys are lower-cased.
+    Values are stored under dotted keys (e.g., 'adapters.dataport.datafile'),
+    so every lookup is a single dictionary access.
+    Type conversions are memoized.
+    """
+
+    def __init__(self, parser: configparser.ConfigParser, subsection: str):
+        """
+        :parser: Config file that has already been read.
+        :subsection: Subsection of the config file to compile.
+        """
+        prefix = f'{subsection}.'
+        sections = {}
+        values = {}
+        for section_path in parser.sections():
+            if section_path == subsection:
+                section = ''
+            elif section_path.startswith(prefix):
+                section = section_path[len(prefix):].lower()
+            else:
+                continue
+
+            # Resolves any interpolation once, up front
+            options = sections.setdefault(section, {})
+            options.update(parser[section_path])
+            for key, value in options.items():
+                values[_dotted_key(section, key)] = value
+
+        self._sections = MappingProxyType({
+            section: MappingProxyType(options)
+            for section, options in sections.items()
+        })
+        self._values = MappingProxyType(values)
+        self._converted: Dict[Tuple[str, type], Any] = {}
+
+    @staticmethod
+    def _convert(value: str, value_type: type) -> Any:
+        if value_type == str:
+            return value
+        if value_type == bool:
+            # Same values that configparser accepts
+            try:
+                return configparser.ConfigParser.BOOLEAN_STATES[value.lower()]
+            except KeyError:
+                raise ValueError(f'Not a boolean: {value}')
+        return value_type(value)
+
+    def section(self, section: str) -> Mapping[str, str]:
+        """
+        Get all the options in a section.
+
+        :section: Section relative to the subsection, e.g. 'ports'.
+
+        :return: Read-only mapping of option to value (may be empty).
+        """
+        return self._sections.get(section.lower(), MappingProxyType({}))
+
+    def get(
+        self,
+        dotted_key: str,
+        value_type: Optional[type]=str,
+        default: Optional[Any]=None,
+    ) -> Any:
+        """
+        Get a single value.
+
+        :dotted_key: Section and key, e.g. 'adapters.common.hashworkers'.
+        :value_type: Python type to return.
+        :default: Value to return if the key is missing
+            or can't be converted to value_type.
+
+        :return: The converted value, or the default.
+        """
+        dotted_key = dotted_key.lower()
+        memo_key = (dotted_key, value_type)
+        try:
+            value = self._converted[memo_key]
+        except KeyError:
+            value = self._values.get(dotted_key, _MISSING)
+            if value is not _MISSING:
+                try:
+                    value = self._convert(value, value_type)
+                except (TypeError, ValueError):
+                    value = _MISSING
+            # Losing a race here only means converting twice
+            self._converted[memo_key] = value
+
+        return default if value is _MISSING else value
+
 
 class ConfigStore(metaclass=Singleton):
     """
@@ -38,6 +144,8 @@ class ConfigStore(metaclass=Singleton):
 
         self._config = {}
         self._subsection = ''
+        self._snapshot = None
+        self._lock = threading.Lock()
         self.initialize()
 
     @property
@@ -52,19 +160,17 @@ class ConfigStore(metaclass=Singleton):
     def subsection(self):
         return self._subsection or self._config['config.meta']['defaultconfig']
 
-    def _convert_to_type(self, subsection: str, key: str, value_type: type):
-        if value_type == bool:
-            return self._config.getboolean(subsection, key)
-        elif value_type == int:
-            return self._config.getint(subsection, key)
-        else:
-            return value_type(self._config.get(subsection, key))
-
-    def _get_ini_path(self, subpath: Optional[str]=None):
-        if not subpath:
-            return self._subsection
+    @property
+    def snapshot(self) -> ConfigSnapshot:
+        return self._snapshot
 
-        return '.'.join([self._subsection, subpath])
+    def _compile(self):
+        """
+        Rebuild the snapshot from the parsed config file.
+        """
+        # Swapping in the whole snapshot at once means readers
+        # see either the old config or the new one, never a mix.
+        self._snapshot = ConfigSnapshot(self._config, self._subsection)
 
     def initialize(self, force=False):
         """
@@ -72,16 +178,22 @@ class ConfigStore(metaclass=Singleton):
         If it has already been initialized,
         this will skip initialization.
 
-        :force: Force re-initialization
+        :force: Force re-initialization.
+            Re-reads the config file and replaces the snapshot atomically.
         """
         if self._config and not force:
             return
 
-        self._config = configparser.ConfigParser()
-        self._config.read(self._config_name)
-        self._subsection = (
-            self._subsection_name or self._config['config.meta']['defaultconfig']
-        )
+        with self._lock:
+            config = configparser.ConfigParser()
+            config.read(self._config_name)
+            subsection = (
+                self._subsection_name or config['config.meta']['defaultconfig']
+            )
+
+            self._config = config
+            self._subsection = subsection
+            self._compile()
 
     def get(
         self,
@@ -106,24 +218,12 @@ class ConfigStore(metaclass=Singleton):
             otherwise None
         """
 
-        # Configparse lower-cases all strings,
-        # even if the config uses camelCase
-        section_name = section.lower()
-        section_path = self._get_ini_path(section)
-        try:
-            section = self._config[section_path]
-        except KeyError:
-            return default if key else []
-
+        snapshot = self._snapshot
         if not key:
-            return list(section)
+            return list(snapshot.section(section))
 
-        # Configparse lower-cases all strings,
-        # even if the config uses camelCase
-        key = key.lower()
-        try:
-            value = self._convert_to_type(section_path, key, value_type)
-        except (configparser.NoOptionError, KeyError, ValueError):
-            value = default
-
-        return value
+        return snapshot.get(
+            _dotted_key(section.lower(), key),
+            value_type,
+            default,
+        )
@@ -3,5 +3,22 @@ Copyright (C) J Leadbetter <j@jleadbetter.com>
 Affero GPL v3
 """
 
-from .django import DjangoDBStore
-from .in_memory import InMemoryDBStore
+import importlib
+
+
+# Stores are imported on first use,
+# so the in-memory configuration doesn't have to import Django.
+_STORE_MODULES = {
+    'DjangoDBStore': '.django',
+    'InMemoryDBStore': '.in_memory',
+}
+
+
+def __getattr__(name: str):
+    try:
+        module_name = _STORE_MODULES[name]
+    except KeyError:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+    module = importlib.import_module(module_name, __name__)
+    return getattr(module, name)
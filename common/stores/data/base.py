@@ -8,6 +8,7 @@ from typing import Optional, Tuple
 
 from common.stores.adapter import AdapterStore
 from common.utils.config import str_to_bool
+from common.utils.profiler import measure
 from common.utils.singleton import Singleton
 
 
@@ -59,7 +60,8 @@ class BaseDataStore(metaclass=Singleton):
             if db_file:
                 db_file = Path(db_file).resolve()
 
-            self.adapter.load(data_file=db_file)
+            with measure('data load', str(db_file or 'DataFile')):
+                self.adapter.load(data_file=db_file)
             self._data_is_loaded = True
 
     def setup(self):
@@ -3,21 +3,98 @@ Copyright (C) J Leadbetter <j@jleadbetter.com>
 Affero GPL v3
 """
 
-from typing import Tuple
+import importlib.util
+from pathlib import Path
+from typing import FrozenSet, Tuple
 
+from django.apps import apps
+from django.conf import settings
 from django.core.management import call_command
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.migrations.loader import MigrationLoader
+from django.db.migrations.recorder import MigrationRecorder
 
+from ...utils.cache import ChangeSignal
 from ..config import ConfigStore
 from .base import BaseDataStore
 
 
+def get_migration_files() -> FrozenSet[Tuple[str, str]]:
+    """
+    Find the migrations that exist on disk,
+    without importing them the way `migrate` does.
+
+    :return: Set of (app label, migration name)
+    """
+    migrations = set()
+    for app_config in apps.get_app_configs():
+        module_name, _ = MigrationLoader.migrations_module(app_config.label)
+        if not module_name:
+            continue
+
+        try:
+            spec = importlib.util.find_spec(module_name)
+        except ImportError:
+            spec = None
+        if not spec or not spec.submodule_search_locations:
+            continue
+
+        for location in spec.submodule_search_locations:
+            for path in Path(location).iterdir():
+                if path.suffix == '.py' and not path.name.startswith('_'):
+                    migrations.add((app_config.label, path.stem))
+
+    return frozenset(migrations)
+
+
+def get_applied_migrations(
+    database: str=DEFAULT_DB_ALIAS,
+) -> FrozenSet[Tuple[str, str]]:
+    """
+    Find the migrations that the database has recorded as applied.
+
+    :database: Alias of the database to check.
+
+    :return: Set of (app label, migration name)
+    """
+    recorder = MigrationRecorder(connections[database])
+    if not recorder.has_table():
+        return frozenset()
+    return frozenset(recorder.applied_migrations())
+
+
 class DjangoDBStore(BaseDataStore):
     """
     Manages a database configured by Django.
+
+    Only migrates at startup when there are migrations on disk
+    that the database hasn't applied.
+    Use `upgrade` to run `migrate` regardless.
     """
 
+    def schema_is_current(self) -> bool:
+        """
+        Check whether every migration on disk has been applied.
+
+        :return: True if there is nothing to migrate.
+        """
+        # The database may also record migrations that no longer have a file
+        # (e.g., after squashing), so we don't need an exact match.
+        return get_migration_files() <= get_applied_migrations()
+
     def setup(self):
+        if not self.schema_is_current():
+            self.upgrade()
+
+    def upgrade(self):
+        """
+        Apply migrations to the database, whether or not any look pending.
+        """
         call_command('migrate')
 
     def drop(self):
         call_command('flush', '--no-input')
+        # Flushing doesn't send delete signals,
+        # so tell anyone caching the settings or users ourselves.
+        ChangeSignal(settings.APP_SETTINGS_SIGNAL_FILE).notify()
+        ChangeSignal(settings.USERS_SIGNAL_FILE).notify()
@@ -21,6 +21,22 @@ class InMemoryDBStore(BaseDataStore):
     An in-memory database for testing and development.
     """
 
+    def __init__(self, **kwargs):
+        self._db = None
+        self.version = 0
+        super().__init__(**kwargs)
+
+    @property
+    def db(self) -> Database:
+        return self._db
+
+    @db.setter
+    def db(self, db: Database):
+        # Count every swap (setup, drop, load), so caches can tell
+        # the new database apart from the one it replaced.
+        self._db = db
+        self.version += 1
+
     def _get_blank_database(self) -> Database:
         return Database()
 
@@ -0,0 +1,181 @@
+"""
+Copyright (C) J Leadbetter <j@jleadbetter.com>
+Affero GPL v3
+"""
+
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Union
+
+
+# Marks an empty cache, because None is a valid cached value
+_EMPTY = object()
+
+
+class ChangeSignal:
+    """
+    Lets processes that share a database tell each other
+    that something changed.
+
+    The signal is a file. Notifying rewrites it, which bumps its mtime;
+    listeners compare the mtime with the last one they saw.
+    Listeners in the same process see a notification immediately.
+    Listeners in other processes see it the next time they check the file,
+    which happens at most once every `check_interval` seconds.
+    """
+
+    # Notifications sent from this process, per signal file
+    _local_versions: Dict[str, int] = {}
+    _local_lock = threading.Lock()
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        check_interval: Optional[float]=1.0,
+    ):
+        """
+        :path: Location of the signal file.
+            Every process that should hear the signal must use the same path.
+        :check_interval: Minimum number of seconds between checks of the file.
+        """
+        self.path = Path(path)
+        self.check_interval = float(check_interval)
+
+        self._seen_local = self._local_versions.get(str(self.path), 0)
+        self._seen_mtime = self._get_mtime()
+        self._last_check = time.monotonic()
+
+    def _get_mtime(self) -> Optional[int]:
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except OSError:
+            return None
+
+    def notify(self):
+        """
+        Tell all listeners that the data changed.
+        """
+        key = str(self.path)
+        with self._local_lock:
+            self._local_versions[key] = self._local_versions.get(key, 0) + 1
+
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.path.write_text(str(time.time_ns()))
+        except OSError:
+            # Other processes won't hear about this change,
+            # but this process still will.
+            pass
+
+        # The sender doesn't need to hear its own notification
+        self.acknowledge()
+
+    def acknowledge(self):
+        """
+        Mark all notifications so far as seen.
+        """
+        self._seen_local = self._local_versions.get(str(self.path), 0)
+        self._seen_mtime = self._get_mtime()
+        self._last_check = time.monotonic()
+
+    def has_changed(self) -> bool:
+        """
+        Check whether a notification arrived since the last check.
+
+        :return: True if the data changed.
+        """
+        local_version = self._local_versions.get(str(self.path), 0)
+        if local_version != self._seen_local:
+            self._seen_local = local_version
+            self._seen_mtime = self._get_mtime()
+            return True
+
+        now = time.monotonic()
+        if now - self._last_check < self.check_interval:
+            return False
+        self._last_check = now
+
+        mtime = self._get_mtime()
+        if mtime != self._seen_mtime:
+            self._seen_mtime = mtime
+            return True
+        return False
+
+
+class SettingsCache:
+    """
+    Read-through cache for a single value that rarely changes,
+    such as the app settings.
+
+    Writers should call `set` (write-through) or `invalidate`.
+    Writers in other processes are picked up through a ChangeSignal.
+    """
+
+    def __init__(
+        self,
+        signal: Optional[ChangeSignal]=None,
+        version: Optional[Callable[[], Any]]=None,
+    ):
+        """
+        :signal: Signal that other processes use to report changes.
+        :version: Cheap function whose result changes
+            when the underlying storage is replaced.
+        """
+        self._signal = signal
+        self._version = version
+        self._value = _EMPTY
+        self._value_version = None
+        self._lock = threading.Lock()
+
+    def _current_version(self) -> Any:
+        return self._version() if self._version else None
+
+    def get(self, loader: Callable[[], Any]) -> Any:
+        """
+        Get the cached value, loading it if necessary.
+
+        :loader: Function that reads the value from storage.
+
+        :return: The cached value.
+        """
+        if self._signal and self._signal.has_changed():
+            self.invalidate()
+
+        value = self._value
+        if value is not _EMPTY and self._value_version == self._current_version():
+            return value
+
+        with self._lock:
+            version = self._current_version()
+            if self._value is _EMPTY or self._value_version != version:
+                self._value = loader()
+                self._value_version = version
+            return self._value
+
+    def set(self, value: Any, notify: Optional[bool]=True):
+        """
+        Replace the cached value after writing it to storage.
+
+        :value: The value that was just written.
+        :notify: Tell other processes that the value changed.
+        """
+        with self._lock:
+            self._value = value
+            self._value_version = self._current_version()
+
+        if self._signal:
+            if notify:
+                self._signal.notify()
+            else:
+                # We already have the latest value
+                self._signal.acknowledge()
+
+    def invalidate(self):
+        """
+        Drop the cached value, so the next `get` reads from storage.
+        """
+        with self._lock:
+            self._value = _EMPTY
+            self._value_version = None
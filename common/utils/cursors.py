@@ -0,0 +1,149 @@
+"""
+Copyright (C) J Leadbetter <j@jleadbetter.com>
+Affero GPL v3
+
+Opaque cursors for keyset pagination.
+
+A cursor holds the sort key of the last item on a page,
+and the next page starts right after that key.
+Unlike an offset, finding the start of the page doesn't mean
+counting through every item before it, so the last page
+is as quick to load as the first.
+
+    page = adapter.read_page(100)
+    while page.next_cursor:
+        page = adapter.read_page(100, cursor=page.next_cursor)
+"""
+
+import base64
+import binascii
+import heapq
+import json
+from typing import Any, Callable, Iterable, List, Optional, Sequence, Tuple
+
+from ..models.pages import Page
+
+
+class CursorError(ValueError):
+    """
+    Indicates that a cursor is malformed, or belongs to another list.
+    """
+    pass
+
+
+def encode_cursor(kind: str, key: Sequence[Any]) -> str:
+    """
+    Make a cursor that points just after an item.
+
+    :kind: Name of the list the cursor is for, e.g. 'words'.
+    :key: Sort key of the item. Values are stored as strings.
+
+    :return: URL-safe string.
+    """
+    payload = json.dumps([kind, [str(value) for value in key]])
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(
+    kind: str,
+    cursor: str,
+    size: Optional[int]=None,
+) -> Tuple[str, ...]:
+    """
+    Get the sort key back from a cursor.
+
+    :kind: Name of the list the cursor should be for.
+    :cursor: Cursor made by `encode_cursor`.
+    :size: Number of values the sort key should have.
+        Defaults to not checking.
+
+    :return: Sort key, as strings.
+    :raises: CursorError if the cursor can't be used for this list.
+    """
+    try:
+        payload = base64.urlsafe_b64decode(cursor.encode('ascii'))
+        cursor_kind, key = json.loads(payload.decode('utf-8'))
+    except (
+        AttributeError,
+        binascii.Error,
+        TypeError,
+        UnicodeError,
+        ValueError,
+    ) as exc:
+        raise CursorError(f'Invalid cursor: {cursor!r}') from exc
+
+    if (
+        cursor_kind != kind or
+        not isinstance(key, list) or
+        (size is not None and len(key) != size) or
+        not all(isinstance(value, str) for value in key)
+    ):
+        raise CursorError(f'Cursor is not for {kind}')
+    return tuple(key)
+
+
+def check_limit(limit: int):
+    """
+    Check the number of items asked for on a page.
+
+    :limit: Number of items on the page.
+
+    :raises: ValueError if the limit is not a whole number of at least 1.
+    """
+    if not isinstance(limit, int) or limit < 1:
+        raise ValueError(f'Page limit must be at least 1, not {limit!r}')
+
+
+def make_page(
+    items: List[Any],
+    limit: int,
+    kind: str,
+    key: Callable[[Any], Sequence[Any]],
+) -> Page:
+    """
+    Make a page from up to `limit + 1` items.
+    The extra item only shows that there is another page.
+
+    :items: Items in sort order, starting after the cursor.
+    :limit: Number of items on the page.
+    :kind: Name of the list, for the cursor.
+    :key: Gets the sort key of an item.
+
+    :return: Page of at most `limit` items.
+    :raises: ValueError if the limit is less than 1.
+    """
+    check_limit(limit)
+    if len(items) <= limit:
+        return Page(items=items)
+    items = items[:limit]
+    return Page(items=items, next_cursor=encode_cursor(kind, key(items[-1])))
+
+
+def paginate(
+    items: Iterable[Any],
+    key: Callable[[Any], Tuple[str, ...]],
+    kind: str,
+    cursor: Optional[str],
+    limit: int,
+) -> Page:
+    """
+    Get a page of items that are kept in memory.
+    Items only have to be compared with the cursor, not sorted,
+    so every page takes the same time.
+
+    :items: Items to page through, in any order.
+    :key: Gets the sort key of an item, as strings.
+        Keys must be unique.
+    :kind: Name of the list, for the cursor.
+    :cursor: Cursor of the previous page, or None for the first page.
+    :limit: Number of items on the page.
+
+    :return: Page of at most `limit` items.
+    :raises: CursorError if the cursor is invalid.
+        ValueError if the limit is less than 1.
+    """
+    check_limit(limit)
+    if cursor is not None:
+        after = decode_cursor(kind, cursor)
+        items = (item for item in items if key(item) > after)
+    return make_page(heapq.nsmallest(limit + 1, items, key=key), limit, kind, key)
@@ -3,12 +3,12 @@ Copyright (C) J Leadbetter <j@jleadbetter.com>
 Affero GPL v3
 """
 
+import configparser
 import os
 from pathlib import Path
-from typing import Union
+from typing import Optional, Union
 
-from common.models.documents import DocumentDB
-from common.stores.config import ConfigStore
+from common.stores.config import DEFAULT_CONFIG, ConfigSnapshot, ConfigStore
 
 
 def get_project_dir():
@@ -21,6 +21,14 @@ def get_project_dir():
     return top_level_dir
 
 
+def _full_upload_path(base_path: str) -> Path:
+    # It's already an absolute directory
+    if base_path.startswith('/'):
+        return Path(base_path)
+
+    return get_project_dir() / base_path
+
+
 def get_upload_dir():
     """
     Get the absolute path to the upload directory.
@@ -28,12 +36,29 @@ def get_upload_dir():
     :return: Path as to the upload directory.
     """
     config = ConfigStore()
-    base_path = config.get('common', 'UploadDir')
+    return _full_upload_path(config.get('common', 'UploadDir'))
 
-    # It's already an absolute directory
-    if base_path.startswith('/'):
-        return Path(base_path)
 
-    top_level_dir = Path(__file__).resolve().parent.parent.parent
-    full_path = top_level_dir / base_path
-    return full_path
+def read_upload_dir(
+    config: Optional[Union[str, Path]]=None,
+    subsection: Optional[str]=None,
+) -> Path:
+    """
+    Get the absolute path to the upload directory,
+    reading the config file directly.
+    Unlike `get_upload_dir`, this doesn't create the ConfigStore,
+    so it's safe to call before the app has set up its stores
+    (e.g., from the Django settings).
+
+    :config: Configuration file to use.
+        Defaults to setup.cfg in the top-level project folder.
+    :subsection: Subsection of the config file to use.
+        If not specified, uses the config.meta.DefaultConfig setting.
+
+    :return: Path to the upload directory.
+    """
+    parser = configparser.ConfigParser()
+    parser.read(str(config or DEFAULT_CONFIG))
+    subsection = subsection or parser['config.meta']['defaultconfig']
+    snapshot = ConfigSnapshot(parser, subsection)
+    return _full_upload_path(snapshot.get('common.uploaddir'))
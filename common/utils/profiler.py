@@ -0,0 +1,268 @@
+"""
+Copyright (C) J Leadbetter <j@jleadbetter.com>
+Affero GPL v3
+
+Find out where the time goes while the app starts up.
+
+Turn it on with the PROFILE_STARTUP environment variable
+(or `--profile-startup` for frontend/main.py).
+Values like 1/true/yes turn it on, and 0/false/no leave it off.
+Set the variable to a file path to choose where the report is written.
+"""
+
+import importlib.abc
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+
+PROFILE_ENV_VAR = 'PROFILE_STARTUP'
+PROFILE_FLAG = '--profile-startup'
+
+DEFAULT_REPORT = 'startup-profile.txt'
+
+# Values of PROFILE_STARTUP that turn profiling on
+# without choosing a report path
+_TRUE_VALUES = ('1', 'y', 'yes', 't', 'true', 'on')
+
+# Values of PROFILE_STARTUP that leave profiling off
+_FALSE_VALUES = ('', '0', 'n', 'no', 'f', 'false', 'off')
+
+
+class _TimedLoader(importlib.abc.Loader):
+    """
+    Wraps a module's loader to time how long the module takes to execute.
+    The original loader is put back once the module is loaded.
+    """
+
+    def __init__(self, profiler: 'StartupProfiler', loader: importlib.abc.Loader):
+        self._profiler = profiler
+        self._loader = loader
+
+    def __getattr__(self, name: str):
+        return getattr(self._loader, name)
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        try:
+            with self._profiler.time_import(module.__name__):
+                self._loader.exec_module(module)
+        finally:
+            module.__loader__ = self._loader
+            if getattr(module, '__spec__', None):
+                module.__spec__.loader = self._loader
+
+
+class _TimedFinder(importlib.abc.MetaPathFinder):
+    """
+    Finds modules with the regular finders,
+    then wraps their loaders in a _TimedLoader.
+    """
+
+    def __init__(self, profiler: 'StartupProfiler'):
+        self._profiler = profiler
+
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, 'find_spec'):
+                continue
+
+            spec = finder.find_spec(fullname, path, target)
+            if spec is None:
+                continue
+
+            if spec.loader and hasattr(spec.loader, 'exec_module'):
+                spec.loader = _TimedLoader(self._profiler, spec.loader)
+            return spec
+
+        return None
+
+
+class StartupProfiler:
+    """
+    Records how long startup steps and module imports take.
+
+    Import times include the modules each import pulls in ("total"),
+    as well as the time spent in the module itself ("self").
+    """
+
+    def __init__(self):
+        self.enabled = False
+        # (category, name, seconds)
+        self.steps: List[Tuple[str, str, float]] = []
+        # module name: (total seconds, self seconds)
+        self.imports: Dict[str, Tuple[float, float]] = {}
+
+        self._finder = _TimedFinder(self)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def enable(self):
+        """
+        Start recording.
+        Only imports that happen after this call are timed.
+        """
+        self.enabled = True
+        if self._finder not in sys.meta_path:
+            sys.meta_path.insert(0, self._finder)
+
+    def disable(self):
+        """
+        Stop recording. Keeps anything recorded so far.
+        """
+        self.enabled = False
+        if self._finder in sys.meta_path:
+            sys.meta_path.remove(self._finder)
+
+    def clear(self):
+        """
+        Throw away everything recorded so far.
+        """
+        with self._lock:
+            self.steps = []
+            self.imports = {}
+
+    @contextmanager
+    def time_import(self, module_name: str) -> Iterator[None]:
+        """
+        Time the execution of a module.
+
+        :module_name: Full name of the module being imported.
+        """
+        # Each entry is the time spent in nested imports so far
+        stack = self._local.__dict__.setdefault('stack', [])
+        stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            total = time.perf_counter() - start
+            nested = stack.pop()
+            if stack:
+                stack[-1] += total
+            with self._lock:
+                self.imports[module_name] = (total, total - nested)
+
+    @contextmanager
+    def measure(self, category: str, name: str) -> Iterator[None]:
+        """
+        Time a startup step.
+
+        :category: Kind of step, e.g. 'store' or 'adapter'.
+        :name: What is being timed, e.g. the port name.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.steps.append((category, name, elapsed))
+
+    def report(self) -> str:
+        """
+        Format everything recorded so far, slowest first.
+
+        :return: Report as plain text.
+        """
+        with self._lock:
+            steps = sorted(self.steps, key=lambda step: step[2], reverse=True)
+            imports = sorted(
+                self.imports.items(),
+                key=lambda item: item[1][0],
+                reverse=True,
+            )
+
+        lines = ['Startup steps', '=============', '']
+        lines.append(f'{"ms":>10}  {"category":<12}  name')
+        for category, name, seconds in steps:
+            lines.append(f'{seconds * 1000:>10.1f}  {category:<12}  {name}')
+
+        lines.extend(['', 'Imports', '=======', ''])
+        lines.append(f'{"total ms":>10}  {"self ms":>10}  module')
+        for module_name, (total, own) in imports:
+            lines.append(f'{total * 1000:>10.1f}  {own * 1000:>10.1f}  {module_name}')
+
+        return '\n'.join(lines) + '\n'
+
+    def write_report(self, path: Union[str, Path]):
+        """
+        Write the report to a file.
+
+        :path: Location of the report.
+        """
+        Path(path).write_text(self.report())
+
+
+_profiler = StartupProfiler()
+
+
+def get_profiler() -> StartupProfiler:
+    """
+    Get the profiler shared by the whole process.
+
+    NOTE: This isn't a Singleton, because AppStore.destroy_all
+          would throw away the timings halfway through startup.
+    """
+    return _profiler
+
+
+def get_report_path(default: Optional[Union[str, Path]]=None) -> Path:
+    """
+    Find where the report should be written.
+
+    :default: Path to use if PROFILE_STARTUP doesn't name a file.
+        Defaults to startup-profile.txt in the current directory.
+
+    :return: Path of the report.
+    """
+    value = os.environ.get(PROFILE_ENV_VAR, '').strip()
+    if value.lower() not in _TRUE_VALUES + _FALSE_VALUES:
+        return Path(value)
+    return Path(default or DEFAULT_REPORT)
+
+
+def enable_from_env(argv: Optional[List[str]]=None) -> bool:
+    """
+    Turn on profiling if requested with PROFILE_STARTUP or `--profile-startup`.
+
+    :argv: Command line arguments. Defaults to sys.argv.
+        The flag is removed, so it doesn't confuse other argument parsers.
+
+    :return: True if profiling is on.
+    """
+    argv = sys.argv if argv is None else argv
+    value = os.environ.get(PROFILE_ENV_VAR, '').strip()
+    # Anything that isn't off is either on, or the path of the report
+    requested = value.lower() not in _FALSE_VALUES
+    if PROFILE_FLAG in argv:
+        argv.remove(PROFILE_FLAG)
+        requested = True
+
+    if requested:
+        _profiler.enable()
+    return _profiler.enabled
+
+
+def measure(category: str, name: str):
+    """
+    Time a startup step, if profiling is on.
+    Costs next to nothing when profiling is off.
+
+    Usage:
+
+        with measure('adapter', 'UserDBPort'):
+            ...
+
+    :category: Kind of step, e.g. 'store' or 'adapter'.
+    :name: What is being timed.
+    """
+    if not _profiler.enabled:
+        return nullcontext()
+    return _profiler.measure(category, name)
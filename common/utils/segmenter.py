@@ -0,0 +1,356 @@
+"""
+Copyright (C) J Leadbetter <j@jleadbetter.com>
+Affero GPL v3
+
+Split uploaded documents into sentences.
+
+A line break always ends a sentence (documents are written with one
+sentence per line, more or less), and lines with more than one sentence
+are split further using rules for the document's language.
+
+Usage:
+
+    with path.open('rb') as stream:
+        for sentence in segment_stream(stream, document):
+            ...
+
+    # Huge documents can be split by several processes at once
+    for sentence in segment_file(path, document, workers=4):
+        ...
+"""
+
+import io
+import multiprocessing
+import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import (
+    BinaryIO,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from ..models.documents import DocumentDB
+from ..models.sentences import SentenceDB
+from ..ports.documents import is_attr_line
+
+
+# Bytes of the document each worker process splits at a time
+DEFAULT_CHUNK_SIZE = 4 * 1024 * 1024
+
+DEFAULT_WORKERS = 2
+
+SENTENCE_END = '.!?…'
+OPENING_QUOTES = '"\'“‘„‚«‹(['
+CLOSING_QUOTES = '"\'”’“‘»›)]'
+
+# Sentence-ending punctuation, any closing quotes after it,
+# and the whitespace before the next sentence
+_BOUNDARY = re.compile(
+    rf'[{re.escape(SENTENCE_END)}]+'
+    rf'(?P<quotes>[{re.escape(CLOSING_QUOTES)}]*)'
+    r'\s+',
+)
+
+
+class SegmentRules:
+    """
+    How to find the end of a sentence in a particular language.
+    """
+
+    def __init__(
+        self,
+        abbreviations: Iterable[str]=(),
+        ordinal_numbers: bool=False,
+    ):
+        """
+        :abbreviations: Words that end in a period without ending the
+            sentence, without the final period (e.g., 'dr', 'z.b').
+            Single letters (initials) are always treated as abbreviations.
+        :ordinal_numbers: Whether a number followed by a period
+            is an ordinal (e.g., German '3. Mai'), rather than the end
+            of a sentence.
+        """
+        self.abbreviations = frozenset(
+            abbreviation.lower().rstrip('.') for abbreviation in abbreviations
+        )
+        self.ordinal_numbers = ordinal_numbers
+
+    def is_abbreviation(self, word: str) -> bool:
+        """
+        Check whether a word that is followed by a period is abbreviated.
+
+        :word: Word before the period, without the period.
+
+        :return: True if the period doesn't end the sentence.
+        """
+        word = word.lstrip(OPENING_QUOTES).lower()
+        if len(word) == 1 and word.isalpha():
+            return True
+        if self.ordinal_numbers and word.isdigit():
+            return True
+        return word in self.abbreviations
+
+
+_RULES: Dict[str, SegmentRules] = {
+    'de': SegmentRules(
+        abbreviations=(
+            'bzw', 'ca', 'd.h', 'dr', 'evtl', 'fr', 'ggf', 'hr', 'nr',
+            'prof', 'st', 'str', 'u.a', 'usw', 'vgl', 'z.b', 'z.t',
+        ),
+        ordinal_numbers=True,
+    ),
+    'en': SegmentRules(
+        abbreviations=(
+            'dr', 'e.g', 'etc', 'i.e', 'jr', 'mr', 'mrs', 'ms', 'no',
+            'prof', 'sr', 'st', 'vs',
+        ),
+    ),
+    'nl': SegmentRules(
+        abbreviations=(
+            'bijv', 'blz', 'ca', 'd.w.z', 'dhr', 'dr', 'enz', 'jl', 'm.a.w',
+            'mevr', 'nr', 'o.a', 'prof', 'st',
+        ),
+    ),
+}
+
+_DEFAULT_RULES = SegmentRules()
+
+
+def get_rules(language_code: str) -> SegmentRules:
+    """
+    Get the rules for a language.
+
+    :language_code: Code of the language, e.g. 'nl'.
+
+    :return: Rules for the language, or rules that only know about
+        initials if the language doesn't have any.
+    """
+    return _RULES.get(language_code, _DEFAULT_RULES)
+
+
+def register_rules(language_code: str, rules: SegmentRules):
+    """
+    Add or replace the rules for a language.
+
+    :language_code: Code of the language, e.g. 'nl'.
+    :rules: Rules to use for documents in that language.
+    """
+    _RULES[language_code] = rules
+
+
+def split_sentences(line: str, rules: SegmentRules=_DEFAULT_RULES) -> List[str]:
+    """
+    Split a single line of text into sentences.
+
+    Closing quotes stay with the sentence they close, and a quote followed
+    by a lower-case word doesn't end the sentence
+    (e.g., '"Ja!" riep hij.' is one sentence).
+
+    :line: Text to split.
+    :rules: Rules for the text's language.
+
+    :return: Sentences, without surrounding whitespace.
+    """
+    line = line.strip()
+    sentences = []
+    start = 0
+    for match in _BOUNDARY.finditer(line):
+        end = match.end()
+        if end < len(line) and line[end].islower():
+            continue
+
+        punctuation_end = match.start('quotes')
+        if line[punctuation_end - 1] == '.' and not match['quotes']:
+            word_start = max(line.rfind(' ', start, match.start()) + 1, start)
+            if rules.is_abbreviation(line[word_start:match.start()]):
+                continue
+
+        sentences.append(line[start:end].rstrip())
+        start = end
+
+    rest = line[start:]
+    if rest.strip(CLOSING_QUOTES + SENTENCE_END) or not sentences:
+        if rest:
+            sentences.append(rest)
+    else:
+        # Stray punctuation belongs to the sentence before it
+        sentences[-1] += rest
+    return sentences
+
+
+def segment_text(
+    lines: Iterable[str],
+    rules: SegmentRules=_DEFAULT_RULES,
+    skip_header: bool=True,
+) -> Iterator[str]:
+    """
+    Split lines of text into sentences.
+    Blank lines are skipped.
+
+    :lines: Lines of text (e.g., a text file).
+    :rules: Rules for the text's language.
+    :skip_header: Skip the attribute lines at the start of the text.
+
+    :return: Generator of sentences.
+    """
+    in_header = skip_header
+    for line in lines:
+        if in_header and is_attr_line(line):
+            continue
+        in_header = False
+        yield from split_sentences(line, rules)
+
+
+def segment_stream(
+    stream: BinaryIO,
+    document: DocumentDB,
+    rules: Optional[SegmentRules]=None,
+    start: int=0,
+    on_progress: Optional[Callable[[int], None]]=None,
+) -> Iterator[SentenceDB]:
+    """
+    Split a UTF-8 document into sentences, a line at a time.
+
+    :stream: Document, opened for reading in binary mode.
+    :document: Document the sentences belong to.
+    :rules: Rules for the document's language.
+        Defaults to the rules for its language_code.
+    :start: Ordering of the first sentence.
+    :on_progress: Called with the number of bytes read so far.
+
+    :return: Generator of sentences, numbered from `start`.
+    :raises: UnicodeDecodeError if the document isn't UTF-8.
+    """
+    rules = rules or get_rules(document.language_code)
+    lines = io.TextIOWrapper(stream, encoding='utf-8')
+    try:
+        ordering = start
+        for text in segment_text(lines, rules):
+            yield _make_sentence(document, ordering, text)
+            ordering += 1
+            if on_progress:
+                on_progress(stream.tell())
+    finally:
+        # Leave the stream open for the caller
+        lines.detach()
+
+
+def chunk_ranges(
+    path: Union[str, Path],
+    chunk_size: int=DEFAULT_CHUNK_SIZE,
+) -> List[Tuple[int, int]]:
+    """
+    Divide a file into chunks that start and end on line breaks.
+
+    :path: File to divide.
+    :chunk_size: Approximate size of each chunk, in bytes.
+
+    :return: (start, end) byte offsets of each chunk, in order.
+    """
+    ranges = []
+    with Path(path).open('rb') as stream:
+        size = stream.seek(0, io.SEEK_END)
+        start = 0
+        while start < size:
+            stream.seek(min(start + chunk_size, size))
+            stream.readline()
+            end = stream.tell()
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+
+def _segment_chunk(
+    path: str,
+    start: int,
+    end: int,
+    rules: SegmentRules,
+) -> List[str]:
+    """
+    Split one chunk of a file into sentences, in a worker process.
+    Only the text is returned, to keep pickling cheap.
+    """
+    with open(path, 'rb') as stream:
+        stream.seek(start)
+        text = stream.read(end - start).decode('utf-8')
+    # Split lines the same way as the TextIOWrapper in segment_stream
+    lines = io.StringIO(text, newline=None)
+    return list(segment_text(lines, rules, skip_header=start == 0))
+
+
+def segment_file(
+    path: Union[str, Path],
+    document: DocumentDB,
+    rules: Optional[SegmentRules]=None,
+    workers: Optional[int]=None,
+    chunk_size: int=DEFAULT_CHUNK_SIZE,
+    on_progress: Optional[Callable[[int], None]]=None,
+) -> Iterator[SentenceDB]:
+    """
+    Split a UTF-8 document into sentences with a pool of processes.
+
+    The file is divided into chunks on line breaks,
+    and the chunks are numbered in file order,
+    so the orderings are the same as with `segment_stream`.
+    Only a few chunks are held in memory at a time.
+
+    :path: Location of the document.
+    :document: Document the sentences belong to.
+    :rules: Rules for the document's language.
+        Defaults to the rules for its language_code.
+    :workers: Number of processes. Defaults to DEFAULT_WORKERS.
+    :chunk_size: Approximate size of each chunk, in bytes.
+    :on_progress: Called with the number of bytes split so far.
+
+    :return: Generator of sentences, numbered from 0.
+    :raises: UnicodeDecodeError if the document isn't UTF-8.
+    """
+    rules = rules or get_rules(document.language_code)
+    workers = workers or DEFAULT_WORKERS
+    ranges = deque(chunk_ranges(path, chunk_size))
+
+    # Spawn, because forking a process with running threads isn't safe
+    context = multiprocessing.get_context('spawn')
+    pool = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+    pending = deque()
+    try:
+        def _submit():
+            start, end = ranges.popleft()
+            future = pool.submit(_segment_chunk, str(path), start, end, rules)
+            pending.append((end, future))
+
+        while ranges and len(pending) < workers * 2:
+            _submit()
+
+        ordering = 0
+        while pending:
+            end, future = pending.popleft()
+            texts = future.result()
+            if ranges:
+                _submit()
+
+            for text in texts:
+                yield _make_sentence(document, ordering, text)
+                ordering += 1
+            if on_progress:
+                on_progress(end)
+    finally:
+        # Stop splitting chunks nobody will use
+        pool.shutdown(cancel_futures=True)
+
+
+def _make_sentence(document: DocumentDB, ordering: int, text: str) -> SentenceDB:
+    return SentenceDB(
+        user_id=document.user_id,
+        language_code=document.language_code,
+        ordering=ordering,
+        text=text,
+    )
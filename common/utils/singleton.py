@@ -3,20 +3,92 @@ Copyright (C) J Leadbetter <j@jleadbetter.com>
 Affero GPL v3
 """
 
+import contextvars
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+
 class Singleton(type):
     """
     Create a singleton that prevents multiple instantiations.
 
     Metaclass that is useful for connections
     where we don't want more than one instance (e.g., database connections).
+
+    Instances normally live for the whole process.
+    Inside `Singleton.scope()`, they live in a separate registry instead,
+    so isolated app instances (e.g., per tenant or per test)
+    can exist side by side.
     """
 
+    # Process-wide registry
     _instances = {}
 
+    # Registry for the current context, if any
+    _scope: contextvars.ContextVar[Optional[Dict[type, Any]]] = \
+        contextvars.ContextVar('singleton_scope', default=None)
+
+    # Reentrant, because singletons often create other singletons
+    # in their __init__ (e.g., AppStore creates the ConfigStore).
+    _lock = threading.RLock()
+
+    @classmethod
+    def _registry(metacls) -> Dict[type, Any]:
+        instances = metacls._scope.get()
+        if instances is None:
+            instances = metacls._instances
+        return instances
+
     def __call__(cls, *args, **kwargs):
-        if cls not in cls._instances:
-            cls._instances[cls] = super(Singleton, cls).__call__(*args, **kwargs)
-        return cls._instances[cls]
+        instances = Singleton._registry()
+        try:
+            return instances[cls]
+        except KeyError:
+            pass
+
+        with Singleton._lock:
+            # Another thread may have created it while we waited
+            if cls not in instances:
+                instances[cls] = super(Singleton, cls).__call__(*args, **kwargs)
+            return instances[cls]
+
+    @classmethod
+    @contextmanager
+    def scope(
+        metacls,
+        instances: Optional[Dict[type, Any]]=None,
+    ) -> Iterator[Dict[type, Any]]:
+        """
+        Use a separate set of singletons for the current context.
+
+        Usage:
+
+            with Singleton.scope():
+                AppStore(config, 'dev.in_memory')
+
+            # Keep one registry per tenant and re-enter it later
+            tenant_instances = {}
+            with Singleton.scope(tenant_instances):
+                ...
+
+        The scope follows contextvars,
+        so it is inherited by asyncio tasks started inside it.
+        Plain threads (and loop.run_in_executor) start without it;
+        use contextvars.copy_context().run to carry it over.
+
+        :instances: Registry to use. Defaults to a new, empty one.
+
+        :return: The registry in use for this scope.
+        """
+        if instances is None:
+            instances = {}
+
+        token = metacls._scope.set(instances)
+        try:
+            yield instances
+        finally:
+            metacls._scope.reset(token)
 
     @classmethod
     def destroy(metacls, cls):
@@ -25,12 +97,16 @@ class Singleton(type):
 
         Usage: Singleton.destroy(SomeClass)
         """
-        if cls in metacls._instances:
-            del metacls._instances[cls]
+        with metacls._lock:
+            metacls._registry().pop(cls, None)
 
     @classmethod
     def destroy_all(cls):
         """
-        Nuke everything
+        Nuke everything in the current scope
         """
-        cls._instances = {}
+        # Clear the registry rather than replacing it,
+        # because __call__ looks it up before taking the lock,
+        # and would otherwise store a new instance in the old one.
+        with cls._lock:
+            cls._registry().clear()
@@ -0,0 +1,187 @@
+"""
+Copyright (C) J Leadbetter <j@jleadbetter.com>
+Affero GPL v3
+
+Split sentences into words.
+
+Every word in a sentence becomes a DisplayTextDB, which keeps the word
+as it was written and where it was in the sentence.
+Each display text is linked to a lower-case WordDB,
+which is unique per (user_id, language_code, text).
+
+Sentences are tokenized a batch at a time:
+
+    tokenizer = BatchTokenizer(user_id, 'nl', lookup=find_existing_words)
+    for sentences in batches:
+        batch = tokenizer.tokenize(sentences)
+        # batch.words and batch.display_text are rows for a bulk insert,
+        # in the order of WORD_COLUMNS and DISPLAY_TEXT_COLUMNS
+
+Rows are plain tuples, because building a million models
+takes longer than the tokenizing itself.
+
+NOTE: The upload pipeline doesn't call this yet,
+      because the adapters can't store display text or WordDBs.
+"""
+
+import re
+import sys
+import uuid
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from ..models.sentences import DisplayTextDB, SentenceDB, WordDB
+
+
+# A run of letters or digits, including apostrophes and hyphens
+# inside words (e.g., "zo'n", "Rotkäppchen's", "well-known")
+_WORD = re.compile(r"\w+(?:['’-]\w+)*")
+
+# Fields of the rows in a TokenBatch, in order.
+# The ids of display text are left to the database.
+WORD_COLUMNS = ('id', 'user_id', 'language_code', 'text')
+DISPLAY_TEXT_COLUMNS = (
+    'user_id',
+    'sentence_id',
+    'word_id',
+    'ordering',
+    'language_code',
+    'text',
+)
+
+
+class TokenizerError(Exception):
+    """
+    Indicates that sentences could not be tokenized.
+    """
+    pass
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into words, ignoring punctuation.
+
+    :text: Text to split.
+
+    :return: Words, in their original case.
+    """
+    return _WORD.findall(text)
+
+
+class TokenBatch:
+    """
+    Rows produced from one batch of sentences.
+    """
+
+    def __init__(self):
+        # Words that didn't exist before this batch
+        self.words: List[Tuple[Any, ...]] = []
+        self.display_text: List[Tuple[Any, ...]] = []
+
+    def word_models(self) -> List[WordDB]:
+        """
+        :return: The new words as models, e.g. for the in-memory database.
+        """
+        return [WordDB(**dict(zip(WORD_COLUMNS, row))) for row in self.words]
+
+    def display_text_models(self) -> List[DisplayTextDB]:
+        """
+        :return: The display text as models, without ids.
+        """
+        return [
+            DisplayTextDB(**dict(zip(DISPLAY_TEXT_COLUMNS, row)))
+            for row in self.display_text
+        ]
+
+
+class BatchTokenizer:
+    """
+    Turns batches of sentences into display text and words,
+    for a single user and language.
+
+    Word forms are interned, so repeated words share one string,
+    and known words are remembered between batches.
+    Words that haven't been seen yet are looked up
+    with one call to `lookup` per batch.
+
+    NOTE: The rows aren't validated,
+          because everything in them comes from validated sentences.
+    """
+
+    def __init__(
+        self,
+        user_id: uuid.UUID,
+        language_code: str,
+        lookup: Optional[Callable[[Set[str]], Dict[str, uuid.UUID]]]=None,
+    ):
+        """
+        :user_id: Owner of the sentences.
+        :language_code: Language of the sentences.
+        :lookup: Called with a set of lower-case words.
+            Returns the ids of those words that are already stored.
+            Defaults to assuming no words are stored yet.
+        """
+        self.user_id = user_id
+        self.language_code = language_code
+        self.lookup = lookup
+
+        # Lower-case word: id of its WordDB
+        self.word_ids: Dict[str, uuid.UUID] = {}
+
+    def tokenize(self, sentences: Iterable[SentenceDB]) -> TokenBatch:
+        """
+        Tokenize a batch of sentences.
+
+        :sentences: Sentences that have already been saved,
+            so they have ids.
+
+        :return: New words, and display text for every word in the sentences.
+        :raises: TokenizerError if a sentence doesn't have an id,
+            or belongs to a different user or language.
+        """
+        user_id = self.user_id
+        language_code = self.language_code
+        word_ids = self.word_ids
+        intern = sys.intern
+
+        # (sentence id, [(display text, lower-case word), ...])
+        tokenized = []
+        # Words not seen before, in the order they appear
+        unknown = {}
+        for sentence in sentences:
+            if sentence.id is None:
+                raise TokenizerError('Sentences must be saved before tokenizing')
+            if (
+                sentence.user_id != user_id or
+                sentence.language_code != language_code
+            ):
+                raise TokenizerError(
+                    f'Sentence {sentence.id} belongs to a different '
+                    'user or language',
+                )
+
+            tokens = []
+            for text in tokenize(sentence.text):
+                text = intern(text)
+                word = intern(text.lower())
+                if word not in word_ids:
+                    unknown[word] = None
+                tokens.append((text, word))
+            tokenized.append((sentence.id, tokens))
+
+        batch = TokenBatch()
+        if unknown:
+            existing = self.lookup(set(unknown)) if self.lookup else {}
+            word_ids.update(existing)
+            for word in unknown:
+                if word in existing:
+                    continue
+                word_id = uuid.uuid4()
+                word_ids[word] = word_id
+                batch.words.append((word_id, user_id, language_code, word))
+
+        batch.display_text = [
+            (user_id, sentence_id, word_ids[word], ordering, language_code, text)
+            for sentence_id, tokens in tokenized
+            for ordering, (text, word) in enumerate(tokens)
+        ]
+        return batch
@@ -0,0 +1,392 @@
+"""
+Copyright (C) J Leadbetter <j@jleadbetter.com>
+Affero GPL v3
+
+Process uploaded documents in the background.
+
+An upload goes through these stages:
+
+1. read: copy the uploaded file to the upload directory
+2. parse: parse the attributes at the top of the file
+3. segment: split the text into sentences (see segmenter.py)
+4. persist: save the document and its sentences
+
+NOTE: There is no tokenize stage yet. Splitting the sentences into
+      display text and words (see tokenizer.py) needs storage for
+      DisplayTextDB and WordDB, which the DocumentDBPort adapters
+      don't have, so sentences are saved without display text for now.
+
+Files are streamed from disk a chunk at a time,
+so even whole books are processed in constant memory.
+Sentences are saved in batches while they're found,
+so the segment and persist stages overlap.
+
+Each job reports which stage it's in and how far along it is,
+so the UI can show progress while the user keeps working.
+"""
+
+import codecs
+import contextvars
+import itertools
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from enum import StrEnum
+from pathlib import Path
+from typing import BinaryIO, Iterable, Iterator, Optional, Tuple
+
+from ..models.documents import DocumentDB
+from ..models.sentences import SentenceDB
+from ..stores.adapter import AdapterStore
+from .files import get_upload_dir
+from .segmenter import segment_file, segment_stream
+from .singleton import Singleton
+
+
+DEFAULT_UPLOAD_WORKERS = 2
+
+# Largest file that can be uploaded, in bytes
+MAX_UPLOAD_SIZE = 50_000_000
+
+# Directory in the upload dir where files wait to be processed
+SPOOL_DIR = 'incoming'
+
+# Bytes read from the upload at a time
+READ_CHUNK_SIZE = 64 * 1024
+
+# Sentences saved at a time
+PERSIST_BATCH_SIZE = 500
+
+# Files at least this large are split into sentences by several processes,
+# if there is more than one CPU
+PARALLEL_SEGMENT_SIZE = 16 * 1024 * 1024
+
+
+class UploadError(Exception):
+    """
+    Indicates that an upload could not be processed.
+    """
+    pass
+
+
+class UploadStage(StrEnum):
+    read = 'read'
+    parse = 'parse'
+    segment = 'segment'
+    persist = 'persist'
+
+
+class UploadStatus(StrEnum):
+    queued = 'queued'
+    running = 'running'
+    done = 'done'
+    failed = 'failed'
+
+
+STAGES = list(UploadStage)
+
+
+class UploadJob:
+    """
+    An uploaded document that is waiting for, or going through, the pipeline.
+
+    Progress is written by the worker thread and read by the UI,
+    so it is only ever replaced, never changed in place.
+    """
+
+    def __init__(self, document: DocumentDB, name: str, content: BinaryIO):
+        """
+        :document: Document to create. Its binary data is ignored.
+        :name: Name of the uploaded file.
+        :content: Uploaded file, opened for reading.
+        """
+        self.id = uuid.uuid4()
+        self.document = document
+        self.name = name
+        self.content = content
+
+        self.status = UploadStatus.queued
+        self.stage: Optional[UploadStage] = None
+        self.stage_progress = 0.0
+        self.error: Optional[str] = None
+        self.result: Optional[DocumentDB] = None
+        # Whether the upload created the document,
+        # rather than filling in one that had no sentences yet
+        self.created = False
+        self.sentence_count = 0
+
+        # Copy of the upload on disk, and its size in bytes
+        self.path: Optional[Path] = None
+        self.size = 0
+
+        self._done = threading.Event()
+
+    @property
+    def progress(self) -> float:
+        """
+        How much of the whole pipeline is done, from 0 to 1.
+        """
+        if self.status == UploadStatus.done:
+            return 1.0
+        if self.stage is None:
+            return 0.0
+        return (STAGES.index(self.stage) + self.stage_progress) / len(STAGES)
+
+    @property
+    def finished(self) -> bool:
+        return self._done.is_set()
+
+    def report(self, stage: UploadStage, progress: float):
+        """
+        Record how far along the job is.
+
+        :stage: Stage the job is in.
+        :progress: How much of the stage is done, from 0 to 1.
+        """
+        self.stage = stage
+        self.stage_progress = min(1.0, max(0.0, progress))
+
+    def finish(
+        self,
+        result: Optional[DocumentDB]=None,
+        error: Optional[str]=None,
+    ):
+        self.result = result
+        self.error = error
+        self.status = UploadStatus.failed if error else UploadStatus.done
+        self._done.set()
+
+    def wait(self, timeout: Optional[float]=None) -> DocumentDB:
+        """
+        Wait for the job to finish.
+
+        :timeout: Seconds to wait. Defaults to waiting forever.
+
+        :return: The document that was created.
+        :raises: UploadError if the job failed or didn't finish in time.
+        """
+        if not self._done.wait(timeout):
+            raise UploadError(f'Upload of {self.name} is still running')
+        if self.error:
+            raise UploadError(self.error)
+        return self.result
+
+
+def get_spool_dir() -> Path:
+    """
+    Get the directory where uploads wait to be processed.
+
+    :return: Path to the directory. Created if it doesn't exist.
+    """
+    spool_dir = get_upload_dir() / SPOOL_DIR
+    spool_dir.mkdir(parents=True, exist_ok=True)
+    return spool_dir
+
+
+class UploadPipeline:
+    """
+    Runs an UploadJob through each stage.
+    """
+
+    def __init__(self, document_port=None):
+        """
+        :document_port: Adapter for the DocumentDBPort.
+            Defaults to the one in the AdapterStore.
+        """
+        self._document_port = document_port
+
+    @property
+    def document_port(self):
+        if self._document_port is None:
+            self._document_port = AdapterStore().get('DocumentDBPort')
+        return self._document_port
+
+    def read(self, job: UploadJob) -> Path:
+        """
+        Copy the upload to the spool directory, a chunk at a time,
+        checking that it's UTF-8 as it goes.
+        """
+        content = job.content
+        try:
+            content.seek(0, 2)
+            size = content.tell()
+            content.seek(0)
+        except (AttributeError, OSError):
+            size = None
+
+        path = get_spool_dir() / f'{job.id}.txt'
+        job.path = path
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        read = 0
+        try:
+            with path.open('wb') as spool:
+                while chunk := content.read(READ_CHUNK_SIZE):
+                    read += len(chunk)
+                    if read > MAX_UPLOAD_SIZE:
+                        raise UploadError(
+                            f'{job.name} is larger than {MAX_UPLOAD_SIZE} bytes',
+                        )
+                    decoder.decode(chunk)
+                    spool.write(chunk)
+                    if size:
+                        job.report(UploadStage.read, read / size)
+            decoder.decode(b'', final=True)
+        except UnicodeDecodeError as exc:
+            raise UploadError(f'{job.name} is not a UTF-8 text file') from exc
+
+        job.size = read
+        job.report(UploadStage.read, 1.0)
+        return path
+
+    def parse(self, job: UploadJob):
+        """
+        Parse the attributes, without reading past them.
+        """
+        job.report(UploadStage.parse, 0.0)
+        with job.path.open('rb') as spool:
+            job.document.attrs = self.document_port.parse_stream_attrs(spool)
+        job.report(UploadStage.parse, 1.0)
+
+    def segment(self, job: UploadJob) -> Iterator[SentenceDB]:
+        """
+        Stream the sentences of the upload. Progress is reported
+        as the sentences are used, not when the generator is made.
+        """
+        job.report(UploadStage.segment, 0.0)
+
+        def _report(read: int):
+            if job.size:
+                job.report(UploadStage.segment, read / job.size)
+
+        parallel = (os.cpu_count() or 1) > 1
+        if parallel and job.size >= PARALLEL_SEGMENT_SIZE:
+            yield from segment_file(job.path, job.document, on_progress=_report)
+        else:
+            with job.path.open('rb') as spool:
+                yield from segment_stream(
+                    spool,
+                    job.document,
+                    on_progress=_report,
+                )
+        job.report(UploadStage.segment, 1.0)
+
+    def persist(
+        self,
+        job: UploadJob,
+        sentences: Iterable[SentenceDB],
+    ) -> Tuple[DocumentDB, bool]:
+        """
+        Save the document, then its sentences a batch at a time.
+        Nothing is written if the document was already uploaded.
+        If saving fails partway, a new document is deleted again,
+        and an existing one gets its old attributes back.
+
+        :return: The saved document, and whether it was created.
+        """
+        existing = self.document_port.find_by_name(
+            job.document.user_id,
+            job.document.display_name,
+            job.document.language_code,
+        )
+        if existing and self.document_port.count_sentences(
+            existing.id,
+            existing.user_id,
+        ):
+            raise UploadError(
+                f'{existing.display_name} was already uploaded',
+            )
+        # Some adapters update the stored document in place
+        previous = existing.model_copy(deep=True) if existing else None
+
+        # The attributes were already parsed,
+        # so the adapter doesn't need the file
+        job.document.binary_data = None
+        document = self.document_port.create_or_update(job.document)
+        try:
+            sentences = iter(sentences)
+            while batch := list(itertools.islice(sentences, PERSIST_BATCH_SIZE)):
+                self.document_port.add_sentences(
+                    document.id,
+                    document.user_id,
+                    batch,
+                )
+                job.sentence_count += len(batch)
+        except Exception:
+            if previous:
+                self.document_port.create_or_update(previous)
+            else:
+                # Otherwise it would show up in the sidebar with no text
+                self.document_port.delete(document.id, document.user_id)
+            raise
+
+        job.report(UploadStage.persist, 1.0)
+        return document, previous is None
+
+    def run(self, job: UploadJob) -> Optional[DocumentDB]:
+        """
+        Run every stage of the job.
+        Errors are recorded on the job, rather than raised.
+        The copy of the upload is removed when the job finishes.
+
+        :job: Job to run.
+
+        :return: The document that was created, or None if the job failed.
+        """
+        job.status = UploadStatus.running
+        try:
+            self.read(job)
+            self.parse(job)
+            document, job.created = self.persist(job, self.segment(job))
+        except Exception as exc:
+            job.finish(error=str(exc) or exc.__class__.__name__)
+            return None
+        finally:
+            if job.path:
+                job.path.unlink(missing_ok=True)
+
+        job.finish(result=document)
+        return document
+
+
+class UploadQueue(metaclass=Singleton):
+    """
+    Worker threads that run uploads in the background.
+
+    NOTE: Jobs run in the Singleton scope that submitted them,
+          so they use the same adapters as the caller.
+    """
+
+    def __init__(self, workers: Optional[int]=None):
+        """
+        :workers: Maximum number of uploads processed at the same time.
+        """
+        self.workers = int(workers or DEFAULT_UPLOAD_WORKERS)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.workers,
+            thread_name_prefix='upload',
+        )
+
+    def submit(
+        self,
+        job: UploadJob,
+        pipeline: Optional[UploadPipeline]=None,
+    ) -> UploadJob:
+        """
+        Queue a job.
+
+        :job: Job to run.
+        :pipeline: Pipeline to run it with. Defaults to the standard one.
+
+        :return: The job, so callers can follow its progress.
+        """
+        pipeline = pipeline or UploadPipeline()
+        context = contextvars.copy_context()
+        self._executor.submit(context.run, pipeline.run, job)
+        return job
+
+    def shutdown(self):
+        """
+        Wait for running uploads, then stop the workers.
+        """
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,56 @@
+"""
+Copyright (C) J Leadbetter <j@jleadbetter.com>
+Affero GPL v3
+
+ASGI entry point for serving the frontend from several worker processes.
+
+Every worker is its own process with its own stores,
+so the workers can only share data through the database.
+Use scripts/serve.py to start them.
+"""
+
+from fastapi import FastAPI
+from nicegui import app as nicegui_app, ui
+
+from common.stores.app import AppStore
+from common.stores.data.in_memory import InMemoryDBStore
+
+# Importing main registers the pages, middleware, and store startup
+from frontend.main import UNSAFE_SECRET_KEY
+from frontend.workers import get_worker_count
+
+
+class WorkerConfigurationError(Exception):
+    """
+    Indicates that the configuration can't be served by several workers.
+    Raised when the workers start.
+    """
+    pass
+
+
+def check_data_store_is_shared():
+    """
+    Make sure every worker sees the same data.
+
+    :raises: WorkerConfigurationError
+        if several workers would each get their own in-memory database.
+    """
+    data_store = AppStore().get('DataStore')
+    if get_worker_count() > 1 and isinstance(data_store, InMemoryDBStore):
+        raise WorkerConfigurationError(
+            'The in-memory database can only be served by one worker. '
+            'Use a Django configuration to run several workers.'
+        )
+
+
+# Runs after frontend.main.startup has initialized this worker's stores
+nicegui_app.on_startup(check_data_store_is_shared)
+
+app = FastAPI()
+ui.run_with(
+    app,
+    title='10,000 Words',
+    favicon='💬',
+    storage_secret=UNSAFE_SECRET_KEY,
+    show_welcome_message=False,
+)
@@ -3,22 +3,77 @@ Copyright (C) J Leadbetter <j@jleadbetter.com>
 Affero GPL v3
 """
 
-from typing import Any, Dict, List
+import uuid
+from typing import Any, Dict, List, Optional
 
 from nicegui import app
 
-from common.models.documents import DocumentDB, DocumentUI
-from common.models.files import BinaryFileData
+from common.models.documents import DocumentDB, DocumentUI, DocumentUISummary
+from common.models.sentences import SentenceUI
 from common.models.users import UserUI
-from common.utils.languages import language_name_to_code
+from common.ports.documents import DEFAULT_PAGE_SIZE
+from common.utils.languages import language_code_choices, language_name_to_code
+from common.utils.uploads import UploadJob, UploadQueue
 from frontend.controllers.base import BaseController
+from frontend.controllers.state import DocumentState
+
+
+class DocumentViews:
+    """
+    Validated DocumentUI objects for one client,
+    built once from the records in app.storage.client.
+    """
+
+    def __init__(self, state: DocumentState):
+        # Remember which records these were built from,
+        # so we notice if someone replaces or extends them.
+        self.source = state.records
+        self.source_len = len(self.source)
+
+        self.documents = state.get_all()
+        self.by_id = {doc.id: doc for doc in self.documents}
+        self.by_language: Dict[str, List[DocumentUI]] = {}
+        for doc in self.documents:
+            self.by_language.setdefault(doc.language, []).append(doc)
+
+    def is_current(self, state: DocumentState) -> bool:
+        records = state.records
+        return self.source is records and self.source_len == len(records)
 
 
 class DocumentController(BaseController):
     """
     Control document state in the application.
+
+    Documents are kept in app.storage.client in the layout of DocumentState.
+    Only the documents the client opens or uploads are kept;
+    pages of summaries are loaded for listing them.
+    The DocumentUI objects are cached per client,
+    and rebuilt only after the stored records change.
     """
 
+    VIEWS_KEY = 'document_views'
+    PAGE_SIZE = DEFAULT_PAGE_SIZE
+
+    @property
+    def state(self) -> DocumentState:
+        return DocumentState(app.storage.client)
+
+    @property
+    def views(self) -> DocumentViews:
+        state = self.state
+        views = app.storage.client.get(self.VIEWS_KEY)
+        if views is None or not views.is_current(state):
+            views = DocumentViews(state)
+            app.storage.client[self.VIEWS_KEY] = views
+        return views
+
+    def invalidate(self):
+        """
+        Drop the cached DocumentUI objects for this client.
+        """
+        app.storage.client.pop(self.VIEWS_KEY, None)
+
     @property
     def backend_adapter(self):
         if not self._backend_adapter:
@@ -31,52 +86,188 @@ class DocumentController(BaseController):
             self._frontend_adapter = self.adapters.get('DocumentUIPort')
         return self._frontend_adapter
 
-    def create(self, document_dict: Dict[str, Any]):
+    def start_upload(self, document_dict: Dict[str, Any]) -> UploadJob:
+        """
+        Hand an uploaded document to the background upload pipeline.
+
+        :document_dict: The user, display_name, language and upload.
+
+        :return: Job to follow the upload's progress with.
+            Call `finish_upload` once it's finished.
+        """
         user = document_dict['user']
+        upload = document_dict['upload']
         document = DocumentDB(
             user_id=user.id,
             display_name=document_dict['display_name'],
             language_code=language_name_to_code[document_dict['language']],
-            binary_data=BinaryFileData(
-                name=document_dict['upload'].name,
-                data=document_dict['upload'].content.read(),
-            ),
         )
-        new_doc = self.backend_adapter.create_or_update(document)
+        job = UploadJob(document, upload.name, upload.content)
+        return UploadQueue().submit(job)
 
-        doc_ui = self.frontend_adapter.get(new_doc, user)
-        app.storage.client['documents']['all_documents'].append(
-            doc_ui.model_dump(),
-        )
-        self.set_current_document(doc_ui)
+    def finish_upload(
+        self,
+        job: UploadJob,
+        user: Optional[UserUI]=None,
+    ) -> Optional[DocumentUI]:
+        """
+        Show a finished upload to the client, and select it.
+
+        :job: Job returned by `start_upload`.
+        :user: Owner of the document. Defaults to the client's user.
+
+        :return: The new document, or None if the upload failed.
+        """
+        if job.result is None:
+            return None
+
+        doc_ui = self.frontend_adapter.get(job.result, user or self.state.user)
+        state = self.state
+        state.add(doc_ui)
+        # The client may not have loaded an existing document,
+        # so only the pipeline knows whether this one is new
+        if job.created:
+            state.count_document(job.result.language_code)
+        state.set_current(doc_ui)
+        self.invalidate()
+        return doc_ui
+
+    def get(self, doc_id: uuid.UUID) -> Optional[DocumentUI]:
+        return self.views.by_id.get(doc_id)
 
     def get_all(self) -> List[DocumentUI]:
-        doc_dicts = app.storage.client['documents']['all_documents']
-        docs = [DocumentUI(**doc) for doc in doc_dicts]
-        return docs
+        """
+        Get the documents that this client has loaded so far.
+        """
+        return list(self.views.documents)
 
-    def get_current_document(self) -> DocumentUI:
-        document_dict = app.storage.client['documents']['current_document']
-        if document_dict is not None:
-            document = DocumentUI(**document_dict)
-            return document
-        return None
+    def get_by_language(self) -> Dict[str, List[DocumentUI]]:
+        return self.views.by_language
 
-    def set(self, user):
-        doc_dict = {
-            'current_document': None,
-            'all_documents': [],
+    def _language_codes(self) -> Dict[str, str]:
+        return {
+            language_code_choices.get(code, code): code
+            for code in self.state.languages
         }
 
+    def get_languages(self) -> Dict[str, int]:
+        """
+        Get the number of documents the user has in each language.
+
+        :return: Dictionary of language name to number of documents,
+            sorted by language name.
+        """
+        languages = self.state.languages
+        counts = {
+            name: languages[code]
+            for name, code in self._language_codes().items()
+        }
+        return dict(sorted(counts.items()))
+
+    def count_pages(self, language: str) -> int:
+        """
+        :language: Name of the language.
+
+        :return: Number of pages of documents in the language.
+        """
+        count = self.get_languages().get(language, 0)
+        return max(1, -(-count // self.PAGE_SIZE))
+
+    def get_page(
+        self,
+        language: str,
+        page: Optional[int]=1,
+    ) -> List[DocumentUISummary]:
+        """
+        Load one page of the user's documents in a language, for listing.
+        Only summaries are loaded, and they aren't stored for the client;
+        open a document with `load_document`.
+
+        :language: Name of the language.
+        :page: Page number, starting at 1.
+
+        :return: Summaries of the documents on the page (may be empty).
+        """
+        user = self.state.user
+        language_code = self._language_codes().get(language)
+        if user is None or language_code is None:
+            return []
+
+        return self.frontend_adapter.get_summaries(
+            self.backend_adapter.get_summary_page(
+                user.id,
+                language_code,
+                offset=(page - 1) * self.PAGE_SIZE,
+                limit=self.PAGE_SIZE,
+            ),
+        )
+
+    def load_document(self, doc_id: uuid.UUID) -> Optional[DocumentUI]:
+        """
+        Load the whole document, e.g. for opening it,
+        and store it for the client.
+
+        :doc_id: ID of the document.
+
+        :return: The document, or None if there's no user.
+        :raises: ObjectNotFoundError if the user doesn't have the document.
+        """
+        state = self.state
+        user = state.user
+        if user is None:
+            return None
+
+        docdb = self.backend_adapter.get(doc_id, user.id)
+        document = self.frontend_adapter.get(docdb, user)
+        state.add(document)
+        self.invalidate()
+        return document
+
+    def has_documents(self) -> bool:
+        return any(self.state.languages.values())
+
+    def count_sentences(self, document: DocumentUI) -> int:
+        return self.backend_adapter.count_sentences(document.id, document.user.id)
+
+    def get_sentences(
+        self,
+        document: DocumentUI,
+        start: int,
+        stop: int,
+    ) -> List[SentenceUI]:
+        """
+        Load a window of a document's sentences.
+
+        :document: Document the sentences belong to.
+        :start: First ordering to include.
+        :stop: Ordering to stop before.
+
+        :return: Sentences in the window, sorted by ordering.
+        """
+        sentences = self.backend_adapter.get_sentences(
+            document.id,
+            document.user.id,
+            start,
+            stop,
+        )
+        return self.frontend_adapter.get_sentences(sentences)
+
+    def get_current_document(self) -> Optional[DocumentUI]:
+        doc_id = self.state.current_id
+        if doc_id is None:
+            return None
+        return self.views.by_id.get(doc_id)
+
+    def set(self, user):
+        languages = {}
         if user:
-            documents = self.backend_adapter.get_all(user.id)
-            for doc in self.frontend_adapter.get_all(documents, user):
-                doc_dict['all_documents'].append(doc.model_dump())
+            languages = self.backend_adapter.count_by_language(user.id)
 
-        app.storage.client['documents'] = doc_dict
+        self.state.reset(user, languages=languages)
+        self.invalidate()
 
     def set_current_document(self, document: DocumentUI):
-        # TODO: fetch sentence data
-        # TODO: update sentences, words
-        app.storage.client['documents']['current_document'] = document.model_dump()
+        # Sentences are loaded a window at a time, with get_sentences
+        # TODO: update words
+        self.state.set_current(document)
 
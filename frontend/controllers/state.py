@@ -0,0 +1,190 @@
+"""
+Copyright (C) J Leadbetter <j@jleadbetter.com>
+Affero GPL v3
+
+Typed access to the state the controllers keep in app.storage.client.
+"""
+
+import uuid
+from typing import Any, Dict, Iterable, List, MutableMapping, Optional
+
+from common.models.documents import DocumentUI
+from common.models.users import UserUI
+
+
+# Fields that are stored once for all documents, instead of in each record
+_SHARED_FIELDS = {'id', 'user'}
+
+
+class DocumentState:
+    """
+    Documents of the current user, stored in a normalized layout:
+
+        {
+            'user': {...},  # UserUI fields, stored once
+            'order': [doc_id, ...],
+            'records': {
+                doc_id: {'displayName': ..., 'language': ..., ...},
+            },
+            'current': doc_id or None,
+            'languages': {language_code: number of documents},
+        }
+
+    Only the documents the client has looked at are stored;
+    `languages` counts all of the user's documents.
+    Document ids are stored as strings, so the layout is plain JSON.
+    """
+
+    KEY = 'documents'
+
+    def __init__(self, storage: MutableMapping[str, Any]):
+        """
+        :storage: Client storage, usually app.storage.client.
+        """
+        self.storage = storage
+
+    @staticmethod
+    def empty(user: Optional[UserUI]=None) -> Dict[str, Any]:
+        """
+        Layout of a client without any documents.
+
+        :user: Owner of the documents.
+
+        :return: Dictionary to put in the client storage.
+        """
+        return {
+            'user': user.model_dump() if user else None,
+            'order': [],
+            'records': {},
+            'current': None,
+            'languages': {},
+        }
+
+    @staticmethod
+    def to_record(document: DocumentUI) -> Dict[str, Any]:
+        """
+        Convert a document to the compact record that is stored.
+
+        :document: Document to convert.
+
+        :return: Document fields, without the id and user.
+        """
+        return document.model_dump(exclude=_SHARED_FIELDS)
+
+    @property
+    def data(self) -> MutableMapping[str, Any]:
+        if self.KEY not in self.storage:
+            self.storage[self.KEY] = self.empty()
+        return self.storage[self.KEY]
+
+    @property
+    def records(self) -> MutableMapping[str, Dict[str, Any]]:
+        return self.data['records']
+
+    @property
+    def user(self) -> Optional[UserUI]:
+        user_dict = self.data['user']
+        if user_dict is None:
+            return None
+        return UserUI(**user_dict)
+
+    @property
+    def languages(self) -> MutableMapping[str, int]:
+        return self.data['languages']
+
+    @property
+    def current_id(self) -> Optional[uuid.UUID]:
+        doc_id = self.data['current']
+        if doc_id is None:
+            return None
+        return uuid.UUID(doc_id)
+
+    def reset(
+        self,
+        user: Optional[UserUI],
+        documents: Iterable[DocumentUI]=(),
+        languages: Optional[Dict[str, int]]=None,
+    ):
+        """
+        Replace all documents at once.
+
+        :user: Owner of the documents.
+        :documents: Documents to store.
+        :languages: Number of documents the user has per language code.
+        """
+        data = self.empty(user)
+        data['languages'].update(languages or {})
+        for document in documents:
+            doc_id = str(document.id)
+            data['order'].append(doc_id)
+            data['records'][doc_id] = self.to_record(document)
+        self.storage[self.KEY] = data
+
+    def add(self, document: DocumentUI):
+        """
+        Add a document, or replace it if it's already stored.
+
+        :document: Document to store.
+        """
+        data = self.data
+        if data['user'] is None:
+            data['user'] = document.user.model_dump()
+
+        doc_id = str(document.id)
+        if doc_id not in data['records']:
+            data['order'].append(doc_id)
+        data['records'][doc_id] = self.to_record(document)
+
+    def count_document(self, language_code: str):
+        """
+        Count a new document in the number of documents per language.
+
+        :language_code: Language of the new document.
+        """
+        languages = self.languages
+        languages[language_code] = languages.get(language_code, 0) + 1
+
+    def set_current(self, document: Optional[DocumentUI]):
+        """
+        Choose the document that is being edited.
+
+        :document: Document to select. Stored first, if it's new.
+        """
+        if document is None:
+            self.data['current'] = None
+            return
+
+        if str(document.id) not in self.records:
+            self.add(document)
+        self.data['current'] = str(document.id)
+
+    def get(
+        self,
+        doc_id: uuid.UUID,
+        user: Optional[UserUI]=None,
+    ) -> Optional[DocumentUI]:
+        """
+        Get a single document.
+
+        :doc_id: ID of the document.
+        :user: Owner of the document, if already loaded.
+
+        :return: The document, or None if it isn't stored.
+        """
+        record = self.records.get(str(doc_id))
+        if record is None:
+            return None
+        return DocumentUI(id=doc_id, user=user or self.user, **record)
+
+    def get_all(self) -> List[DocumentUI]:
+        """
+        Get all documents, in the order they were added.
+
+        :return: List of documents, all sharing the same user object.
+        """
+        user = self.user
+        records = self.records
+        return [
+            DocumentUI(id=doc_id, user=user, **records[doc_id])
+            for doc_id in self.data['order']
+        ]
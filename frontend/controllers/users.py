@@ -7,7 +7,7 @@ from typing import Any, Dict, List, Optional
 
 from nicegui import app
 
-from common.models.users import UserDB, UserUI
+from common.models.users import UserDB, UserSummary, UserUI
 from frontend.controllers.base import BaseController
 
 
@@ -41,6 +41,13 @@ class UserController(BaseController):
             return self.frontend_adapter.get_all(userdbs)
         return []
 
+    def get_summaries(self) -> List[UserSummary]:
+        """
+        Get the id, username and display name of every user,
+        e.g. for choosing a user when logging in.
+        """
+        return self.backend_adapter.get_summaries()
+
     def get_first(self) -> Optional[UserUI]:
         userdb = self.backend_adapter.get_first()
         if userdb:
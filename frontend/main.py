@@ -7,8 +7,6 @@ import sys
 from pathlib import Path
 from typing import Optional
 
-from nicegui import app, ui
-
 BASE_DIR = Path(__file__).resolve().parent
 PROJECT_DIR = BASE_DIR.parent
 
@@ -17,6 +15,13 @@ if BASE_DIR.as_posix() not in sys.path:
 if PROJECT_DIR.as_posix() not in sys.path:
     sys.path.append(PROJECT_DIR.as_posix())
 
+# This has to come before the other imports,
+# so their import times can be profiled.
+from common.utils.profiler import enable_from_env, get_profiler, get_report_path
+enable_from_env()
+
+from nicegui import app, ui
+
 from common.stores.app import AppStore
 
 from frontend.middleware.auth import AuthMiddleware
@@ -47,6 +52,14 @@ def startup(config: Optional[str]=None, subsection: Optional[str]=None):
     data_store = app_store.get('DataStore')
     data_store.load_data()
 
+    profiler = get_profiler()
+    if profiler.enabled:
+        report_path = get_report_path(PROJECT_DIR / 'startup-profile.txt')
+        profiler.write_report(report_path)
+        # Stop timing imports for the rest of the app's life
+        profiler.disable()
+        print(f'Startup profile written to {report_path}')
+
     @ui.page('/')
     async def login():
         ui.page_title('Login')
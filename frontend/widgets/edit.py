@@ -3,11 +3,16 @@ Copyright (C) J Leadbetter <j@jleadbetter.com>
 Affero GPL v3
 """
 
+import bisect
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
 from nicegui import app, events, ui
 
-from common.models.documents import DocumentDB, DocumentUI
+from common.models.documents import DocumentDB, DocumentUI, DocumentUISummary
 from common.stores.adapter import AdapterStore
 from common.utils.languages import language_choices
+from common.utils.uploads import MAX_UPLOAD_SIZE, UploadJob, UploadStage
 
 from frontend.controllers.documents import DocumentController
 from frontend.widgets.base import BaseWidget
@@ -34,12 +39,146 @@ class EditComponent(BaseWidget):
         self.document_controller = DocumentController()
 
 
+class SentenceWindow:
+    """
+    Shows a document's sentences a window at a time.
+
+    The first windows are loaded when the document is opened.
+    More are loaded as the user scrolls towards either end,
+    and windows far from the visible area are dropped,
+    so the number of elements stays the same however long the document is.
+    """
+
+    WINDOW_SIZE = 50
+    # Windows kept on the page at once
+    MAX_WINDOWS = 4
+    # Windows loaded when the document is opened
+    PREFETCH_WINDOWS = 2
+    # How close to either end (as a fraction of the scroll height)
+    # the user must scroll before the next window is loaded
+    SCROLL_MARGIN = 0.2
+
+    def __init__(self, controller: DocumentController, document: DocumentUI):
+        self.controller = controller
+        self.document = document
+        self.total = controller.count_sentences(document)
+
+        # (first ordering, element) for each window on the page
+        self.windows: Deque[Tuple[int, ui.column]] = deque()
+        self.container = None
+        self._last_position = 0.0
+
+    def display(self):
+        self.container = ui.column().classes('w-full gap-1')
+        for _ in range(self.PREFETCH_WINDOWS):
+            self.load_after()
+
+    def _render(self, start: int) -> ui.column:
+        sentences = self.controller.get_sentences(
+            self.document,
+            start,
+            start + self.WINDOW_SIZE,
+        )
+        with self.container:
+            with ui.column().classes('w-full gap-1') as window:
+                for sentence in sentences:
+                    ui.label(sentence.text).classes('text-lg')
+        return window
+
+    def load_after(self) -> bool:
+        """
+        Add the window after the last one on the page.
+
+        :return: False if the end of the document is already shown.
+        """
+        start = self.windows[-1][0] + self.WINDOW_SIZE if self.windows else 0
+        if start >= self.total:
+            return False
+
+        self.windows.append((start, self._render(start)))
+        if len(self.windows) > self.MAX_WINDOWS:
+            _, window = self.windows.popleft()
+            window.delete()
+        return True
+
+    def load_before(self) -> bool:
+        """
+        Add the window before the first one on the page.
+
+        :return: False if the start of the document is already shown.
+        """
+        if not self.windows or self.windows[0][0] == 0:
+            return False
+
+        start = max(0, self.windows[0][0] - self.WINDOW_SIZE)
+        window = self._render(start)
+        window.move(target_index=0)
+        self.windows.appendleft((start, window))
+        if len(self.windows) > self.MAX_WINDOWS:
+            _, window = self.windows.pop()
+            window.delete()
+        return True
+
+    def on_scroll(self, event: events.ScrollEventArguments):
+        # Only load in the direction of the scroll,
+        # so dropping a window can't bounce us back the other way
+        moving_down = event.vertical_position >= self._last_position
+        self._last_position = event.vertical_position
+
+        if moving_down and event.vertical_percentage >= 1 - self.SCROLL_MARGIN:
+            self.load_after()
+        elif not moving_down and event.vertical_percentage <= self.SCROLL_MARGIN:
+            self.load_before()
+
+
 class EditArea(EditComponent):
     """
     Area for editing documents
     """
+
+    def __init__(self):
+        super().__init__()
+        self.content = None
+        self.header = None
+        self.prompt = None
+        self.sentences = None
+        self.sentence_window = None
+
+    def show_sentences(self, document: DocumentUI):
+        """
+        Replace the sentences with those of another document.
+        """
+        self.sentences.clear()
+        self.sentence_window = SentenceWindow(self.document_controller, document)
+        with self.sentences:
+            self.sentence_window.display()
+
+    def on_scroll(self, event: events.ScrollEventArguments):
+        if self.sentence_window:
+            self.sentence_window.on_scroll(event)
+
+    def show_header(self, document: DocumentUI):
+        """
+        Fill the header card with the document's title or attributes.
+        """
+        self.header.clear()
+        with self.header:
+            if document.attrs:
+                for attr, value in document.attrs.items():
+                    ui.label(f'{attr}: {value}') \
+                            .classes('text-2xl bold text-blue-950') \
+                            .style('line-height: .5 !important')
+            else:
+                ui.label(document.displayName)\
+                        .classes('text-3xl bold text-blue-950')
+
     def show_content(self):
-        if not self.documents:
+        self.header = None
+        self.prompt = None
+        self.sentences = None
+        self.sentence_window = None
+
+        if not self.document_controller.has_documents():
             ui.label('Welcome to 10,000 Words!').classes('text-2xl')
             with ui.row():
                 ui.label('''
@@ -48,34 +187,125 @@ class EditArea(EditComponent):
                 ui.icon('arrow_forward').classes('text-2xl')
             return
 
+        self.header = ui.card().style('width: 100%')
+        self.sentences = ui.column().classes('w-full')
         document = self.current_document
         if document:
-            if document.attrs:
-                with ui.card().style('width: 100%'):
-                    for attr, value in document.attrs.items():
-                        ui.label(f'{attr}: {value}') \
-                                .classes('text-2xl bold text-blue-950') \
-                                .style('line-height: .5 !important')
-            else:
-                with ui.card().style('width: 100%'):
-                    ui.label(document.displayName)\
-                            .classes('text-3xl bold text-blue-950')
+            self.show_header(document)
+            self.show_sentences(document)
         else:
-            with ui.row():
+            self.header.set_visibility(False)
+            with ui.row() as self.prompt:
                 ui.icon('arrow_back').classes('text-2xl')
                 ui.label('''
                     Choose an uploaded document to set up your vocabulary lessons.
                 ''').classes('text-xl')
 
+    def show_document(self, document: DocumentUI):
+        """
+        Show a newly selected document.
+        Only the header card and the sentences are rebuilt.
+        """
+        if self.header is None:
+            # The welcome text is replaced after the first upload
+            self.content.clear()
+            with self.content:
+                self.show_content()
+            return
+
+        self.show_header(document)
+        self.show_sentences(document)
+        self.header.set_visibility(True)
+        if self.prompt is not None:
+            self.prompt.delete()
+            self.prompt = None
+
     def display(self):
         with ui.card().classes('h-screen !w-2/3'):
-            with ui.scroll_area().classes('size-full'):
+            with ui.scroll_area(on_scroll=self.on_scroll) \
+                    .classes('size-full') as self.content:
                 self.show_content()
 
 
-@ui.refreshable
-def edit_area():
-    EditArea().display()
+class LanguageSection:
+    """
+    Sidebar section with one page of the documents in a language.
+    """
+
+    def __init__(self, sidebar: 'DocumentSidebar', language: str):
+        self.sidebar = sidebar
+        self.language = language
+        self.page = 1
+        self.documents: List[DocumentUISummary] = []
+
+        self.expansion = None
+        self.buttons = None
+        self.pagination = None
+
+    @property
+    def controller(self) -> DocumentController:
+        return self.sidebar.document_controller
+
+    def display(self):
+        with ui.expansion(self.language, icon='folder') \
+                .classes('w-full text-lg text-zinc-950') as self.expansion:
+            self.buttons = ui.column().classes('w-full gap-0')
+            self.show_page(1)
+            self.pagination = ui.pagination(
+                1,
+                1,
+                direction_links=True,
+                on_change=lambda event: self.show_page(event.value),
+            ).props('max-pages=5 boundary-numbers')
+            self.update_pagination()
+
+    def show_page(self, page: int):
+        """
+        Replace the buttons with the documents on another page.
+        """
+        self.page = page
+        self.documents = self.controller.get_page(self.language, page)
+        self.buttons.clear()
+        with self.buttons:
+            for doc in self.documents:
+                self.sidebar.document_button(doc)
+
+    def update_pagination(self):
+        pages = self.controller.count_pages(self.language)
+        if self.pagination.max != pages:
+            self.pagination.max = pages
+        self.pagination.set_visibility(pages > 1)
+
+    def add_document(self, document: DocumentUI):
+        """
+        Add the button for a new document, if it belongs on this page.
+        """
+        self.update_pagination()
+
+        names = [doc.displayName for doc in self.documents]
+        index = bisect.bisect(names, document.displayName)
+        page_size = self.controller.PAGE_SIZE
+        if index == len(names) and len(names) >= page_size:
+            # It's on a later page
+            return
+        if index == 0 and self.page > 1:
+            # It's on an earlier page, so every document here moves down one
+            self.show_page(self.page)
+            return
+
+        summary = DocumentUISummary(
+            document.id,
+            document.displayName,
+            document.language,
+        )
+        with self.buttons:
+            button = self.sidebar.document_button(summary)
+        button.move(target_index=index)
+        self.documents.insert(index, summary)
+
+        if len(self.documents) > page_size:
+            self.documents.pop()
+            self.buttons.default_slot.children[-1].delete()
 
 
 class DocumentSidebar(EditComponent):
@@ -96,45 +326,62 @@ class DocumentSidebar(EditComponent):
         }
     '''
 
-    @property
-    def documents_by_language(self):
-        all_docs = self.document_controller.get_all()
-        by_language = {}
-        for doc in all_docs:
-            if doc.language in by_language:
-                by_language[doc.language].append(doc)
-            else:
-                by_language[doc.language] = [doc]
-        return by_language
+    def __init__(self, on_select: Optional[Callable[[DocumentUI], None]]=None):
+        """
+        :on_select: Called with the document that the user clicked on.
+        """
+        super().__init__()
+        self.on_select = on_select
+        self.sections: Dict[str, LanguageSection] = {}
+        self.section_list = None
 
     def show_document(self, doc_id):
         def _on_click():
-            # TODO: we'll have to fetch full doc ffom server
-            doc = list(filter(lambda x: x.id == doc_id, self.documents))[0]
+            # The sidebar only has summaries, so get the whole document.
+            # EditArea loads the sentences, a window at a time
+            doc = self.document_controller.load_document(doc_id)
             self.current_document = doc
-            edit_area.refresh()
-            upload_sidebar.refresh()
+            if self.on_select:
+                self.on_select(doc)
         return _on_click
 
+    def document_button(self, doc: DocumentUISummary) -> ui.button:
+        return ui.button(
+            doc.displayName,
+            on_click=self.show_document(doc.id),
+        ).classes('!normal-case !text-left !text-blue-950') \
+                .style('text-align: left !important') \
+                .props('flat')
+
+    def add_section(self, language: str) -> LanguageSection:
+        section = LanguageSection(self, language)
+        with self.section_list:
+            section.display()
+        self.sections[language] = section
+        return section
+
+    def add_document(self, document: DocumentUI):
+        """
+        Show a newly uploaded document.
+        Only the section for the document's language is changed.
+        """
+        section = self.sections.get(document.language)
+        if section is not None:
+            section.add_document(document)
+            return
+
+        section = self.add_section(document.language)
+        languages = sorted(self.sections)
+        section.expansion.move(target_index=languages.index(document.language))
+
     def display(self):
         with ui.card().classes('h-screen uploads'):
             ui.label('Uploads').classes('text-xl font-bold')
 
             with ui.scroll_area().classes('w-full h-full'):
-                for language, doc_list in self.documents_by_language.items():
-                    with ui.expansion(language, icon='folder') \
-                            .classes('w-full text-lg text-zinc-950'):
-                        for doc in doc_list:
-                            ui.button(
-                                doc.displayName,
-                                on_click=self.show_document(doc.id),
-                            ).classes('!normal-case !text-left !text-blue-950') \
-                                    .style('text-align: left !important') \
-                                    .props('flat')
-
-@ui.refreshable
-def document_sidebar():
-    DocumentSidebar().display()
+                self.section_list = ui.column().classes('w-full gap-0')
+                for language in self.document_controller.get_languages():
+                    self.add_section(language)
 
 
 class UploadForm(EditComponent):
@@ -151,6 +398,13 @@ class UploadForm(EditComponent):
         }
     '''
 
+    def __init__(self, on_start: Optional[Callable[[UploadJob], None]]=None):
+        """
+        :on_start: Called with the job that processes the upload.
+        """
+        super().__init__()
+        self.on_start = on_start
+
     def cancel(self):
         """
         Cancel the user form
@@ -198,8 +452,10 @@ class UploadForm(EditComponent):
                 ui.icon('arrow_downward').classes('bold text-lg text-blue-950')
             self.upload = ui.upload(
                 on_upload=self._hold_onto_document,
-                on_rejected=lambda: ui.notify('File too large (max 1MB)'),
-                max_file_size=1_000_000,
+                on_rejected=lambda: ui.notify(
+                    f'File too large (max {MAX_UPLOAD_SIZE // 1_000_000}MB)',
+                ),
+                max_file_size=MAX_UPLOAD_SIZE,
             ).props('accept=.txt')
 
             ui.separator()
@@ -213,16 +469,16 @@ class UploadForm(EditComponent):
             # TODO: add validation
             return
 
-        self.document_controller.create({
+        job = self.document_controller.start_upload({
             'user': self.user,
             'display_name': self.document_title_input.value,
             'language': self.language_input.value,
             'upload': self._upload_event,
         })
-        ui.notify('Document Saved')
+        ui.notify(f'Uploading {job.document.display_name}')
 
-        document_sidebar.refresh()
-        edit_area.refresh()
+        if self.on_start:
+            self.on_start(job)
         self.cancel()
 
     def _hold_onto_document(self, event: events.UploadEventArguments):
@@ -233,33 +489,123 @@ class UploadForm(EditComponent):
         self._upload_event = event
 
 
+class UploadProgress:
+    """
+    Shows how far along an upload is,
+    and hands the document to the edit view when it's done.
+    New documents go to `on_create`; a document that existed,
+    but had no sentences yet, goes to `on_select`.
+    """
+
+    # Seconds between progress updates
+    POLL_INTERVAL = 0.25
+
+    STAGE_LABELS = {
+        None: 'Waiting',
+        UploadStage.read: 'Reading the file',
+        UploadStage.parse: 'Reading the attributes',
+        UploadStage.segment: 'Finding and saving sentences',
+        UploadStage.persist: 'Saving',
+    }
+
+    def __init__(
+        self,
+        controller: DocumentController,
+        job: UploadJob,
+        on_create: Optional[Callable[[DocumentUI], None]]=None,
+        on_select: Optional[Callable[[DocumentUI], None]]=None,
+    ):
+        self.controller = controller
+        self.job = job
+        self.on_create = on_create
+        self.on_select = on_select
+
+    def display(self):
+        with ui.card().classes('w-full') as self.card:
+            ui.label(self.job.document.display_name).classes('bold')
+            self.stage_label = ui.label(self.STAGE_LABELS[None])
+            self.progress_bar = ui.linear_progress(value=0, show_value=False)
+            self.timer = ui.timer(self.POLL_INTERVAL, self.update)
+
+    def update(self):
+        job = self.job
+        self.progress_bar.set_value(job.progress)
+        self.stage_label.set_text(self.STAGE_LABELS.get(job.stage, ''))
+        if not job.finished:
+            return
+
+        self.timer.cancel()
+        self.card.delete()
+        if job.error:
+            ui.notify(f'Upload failed: {job.error}', type='negative')
+            return
+
+        document = self.controller.finish_upload(job)
+        ui.notify('Document Saved')
+        if job.created:
+            if self.on_create:
+                self.on_create(document)
+        elif self.on_select:
+            self.on_select(document)
+
+
 class UploadSidebar(EditComponent):
     """
     Area for uploads
     """
+
+    def __init__(
+        self,
+        on_create: Optional[Callable[[DocumentUI], None]]=None,
+        on_select: Optional[Callable[[DocumentUI], None]]=None,
+    ):
+        """
+        :on_create: Called with each new document
+            once its upload is processed.
+        :on_select: Called instead of `on_create`
+            when the upload filled in a document that already existed.
+        """
+        super().__init__()
+        self.on_create = on_create
+        self.on_select = on_select
+        self.uploads = None
+
+    def track_upload(self, job: UploadJob):
+        """
+        Show the progress of an upload, while the user keeps working.
+        """
+        with self.uploads:
+            UploadProgress(
+                self.document_controller,
+                job,
+                self.on_create,
+                self.on_select,
+            ).display()
+
     def display(self):
-        upload_form = UploadForm()
+        upload_form = UploadForm(on_start=self.track_upload)
 
         with ui.card().classes('h-screen bg-secondary').style('flex-grow:100'):
             ui.button('Upload', on_click=upload_form.show_modal).classes('w-full')
+            self.uploads = ui.column().classes('w-full')
 
             current_document = self.current_document
             if current_document:
-                # TODO: set up translations
+                # TODO: set up translations.
+                #       Update them in EditWidget.select_document,
+                #       rather than rebuilding the sidebar.
                 #ui.button('Upload Translation').classes('w-full')
                 pass
 
         upload_form.display()
 
 
-@ui.refreshable
-def upload_sidebar():
-    UploadSidebar().display()
-
-
 class EditWidget(BaseWidget):
     """
     Allows the user to upload and manage vocabulary documents.
+
+    Its parts are updated in place when documents are selected or uploaded,
+    so the cost doesn't grow with the number of documents.
     """
 
     CSS = '''
@@ -268,8 +614,22 @@ class EditWidget(BaseWidget):
         }
     '''
 
+    def select_document(self, document: DocumentUI):
+        self.edit_area.show_document(document)
+
+    def add_document(self, document: DocumentUI):
+        self.document_sidebar.add_document(document)
+        self.edit_area.show_document(document)
+
     def display(self):
+        self.document_sidebar = DocumentSidebar(on_select=self.select_document)
+        self.edit_area = EditArea()
+        self.upload_sidebar = UploadSidebar(
+            on_create=self.add_document,
+            on_select=self.select_document,
+        )
+
         with ui.row().classes('size-full flex'):
-            document_sidebar()
-            edit_area()
-            upload_sidebar()
+            self.document_sidebar.display()
+            self.edit_area.display()
+            self.upload_sidebar.display()
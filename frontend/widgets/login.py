@@ -5,7 +5,7 @@ Affero GPL v3
 
 from typing import Any, Optional
 
-from nicegui import app, ui
+from nicegui import app, run, ui
 
 from common.ports.auth import AuthInvalidError
 from common.stores.adapter import AdapterStore
@@ -55,7 +55,7 @@ class LoginWidget(BaseWidget):
             ui.separator()
 
             if self.settings.show_user_select:
-                users = self.user_controller.get_all()
+                users = self.user_controller.get_summaries()
                 if not users:
                     RegistrationLinkWidget().display()
                     return
@@ -96,13 +96,16 @@ class LoginWidget(BaseWidget):
 
             ui.button('Log In', on_click=self._login).classes('self-center')
 
-    def _login(self):
+    async def _login(self):
         auth_adapter = AdapterStore().get('AuthPort')
 
         self.error.classes(add='hidden')
         self.error.text = ''
         try:
-            user = auth_adapter.login(
+            # Checking a password is slow on purpose.
+            # Keep it off the event loop so other clients stay responsive.
+            user = await run.io_bound(
+                auth_adapter.login,
                 self.username.value,
                 self.password.value if self.password else None,
             )
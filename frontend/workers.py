@@ -0,0 +1,22 @@
+"""
+Copyright (C) J Leadbetter <j@jleadbetter.com>
+Affero GPL v3
+
+How scripts/serve.py tells each worker how many workers there are.
+
+Kept apart from frontend/asgi.py,
+so the script can use it without building the app.
+"""
+
+import os
+
+
+# Set by scripts/serve.py, read by every worker
+WORKERS_ENV_VAR = 'FRONTEND_WORKERS'
+
+
+def get_worker_count() -> int:
+    """
+    :return: Number of workers serving the app, as set by scripts/serve.py.
+    """
+    return int(os.environ.get(WORKERS_ENV_VAR) or 1)
@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+
+"""
+Copyright (C) J Leadbetter <j@jleadbetter.com>
+Affero GPL v3
+
+Compare the size and serialization time of the documents
+kept in app.storage.client, in the old layout
+(a full DocumentUI dump per document) and the normalized one.
+"""
+
+import argparse
+import json
+import sys
+import timeit
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+if PROJECT_DIR.as_posix() not in sys.path:
+    sys.path.append(PROJECT_DIR.as_posix())
+
+from frontend.controllers.state import DocumentState
+from tests.utils.documents import make_document_ui
+from tests.utils.users import make_user_ui
+
+
+def old_layout(docs):
+    return {
+        'current_document': None,
+        'all_documents': [doc.model_dump() for doc in docs],
+    }
+
+
+def new_layout(user, docs):
+    storage = {}
+    DocumentState(storage).reset(user, docs)
+    return storage[DocumentState.KEY]
+
+
+def measure(name, build, repeat):
+    layout = build()
+    payload = json.dumps(layout, default=str)
+    build_time = timeit.timeit(build, number=repeat) / repeat
+    dump_time = timeit.timeit(
+        lambda: json.dumps(layout, default=str),
+        number=repeat,
+    ) / repeat
+    print(
+        f'{name:<12} {len(payload):>10} bytes'
+        f'  build {build_time * 1000:>8.3f} ms'
+        f'  json {dump_time * 1000:>8.3f} ms'
+    )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        prog='BenchClientStorage',
+        description='Measure the documents payload in client storage.',
+    )
+    parser.add_argument(
+        '-n',
+        '--documents',
+        type=int,
+        nargs='+',
+        default=[10, 100, 1000],
+        help='Numbers of documents to try.',
+    )
+    parser.add_argument('-r', '--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    user = make_user_ui(authenticated=True)
+    for count in args.documents:
+        docs = [make_document_ui(user=user) for _ in range(count)]
+        print(f'{count} documents')
+        measure('old', lambda: old_layout(docs), args.repeat)
+        measure('normalized', lambda: new_layout(user, docs), args.repeat)
@@ -0,0 +1,136 @@
+#!/usr/bin/env python
+
+"""
+Copyright (C) J Leadbetter <j@jleadbetter.com>
+Affero GPL v3
+
+Measure login latency and event-loop lag under concurrent logins.
+
+The logins are awaited the same way LoginWidget does it,
+so the numbers reflect what other clients of the NiceGUI server feel
+while a burst of users is logging in.
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+if PROJECT_DIR.as_posix() not in sys.path:
+    sys.path.append(PROJECT_DIR.as_posix())
+
+from common.models.users import UserDB
+from common.stores.app import AppStore
+
+
+DEFAULT_CONFIG = (PROJECT_DIR / 'setup.cfg').as_posix()
+DEFAULT_SUBSECTION = 'dev.django'
+
+BENCH_USERNAME = 'bench-login-user'
+BENCH_PASSWORD = 'bench-Login-Pass-390'
+
+LAG_INTERVAL = 0.01
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+async def monitor_lag(lags: List[float], done: asyncio.Event):
+    """
+    Record how late the event loop wakes up a sleeping task.
+    """
+    while not done.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(LAG_INTERVAL)
+        lags.append(time.perf_counter() - start - LAG_INTERVAL)
+
+
+async def run_benchmark(auth_adapter, concurrency: int, blocking: bool):
+    """
+    Start every login at the same moment and time each one from there,
+    so the latencies include the time spent waiting behind other logins,
+    whether that is on the event loop or in the hash pool's queue.
+    """
+    loop = asyncio.get_running_loop()
+    latencies: List[float] = []
+    go = asyncio.Event()
+    start = 0.0
+
+    async def _login():
+        await go.wait()
+        if blocking:
+            # The old behavior: the hash runs on the event loop
+            auth_adapter.login(BENCH_USERNAME, BENCH_PASSWORD)
+        else:
+            await loop.run_in_executor(
+                None,
+                auth_adapter.login,
+                BENCH_USERNAME,
+                BENCH_PASSWORD,
+            )
+        latencies.append(time.perf_counter() - start)
+
+    lags: List[float] = []
+    done = asyncio.Event()
+    monitor = asyncio.create_task(monitor_lag(lags, done))
+    logins = [asyncio.create_task(_login()) for _ in range(concurrency)]
+    # Let the monitor take a baseline reading,
+    # and every login reach the barrier
+    await asyncio.sleep(LAG_INTERVAL * 2)
+
+    start = time.perf_counter()
+    go.set()
+    await asyncio.gather(*logins)
+    total = time.perf_counter() - start
+
+    done.set()
+    await monitor
+    return latencies, lags, total
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        prog='BenchLogin',
+        description='Measure login p99 and event-loop lag under load.',
+    )
+    parser.add_argument('-c', '--config', default=DEFAULT_CONFIG)
+    parser.add_argument('-s', '--subsection', default=DEFAULT_SUBSECTION)
+    parser.add_argument(
+        '-n',
+        '--concurrency',
+        type=int,
+        default=50,
+        help='Number of logins started at the same time.',
+    )
+    parser.add_argument(
+        '--blocking',
+        action='store_true',
+        help='Call login directly on the event loop, for comparison.',
+    )
+    args = parser.parse_args()
+
+    app_store = AppStore(args.config, args.subsection)
+    adapters = app_store.get('AdapterStore')
+    adapters.get('UserDBPort').create(
+        UserDB(username=BENCH_USERNAME, password=BENCH_PASSWORD),
+        ignore_errors=True,
+    )
+    auth_adapter = adapters.get('AuthPort')
+
+    latencies, lags, total = asyncio.run(
+        run_benchmark(auth_adapter, args.concurrency, args.blocking),
+    )
+
+    mode = 'blocking' if args.blocking else 'worker pool'
+    print(f'{args.concurrency} concurrent logins ({mode}) in {total:.2f}s')
+    print(f'  login p50: {statistics.median(latencies) * 1000:.1f} ms')
+    print(f'  login p99: {percentile(latencies, 99) * 1000:.1f} ms')
+    print(f'  loop lag p99: {percentile(lags, 99) * 1000:.1f} ms')
+    print(f'  loop lag max: {max(lags) * 1000:.1f} ms')
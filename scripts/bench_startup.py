@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+
+"""
+Copyright (C) J Leadbetter <j@jleadbetter.com>
+Affero GPL v3
+
+Measure how long a fresh process takes to start the application stores.
+
+Every run happens in a new interpreter,
+so module imports are counted the same way a real startup pays for them.
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+
+DEFAULT_CONFIG = (PROJECT_DIR / 'setup.cfg').as_posix()
+DEFAULT_SUBSECTION = 'dev.django'
+
+# Runs in the child process.
+# Prints: <seconds to start the stores> <modules loaded>
+STARTUP_CODE = '''
+import os
+import sys
+import time
+
+sys.path.insert(0, {project_dir!r})
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.core.settings')
+
+start = time.perf_counter()
+from common.stores.app import AppStore
+app_store = AppStore({config!r}, {subsection!r})
+if {frontend!r}:
+    import frontend.main
+print(time.perf_counter() - start, len(sys.modules))
+'''
+
+
+def measure(config: str, subsection: str, frontend: bool):
+    code = STARTUP_CODE.format(
+        project_dir=PROJECT_DIR.as_posix(),
+        config=config,
+        subsection=subsection,
+        frontend=frontend,
+    )
+    result = subprocess.run(
+        [sys.executable, '-c', code],
+        capture_output=True,
+        check=True,
+        cwd=PROJECT_DIR,
+        text=True,
+    )
+    seconds, modules = result.stdout.strip().splitlines()[-1].split()
+    return float(seconds), int(modules)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        prog='BenchStartup',
+        description='Measure the startup time of the application stores.',
+    )
+    parser.add_argument('-c', '--config', default=DEFAULT_CONFIG)
+    parser.add_argument('-s', '--subsection', default=DEFAULT_SUBSECTION)
+    parser.add_argument(
+        '-n',
+        '--runs',
+        type=int,
+        default=5,
+        help='Number of processes to start.',
+    )
+    parser.add_argument(
+        '--frontend',
+        action='store_true',
+        help='Also import the NiceGUI frontend.',
+    )
+    args = parser.parse_args()
+
+    timings = []
+    modules = 0
+    for _ in range(args.runs):
+        seconds, modules = measure(args.config, args.subsection, args.frontend)
+        timings.append(seconds)
+
+    target = 'frontend' if args.frontend else 'stores'
+    print(f'{args.subsection} {target} startup over {args.runs} runs')
+    print(f'  median: {statistics.median(timings) * 1000:.0f} ms')
+    print(f'  min: {min(timings) * 1000:.0f} ms')
+    print(f'  modules loaded: {modules}')
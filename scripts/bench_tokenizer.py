@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+
+"""
+Copyright (C) J Leadbetter <j@jleadbetter.com>
+Affero GPL v3
+
+Compare tokenizing sentences one word at a time,
+with validated models and a lookup per word,
+against the BatchTokenizer.
+"""
+
+import argparse
+import itertools
+import sys
+import time
+import uuid
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+if PROJECT_DIR.as_posix() not in sys.path:
+    sys.path.append(PROJECT_DIR.as_posix())
+
+from common.models.sentences import DisplayTextDB, SentenceDB, WordDB
+from common.utils.segmenter import get_rules, segment_text
+from common.utils.tokenizer import BatchTokenizer, tokenize
+
+DATA_DIR = PROJECT_DIR / 'scripts' / 'data'
+
+
+def make_sentences(language_code, tokens):
+    """
+    Repeat the example stories until there are enough tokens.
+    """
+    user_id = uuid.uuid4()
+    texts = []
+    for path in sorted((DATA_DIR / language_code).glob('*.txt')):
+        lines = path.read_text().splitlines()
+        texts.extend(segment_text(lines, get_rules(language_code)))
+
+    sentences = []
+    count = 0
+    for text in itertools.cycle(texts):
+        if count >= tokens:
+            break
+        sentences.append(SentenceDB(
+            id=uuid.uuid4(),
+            user_id=user_id,
+            language_code=language_code,
+            text=text,
+        ))
+        count += len(tokenize(text))
+    return sentences, count
+
+
+def one_at_a_time(sentences):
+    lookups = 0
+    stored = {}
+
+    def _lookup(word):
+        nonlocal lookups
+        lookups += 1
+        return stored.get(word)
+
+    words = []
+    display_text = []
+    for sentence in sentences:
+        for ordering, text in enumerate(tokenize(sentence.text)):
+            word = _lookup(text.lower())
+            if word is None:
+                word = WordDB(
+                    id=uuid.uuid4(),
+                    user_id=sentence.user_id,
+                    language_code=sentence.language_code,
+                    text=text.lower(),
+                )
+                stored[word.text] = word
+                words.append(word)
+            display_text.append(DisplayTextDB(
+                id=uuid.uuid4(),
+                user_id=sentence.user_id,
+                sentence_id=sentence.id,
+                word_id=word.id,
+                ordering=ordering,
+                language_code=sentence.language_code,
+                text=text,
+            ))
+    return len(words), len(display_text), lookups
+
+
+def batched(sentences, batch_size):
+    lookups = 0
+
+    def _lookup(words):
+        nonlocal lookups
+        lookups += 1
+        return {}
+
+    first = sentences[0]
+    tokenizer = BatchTokenizer(first.user_id, first.language_code, _lookup)
+    words = 0
+    display_text = 0
+    for start in range(0, len(sentences), batch_size):
+        batch = tokenizer.tokenize(sentences[start:start + batch_size])
+        words += len(batch.words)
+        display_text += len(batch.display_text)
+    return words, display_text, lookups
+
+
+def measure(name, func):
+    start = time.perf_counter()
+    words, display_text, lookups = func()
+    elapsed = time.perf_counter() - start
+    print(
+        f'{name:<14} {elapsed:>8.2f} s'
+        f'  {words:>7} words  {display_text:>8} display text'
+        f'  {lookups:>8} lookups'
+    )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        prog='BenchTokenizer',
+        description='Measure tokenizing sentences into words.',
+    )
+    parser.add_argument('-t', '--tokens', type=int, default=1_000_000)
+    parser.add_argument('-l', '--language', default='nl')
+    parser.add_argument('-b', '--batch-size', type=int, default=500)
+    args = parser.parse_args()
+
+    sentences, count = make_sentences(args.language, args.tokens)
+    print(f'{len(sentences)} sentences, {count} tokens')
+    measure('one at a time', lambda: one_at_a_time(sentences))
+    measure('batched', lambda: batched(sentences, args.batch_size))
@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+
+"""
+Copyright (C) J Leadbetter <j@jleadbetter.com>
+Affero GPL v3
+
+Measure how page throughput scales with the number of frontend workers.
+
+For each worker count, this starts the workers with scripts/serve.py,
+then has simulated users load the login page as fast as they can.
+Each user sticks to one worker, the way a proxy with session affinity
+would route them.
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+import httpx
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+if PROJECT_DIR.as_posix() not in sys.path:
+    sys.path.append(PROJECT_DIR.as_posix())
+
+from scripts.serve import (
+    DEFAULT_HOST,
+    DEFAULT_PORT,
+    prepare_database,
+    start_workers,
+    stop_workers,
+    wait_for_workers,
+)
+
+
+async def simulate_user(
+    client: httpx.AsyncClient,
+    url: str,
+    deadline: float,
+    latencies: List[float],
+):
+    errors = 0
+    while time.monotonic() < deadline:
+        start = time.perf_counter()
+        try:
+            response = await client.get(url)
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - start)
+        except httpx.HTTPError:
+            errors += 1
+    return errors
+
+
+async def run_load(
+    workers: int,
+    users: int,
+    duration: float,
+    host: str,
+    port: int,
+) -> Tuple[int, int, List[float]]:
+    latencies: List[float] = []
+    deadline = time.monotonic() + duration
+    limits = httpx.Limits(max_connections=users)
+    async with httpx.AsyncClient(
+        follow_redirects=True,
+        limits=limits,
+        timeout=30,
+    ) as client:
+        errors = await asyncio.gather(*[
+            simulate_user(
+                client,
+                f'http://{host}:{port + (idx % workers)}/',
+                deadline,
+                latencies,
+            )
+            for idx in range(users)
+        ])
+    return len(latencies), sum(errors), latencies
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        prog='LoadTest',
+        description='Measure throughput with 1 to N frontend workers.',
+    )
+    parser.add_argument(
+        '-w',
+        '--workers',
+        default='1,2,4',
+        help='Comma-separated worker counts to test.',
+    )
+    parser.add_argument(
+        '-u',
+        '--users',
+        type=int,
+        default=32,
+        help='Number of simulated users.',
+    )
+    parser.add_argument(
+        '-d',
+        '--duration',
+        type=float,
+        default=15,
+        help='Seconds to run each test.',
+    )
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('-p', '--port', type=int, default=DEFAULT_PORT)
+    args = parser.parse_args()
+
+    worker_counts = [int(count) for count in args.workers.split(',')]
+    prepare_database(max(worker_counts))
+
+    results = []
+    for count in worker_counts:
+        workers = start_workers(count, args.host, args.port)
+        try:
+            wait_for_workers(count, args.host, args.port)
+            requests, errors, latencies = asyncio.run(
+                run_load(count, args.users, args.duration, args.host, args.port),
+            )
+        finally:
+            stop_workers(workers)
+        results.append((count, requests, errors, latencies))
+
+    base_throughput = None
+    print(f'{args.users} users, {args.duration:.0f}s per run')
+    print(f'{"workers":>8} {"req/s":>8} {"scaling":>8} {"p50 ms":>8} {"errors":>7}')
+    for count, requests, errors, latencies in results:
+        throughput = requests / args.duration
+        if base_throughput is None:
+            base_throughput = throughput or 1
+        p50 = statistics.median(latencies) * 1000 if latencies else 0
+        print(
+            f'{count:>8} {throughput:>8.1f} '
+            f'{throughput / base_throughput:>7.2f}x {p50:>8.1f} {errors:>7}'
+        )
@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+
+"""
+Copyright (C) J Leadbetter <j@jleadbetter.com>
+Affero GPL v3
+
+Serve the frontend from several worker processes.
+
+Each worker listens on its own port, starting at --port.
+Put a reverse proxy with session affinity in front of them
+(see "Running several workers" in the README).
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+from typing import List
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+if PROJECT_DIR.as_posix() not in sys.path:
+    sys.path.append(PROJECT_DIR.as_posix())
+
+from common.stores.app import AppStore
+from common.stores.data.in_memory import InMemoryDBStore
+from frontend.workers import WORKERS_ENV_VAR
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8080
+STARTUP_TIMEOUT = 60
+
+
+def prepare_database(workers: int):
+    """
+    Set up the database once, before any worker starts,
+    so the workers don't race each other to migrate.
+    Starting the DataStore applies any pending migrations.
+
+    :workers: Number of workers that will share the database.
+    """
+    data_store = AppStore().get('DataStore')
+    if isinstance(data_store, InMemoryDBStore) and workers > 1:
+        sys.exit(
+            'The in-memory database can only be served by one worker. '
+            'Set DefaultConfig in setup.cfg to a Django configuration.'
+        )
+
+
+def start_workers(count: int, host: str, port: int) -> List[subprocess.Popen]:
+    """
+    Start the worker processes.
+
+    :count: Number of workers.
+    :host: Interface the workers listen on.
+    :port: Port of the first worker. The others use the following ports.
+
+    :return: The worker processes.
+    """
+    env = dict(os.environ)
+    env[WORKERS_ENV_VAR] = str(count)
+
+    workers = []
+    for idx in range(count):
+        workers.append(subprocess.Popen(
+            [
+                sys.executable,
+                '-m',
+                'uvicorn',
+                'frontend.asgi:app',
+                '--host',
+                host,
+                '--port',
+                str(port + idx),
+                '--no-access-log',
+            ],
+            cwd=PROJECT_DIR,
+            env=env,
+        ))
+    return workers
+
+
+def wait_for_workers(count: int, host: str, port: int):
+    """
+    Wait until every worker answers HTTP requests.
+
+    :raises: TimeoutError if a worker doesn't come up in time.
+    """
+    deadline = time.monotonic() + STARTUP_TIMEOUT
+    for idx in range(count):
+        url = f'http://{host}:{port + idx}/'
+        while True:
+            try:
+                urllib.request.urlopen(url, timeout=5)
+                break
+            except (urllib.error.URLError, ConnectionError):
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f'Worker at {url} did not start')
+                time.sleep(0.25)
+
+
+def stop_workers(workers: List[subprocess.Popen]):
+    for worker in workers:
+        worker.terminate()
+    for worker in workers:
+        worker.wait()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        prog='Serve',
+        description='Serve the frontend from several worker processes.',
+    )
+    parser.add_argument('-w', '--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('-p', '--port', type=int, default=DEFAULT_PORT)
+    args = parser.parse_args()
+
+    # NOTE: The workers use DefaultConfig from setup.cfg,
+    # which has to be a Django configuration when workers > 1.
+    prepare_database(args.workers)
+    workers = start_workers(args.workers, args.host, args.port)
+    last_port = args.port + args.workers - 1
+    print(f'Started {args.workers} workers on ports {args.port}-{last_port}')
+
+    try:
+        for worker in workers:
+            worker.wait()
+    except KeyboardInterrupt:
+        stop_workers(workers)
@@ -0,0 +1,45 @@
+#!/usr/bin/env python
+
+"""
+Copyright (C) J Leadbetter <j@jleadbetter.com>
+Affero GPL v3
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+if not PROJECT_DIR.as_posix() in sys.path:
+    sys.path.append(PROJECT_DIR.as_posix())
+
+from common.stores.app import AppStore
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.core.settings')
+
+DEFAULT_CONFIG = (PROJECT_DIR / 'setup.cfg').as_posix()
+DEFAULT_SUBSECTION = 'dev.django'
+
+
+if __name__ == '__main__':
+    # NOTE: The servers only migrate at startup when they find
+    # migration files that haven't been applied.
+    # Use this script to run the migrations explicitly,
+    # e.g. before starting several servers at once.
+    parser = argparse.ArgumentParser(
+        prog='UpgradeDB',
+        description=(
+            'Apply all database migrations.\n'
+            'Only works for the Django ORM.'
+        ),
+    )
+    parser.add_argument('-c', '--config', default=DEFAULT_CONFIG)
+    parser.add_argument('-s', '--subsection', default=DEFAULT_SUBSECTION)
+    args = parser.parse_args()
+
+    print('Upgrading database...')
+    apps = AppStore(args.config, args.subsection)
+    store = apps.get('DataStore')
+    store.upgrade()
+    print('Done!')
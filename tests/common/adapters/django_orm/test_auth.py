@@ -4,11 +4,13 @@ Affero GPL v3
 """
 
 import uuid
+from unittest import mock
 
 from django.contrib.auth.models import User
 from django.test import TestCase
 
 from common.adapters.django_orm.auth import AuthDjangoORMAdapter
+from common.adapters.django_orm.passwords import PasswordHashTimeoutError
 from common.models.settings import AppSettingsDB
 from common.models.users import UserUI, UserDB
 from common.ports.auth import AuthInvalidError
@@ -48,6 +50,42 @@ class TestAuthDjangoORMAdapter(TestCase):
         returned = self.auth_adapter.login(user.username, user.password)
         self.assertEqual(expected, returned)
 
+    def test_login_wrong_password(self):
+        user = UserDB(
+            username='test_login_wrong_password',
+            password='fakepass390',
+        )
+        self.user_db_adapter.create(user)
+
+        with self.assertRaises(AuthInvalidError):
+            self.auth_adapter.login(user.username, 'notthepassword')
+
+    def test_login_inactive_user(self):
+        user = UserDB(
+            username='test_login_inactive_user',
+            password='fakepass390',
+        )
+        self.user_db_adapter.create(user)
+        User.objects.filter(username=user.username).update(is_active=False)
+
+        with self.assertRaises(AuthInvalidError):
+            self.auth_adapter.login(user.username, user.password)
+
+    def test_login_password_check_times_out(self):
+        user = UserDB(
+            username='test_login_times_out',
+            password='fakepass390',
+        )
+        self.user_db_adapter.create(user)
+
+        with mock.patch.object(
+            self.auth_adapter.password_pool,
+            'check_password',
+            side_effect=PasswordHashTimeoutError,
+        ):
+            with self.assertRaises(AuthInvalidError):
+                self.auth_adapter.login(user.username, user.password)
+
     def test_login_passwordless(self):
         self.app_settings.create_or_update(
             AppSettingsDB(passwordless_login=True),
@@ -0,0 +1,140 @@
+"""
+Copyright (C) J Leadbetter <j@jleadbetter.com>
+Affero GPL v3
+"""
+
+import threading
+import time
+from unittest import TestCase, mock
+
+from django.contrib.auth.hashers import make_password
+
+from common.adapters.django_orm.passwords import (
+    PasswordHashPool,
+    PasswordHashTimeoutError,
+)
+from common.stores.app import AppStore
+from common.utils.singleton import Singleton
+
+
+class TestPasswordHashPool(TestCase):
+    """
+    Tests for common.adapters.django_orm.passwords.PasswordHashPool
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        AppStore.destroy_all()
+        super().setUpClass()
+
+    def tearDown(self):
+        Singleton.destroy(PasswordHashPool)
+
+    def test_is_singleton(self):
+        pool = PasswordHashPool(workers=2, timeout=1)
+        pool2 = PasswordHashPool(workers=8, timeout=30)
+        self.assertEqual(pool, pool2)
+        self.assertEqual(2, pool2.workers)
+        self.assertEqual(1.0, pool2.timeout)
+
+    def test_init_converts_config_strings(self):
+        pool = PasswordHashPool(workers='3', timeout='2.5', queue='10')
+        self.assertEqual(3, pool.workers)
+        self.assertEqual(2.5, pool.timeout)
+        self.assertEqual(10, pool.queue)
+        # Long enough for the 10 queued hashes (4 rounds) plus our own
+        self.assertEqual(12.5, pool.queue_timeout)
+
+    def test_make_password(self):
+        pool = PasswordHashPool()
+        encoded = pool.make_password('fakepass390')
+        self.assertNotEqual('fakepass390', encoded)
+
+        is_correct, _ = pool.check_password('fakepass390', encoded)
+        self.assertTrue(is_correct)
+
+    def test_check_password_wrong_password(self):
+        pool = PasswordHashPool()
+        encoded = make_password('fakepass390')
+
+        is_correct, needs_upgrade = pool.check_password('not-it', encoded)
+        self.assertFalse(is_correct)
+        self.assertFalse(needs_upgrade)
+
+    def test_check_password_runs_in_pool(self):
+        pool = PasswordHashPool()
+        thread_names = []
+
+        def _check(*args, **kwargs):
+            thread_names.append(threading.current_thread().name)
+            return True
+
+        with mock.patch(
+            'common.adapters.django_orm.passwords.check_password',
+            _check,
+        ):
+            pool.check_password('fakepass390', 'encoded')
+
+        self.assertTrue(thread_names[0].startswith('password-hash'))
+
+    def test_check_password_timeout(self):
+        pool = PasswordHashPool(workers=1, timeout=0.1)
+
+        def _slow_check(*args, **kwargs):
+            time.sleep(0.5)
+            return True
+
+        with mock.patch(
+            'common.adapters.django_orm.passwords.check_password',
+            _slow_check,
+        ):
+            with self.assertRaises(PasswordHashTimeoutError):
+                pool.check_password('fakepass390', 'encoded')
+
+    def test_burst_is_not_rejected(self):
+        pool = PasswordHashPool(workers=2, timeout=0.5, queue=20)
+        results = []
+
+        def _slow_check(*args, **kwargs):
+            time.sleep(0.1)
+            return True
+
+        def _login():
+            results.append(pool.check_password('fakepass390', 'encoded'))
+
+        with mock.patch(
+            'common.adapters.django_orm.passwords.check_password',
+            _slow_check,
+        ):
+            threads = [threading.Thread(target=_login) for _ in range(20)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual([(True, False)] * 20, results)
+
+    def test_timeout_keeps_slot_until_hash_finishes(self):
+        pool = PasswordHashPool(workers=1, timeout=0.1, queue=0)
+        release = threading.Event()
+        finished = threading.Event()
+
+        def _stuck_check(*args, **kwargs):
+            release.wait()
+            finished.set()
+            return True
+
+        with mock.patch(
+            'common.adapters.django_orm.passwords.check_password',
+            _stuck_check,
+        ):
+            with self.assertRaises(PasswordHashTimeoutError):
+                pool.check_password('fakepass390', 'encoded')
+
+            # The hash is still running, so its slot is still taken
+            self.assertFalse(pool._slots.acquire(blocking=False))
+
+            release.set()
+            finished.wait(1)
+            self.assertTrue(pool._slots.acquire(timeout=1))
+            pool._slots.release()
@@ -113,3 +113,20 @@ class TestAppSettingsDjangoORMAdapter(TestCase):
         returned = self.adapter.create_or_update(app_db2)
         self.assertEqual(expected, returned)
         self.assertEqual(1, AppSettings.objects.count())
+
+    def test_get_is_cached(self):
+        self.adapter.create_or_update(AppSettingsDB(multiuser_mode=True))
+        with self.assertNumQueries(0):
+            self.adapter.get()
+            self.adapter.get_or_default()
+
+    def test_get_returns_copy(self):
+        self.adapter.create_or_update(AppSettingsDB())
+        app_db = self.adapter.get()
+        app_db.multiuser_mode = True
+        self.assertFalse(self.adapter.get().multiuser_mode)
+
+    def test_get_after_direct_save(self):
+        self.assertIsNone(self.adapter.get())
+        AppSettings.objects.create(multiuser_mode=True)
+        self.assertTrue(self.adapter.get().multiuser_mode)
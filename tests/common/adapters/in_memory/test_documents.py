@@ -3,17 +3,21 @@ Copyright (C) J Leadbetter <j@jleadbetter.com>
 Affero GPL v3
 """
 
+import io
 import os
 import shutil
+import types
 import uuid
 from pathlib import Path
 from unittest import TestCase
 
-from common.models.documents import DocumentDB
+from common.models.documents import DocumentDB, DocumentSummary
 from common.models.errors import ObjectNotFoundError
 from common.models.files import BinaryFileData
 from common.stores.app import AppStore
+from common.utils.cursors import CursorError
 from common.utils.files import get_project_dir
+from tests.utils.sentences import make_sentence_db
 from tests.utils.users import make_user_db
 
 
@@ -189,6 +193,46 @@ class TestDocumentDBInMemoryAdapter(TestCase):
         with self.assertRaises(ObjectNotFoundError):
             self.adapter.get(uuid.uuid4(), uuid.uuid4())
 
+    def test_find_by_name(self):
+        docdb = self._create_document()
+        returned = self.adapter.find_by_name(
+            docdb.user_id,
+            docdb.display_name,
+            docdb.language_code,
+        )
+        self.assertEqual(docdb, returned)
+
+    def test_find_by_name_does_not_exist(self):
+        docdb = self._create_document()
+        self.assertIsNone(
+            self.adapter.find_by_name(docdb.user_id, docdb.display_name, 'fr'),
+        )
+        self.assertIsNone(
+            self.adapter.find_by_name(
+                uuid.uuid4(),
+                docdb.display_name,
+                docdb.language_code,
+            ),
+        )
+
+    def test_delete(self):
+        docdb = self._create_document()
+        self.adapter.add_sentences(
+            docdb.id,
+            docdb.user_id,
+            self._make_sentences(docdb, 2),
+        )
+
+        self.assertTrue(self.adapter.delete(docdb.id, docdb.user_id))
+        self.assertEqual([], self.adapter.get_all(docdb.user_id))
+        self.assertEqual(0, self.adapter.count_sentences(docdb.id, docdb.user_id))
+
+    def test_delete_does_not_exist(self):
+        docdb = self._create_document()
+        self.assertFalse(self.adapter.delete(uuid.uuid4(), docdb.user_id))
+        self.assertFalse(self.adapter.delete(docdb.id, uuid.uuid4()))
+        self.assertEqual([docdb], self.adapter.get_all(docdb.user_id))
+
     def test_get_all(self):
         userdb = self.user_adapter.create(make_user_db())
         userdb2 = self.user_adapter.create(make_user_db())
@@ -228,3 +272,269 @@ class TestDocumentDBInMemoryAdapter(TestCase):
         expected = []
         returned = self.adapter.get_all(uuid.uuid4())
         self.assertEqual(expected, returned)
+
+    def test_iter_all(self):
+        userdb = self.user_adapter.create(make_user_db())
+        userdb2 = self.user_adapter.create(make_user_db())
+        docdbs = self._create_documents(userdb.id, ['de', 'fr'], 3)
+        self._create_documents(userdb2.id, ['fr'], 3)
+
+        returned = self.adapter.iter_all(userdb.id, chunk_size=2)
+        self.assertIsInstance(returned, types.GeneratorType)
+        self.assertEqual(set(docdbs), set(returned))
+
+    def test_iter_all_no_documents(self):
+        self.assertEqual([], list(self.adapter.iter_all(uuid.uuid4())))
+
+    def _create_documents(self, user_id, lang_codes, count):
+        return [
+            self.adapter.create_or_update(DocumentDB(
+                user_id=user_id,
+                display_name=f'Document {i:02}',
+                language_code=lang,
+            ))
+            for lang in lang_codes
+            for i in range(count)
+        ]
+
+    def test_get_page(self):
+        userdb = self.user_adapter.create(make_user_db())
+        docdbs = self._create_documents(userdb.id, ['fr', 'de'], 3)
+        expected = sorted(docdbs, key=lambda x: (x.language_code, x.display_name))
+
+        self.assertEqual(expected[:4], self.adapter.get_page(userdb.id, limit=4))
+        self.assertEqual(
+            expected[4:],
+            self.adapter.get_page(userdb.id, offset=4, limit=4),
+        )
+
+    def test_get_page_by_language(self):
+        userdb = self.user_adapter.create(make_user_db())
+        userdb2 = self.user_adapter.create(make_user_db())
+        docdbs = self._create_documents(userdb.id, ['de', 'fr'], 3)
+        self._create_documents(userdb2.id, ['fr'], 3)
+
+        expected = [doc for doc in docdbs if doc.language_code == 'fr']
+        returned = self.adapter.get_page(userdb.id, 'fr', offset=1, limit=5)
+        self.assertEqual(expected[1:], returned)
+
+    def test_get_page_no_documents(self):
+        self.assertEqual([], self.adapter.get_page(uuid.uuid4()))
+
+    def test_get_cursor_page(self):
+        userdb = self.user_adapter.create(make_user_db())
+        userdb2 = self.user_adapter.create(make_user_db())
+        docdbs = self._create_documents(userdb.id, ['fr', 'de'], 3)
+        self._create_documents(userdb2.id, ['de'], 3)
+        expected = sorted(docdbs, key=lambda x: (x.language_code, x.display_name))
+
+        page = self.adapter.get_cursor_page(userdb.id, limit=4)
+        self.assertEqual(expected[:4], page.items)
+        self.assertIsNotNone(page.next_cursor)
+
+        page = self.adapter.get_cursor_page(
+            userdb.id,
+            cursor=page.next_cursor,
+            limit=4,
+        )
+        self.assertEqual(expected[4:], page.items)
+        self.assertIsNone(page.next_cursor)
+
+    def test_get_cursor_page_by_language(self):
+        userdb = self.user_adapter.create(make_user_db())
+        docdbs = self._create_documents(userdb.id, ['de', 'fr'], 3)
+        expected = [doc for doc in docdbs if doc.language_code == 'fr']
+
+        page = self.adapter.get_cursor_page(userdb.id, 'fr', limit=2)
+        page = self.adapter.get_cursor_page(
+            userdb.id,
+            'fr',
+            cursor=page.next_cursor,
+            limit=2,
+        )
+        self.assertEqual(expected[2:], page.items)
+        self.assertIsNone(page.next_cursor)
+
+    def test_get_cursor_page_no_documents(self):
+        page = self.adapter.get_cursor_page(uuid.uuid4())
+        self.assertEqual([], page.items)
+        self.assertIsNone(page.next_cursor)
+
+    def test_get_cursor_page_invalid_cursor(self):
+        with self.assertRaises(CursorError):
+            self.adapter.get_cursor_page(uuid.uuid4(), cursor='not a cursor')
+
+    def test_get_cursor_page_invalid_limit(self):
+        userdb = self.user_adapter.create(make_user_db())
+        self._create_documents(userdb.id, ['fr'], 2)
+        for limit in [0, -1]:
+            with self.subTest(limit=limit):
+                with self.assertRaises(ValueError):
+                    self.adapter.get_cursor_page(userdb.id, limit=limit)
+
+    def test_get_summary_page(self):
+        userdb = self.user_adapter.create(make_user_db())
+        userdb2 = self.user_adapter.create(make_user_db())
+        docdbs = self._create_documents(userdb.id, ['fr', 'de'], 3)
+        self._create_documents(userdb2.id, ['fr'], 3)
+        expected = [
+            DocumentSummary(doc.id, doc.display_name, doc.language_code)
+            for doc in sorted(
+                docdbs,
+                key=lambda x: (x.language_code, x.display_name),
+            )
+        ]
+
+        self.assertEqual(
+            expected[:4],
+            self.adapter.get_summary_page(userdb.id, limit=4),
+        )
+        self.assertEqual(
+            expected[4:],
+            self.adapter.get_summary_page(userdb.id, 'fr', offset=1),
+        )
+
+    def test_get_summary_page_no_documents(self):
+        self.assertEqual([], self.adapter.get_summary_page(uuid.uuid4()))
+
+    def test_count_by_language(self):
+        userdb = self.user_adapter.create(make_user_db())
+        userdb2 = self.user_adapter.create(make_user_db())
+        self._create_documents(userdb.id, ['fr'], 3)
+        self._create_documents(userdb.id, ['de'], 2)
+        self._create_documents(userdb2.id, ['es'], 1)
+
+        self.assertEqual(
+            {'de': 2, 'fr': 3},
+            self.adapter.count_by_language(userdb.id),
+        )
+
+    def test_count_by_language_no_documents(self):
+        self.assertEqual({}, self.adapter.count_by_language(uuid.uuid4()))
+
+    def _create_document(self):
+        userdb = self.user_adapter.create(make_user_db())
+        return self.adapter.create_or_update(DocumentDB(
+            user_id=userdb.id,
+            display_name='Some document',
+            language_code='de',
+        ))
+
+    def _make_sentences(self, docdb, count, **kwargs):
+        return [
+            make_sentence_db(
+                user_id=docdb.user_id,
+                language_code='de',
+                text=f'Sentence {i}.',
+                **kwargs,
+            )
+            for i in range(count)
+        ]
+
+    def test_add_sentences(self):
+        docdb = self._create_document()
+        added = self.adapter.add_sentences(
+            docdb.id,
+            docdb.user_id,
+            self._make_sentences(docdb, 3),
+        )
+        self.assertEqual([0, 1, 2], [sentence.ordering for sentence in added])
+        for sentence in added:
+            self.assertIsNotNone(sentence.id)
+            self.assertEqual(docdb.id, sentence.document_id)
+
+        # New sentences go after the existing ones
+        added = self.adapter.add_sentences(
+            docdb.id,
+            docdb.user_id,
+            self._make_sentences(docdb, 2),
+        )
+        self.assertEqual([3, 4], [sentence.ordering for sentence in added])
+        self.assertEqual(5, self.adapter.count_sentences(docdb.id, docdb.user_id))
+
+    def test_add_sentences_document_does_not_exist(self):
+        docdb = self._create_document()
+        with self.assertRaises(ObjectNotFoundError):
+            self.adapter.add_sentences(
+                docdb.id,
+                uuid.uuid4(),
+                self._make_sentences(docdb, 1),
+            )
+
+    def test_get_sentences(self):
+        docdb = self._create_document()
+        added = self.adapter.add_sentences(
+            docdb.id,
+            docdb.user_id,
+            self._make_sentences(docdb, 10),
+        )
+
+        returned = self.adapter.get_sentences(docdb.id, docdb.user_id, 3, 6)
+        self.assertEqual(
+            ['Sentence 3.', 'Sentence 4.', 'Sentence 5.'],
+            [sentence.text for sentence in returned],
+        )
+        self.assertEqual(added[3:6], returned)
+
+        returned = self.adapter.get_sentences(docdb.id, docdb.user_id, 8)
+        self.assertEqual(added[8:], returned)
+
+    def test_get_sentences_wrong_user(self):
+        docdb = self._create_document()
+        self.adapter.add_sentences(
+            docdb.id,
+            docdb.user_id,
+            self._make_sentences(docdb, 2),
+        )
+        self.assertEqual([], self.adapter.get_sentences(docdb.id, uuid.uuid4()))
+        self.assertEqual(0, self.adapter.count_sentences(docdb.id, uuid.uuid4()))
+
+    def test_get_sentences_no_sentences(self):
+        docdb = self._create_document()
+        self.assertEqual([], self.adapter.get_sentences(docdb.id, docdb.user_id))
+        self.assertEqual(0, self.adapter.count_sentences(docdb.id, docdb.user_id))
+
+    def test_parse_binary_data_attrs_line_endings(self):
+        expected_attrs = {'Title': 'Roodkapje', 'Author': 'Grimm: de broers'}
+        for linesep in ('\n', '\r\n', '\r'):
+            with self.subTest(linesep=repr(linesep)):
+                text = linesep.join([
+                    ':Title: Roodkapje',
+                    '  :Author:  Grimm: de broers ',
+                    '',
+                    ':Not: an attribute',
+                ])
+                binary_data = BinaryFileData(name='foo.txt', data=text.encode())
+                self.assertEqual(
+                    expected_attrs,
+                    self.adapter.parse_binary_data_attrs(binary_data),
+                )
+
+    def test_parse_binary_data_attrs_no_attrs(self):
+        for data in (b'', b'Er was eens.\n:Title: Roodkapje\n'):
+            binary_data = BinaryFileData(name='foo.txt', data=data)
+            self.assertEqual({}, self.adapter.parse_binary_data_attrs(binary_data))
+
+    def test_parse_binary_data_attrs_ignores_body(self):
+        # The body isn't decoded, so it doesn't have to be valid UTF-8
+        data = ':Title: Roodkapje\r\n\r\n'.encode() + 'Ça va?'.encode('latin-1')
+        binary_data = BinaryFileData(name='foo.txt', data=data)
+        self.assertEqual(
+            {'Title': 'Roodkapje'},
+            self.adapter.parse_binary_data_attrs(binary_data),
+        )
+
+    def test_parse_stream_attrs(self):
+        filepath = TEST_DATA_DIR / 'Rumpelstilzchen.txt'
+        with filepath.open('rb') as testfile:
+            binary_data = BinaryFileData(name=filepath.name, data=testfile.read())
+            testfile.seek(0)
+            attrs = self.adapter.parse_stream_attrs(testfile)
+            self.assertLess(testfile.tell(), len(binary_data.data))
+
+        self.assertEqual(self.adapter.parse_binary_data_attrs(binary_data), attrs)
+        self.assertEqual('Rumpelstilzchen', attrs['Titel'])
+
+    def test_parse_stream_attrs_no_attrs(self):
+        stream = io.BytesIO(b'Er was eens.\n:Title: Roodkapje\n')
+        self.assertEqual({}, self.adapter.parse_stream_attrs(stream))
@@ -96,3 +96,25 @@ class TestAppSettingsInMemoryAdapter(TestCase):
         expected = app_db2
         returned = self.adapter.create_or_update(app_db2)
         self.assertEqual(expected, returned)
+
+    def test_create_or_update_keeps_copy(self):
+        app_db = AppSettingsDB(multiuser_mode=True)
+        self.adapter.create_or_update(app_db)
+
+        app_db.multiuser_mode = False
+        self.assertTrue(self.adapter.get().multiuser_mode)
+        self.assertTrue(self.store.db.app_settings.multiuser_mode)
+
+    def test_get_after_drop(self):
+        self.adapter.create_or_update(AppSettingsDB(multiuser_mode=True))
+        self.assertIsNotNone(self.adapter.get())
+        self.store.drop()
+        self.assertIsNone(self.adapter.get())
+
+    def test_get_after_dropping_twice(self):
+        self.adapter.create_or_update(AppSettingsDB(multiuser_mode=True))
+        self.assertIsNotNone(self.adapter.get())
+        self.store.drop()
+        self.store.drop()
+        self.assertIsNone(self.store.db.app_settings)
+        self.assertIsNone(self.adapter.get())
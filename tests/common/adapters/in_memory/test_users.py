@@ -4,6 +4,7 @@ Affero GPL v3
 """
 
 from pathlib import Path
+import types
 import uuid
 
 from django.contrib.auth.models import User
@@ -14,8 +15,10 @@ from common.models.errors import (
     ObjectNotFoundError,
     ObjectValidationError,
 )
-from common.models.users import UserDB, UserUI
+from common.models.users import UserDB, UserSummary, UserUI
 from common.stores.app import AppStore
+from common.utils.cursors import CursorError, encode_cursor
+from tests.utils.users import make_user_db
 
 
 TEST_CONFIG_DIR = Path(__file__).resolve().parent.parent.parent.parent
@@ -154,6 +157,16 @@ class TestUserDBInMemoryAdapter(TestCase):
     def test_get_first_database_empty(self):
         self.assertIsNone(self.adapter.get_first())
 
+    def test_has_users(self):
+        self.assertFalse(self.adapter.has_users())
+        self.adapter.create(make_user_db())
+        self.assertTrue(self.adapter.has_users())
+
+    def test_has_users_database_dropped(self):
+        self.adapter.create(make_user_db())
+        self.adapter.store.drop()
+        self.assertFalse(self.adapter.has_users())
+
     def test_get_first_more_than_one(self):
         user1 = UserDB(
             username='test_get_first_more_than_one1',
@@ -215,6 +228,54 @@ class TestUserDBInMemoryAdapter(TestCase):
         returned = self.adapter.get_all()
         self.assertEqual(expected, returned)
 
+    def test_get_summaries(self):
+        userdb = self.adapter.create(UserDB(
+            username='alice',
+            password='fakepass390',
+            display_name='Alice',
+        ))
+        self.adapter.create(UserDB(username='bob', password='fakepass390'))
+
+        self.assertEqual(
+            [
+                UserSummary(userdb.id, 'alice', 'Alice'),
+                (self.adapter.get_by_username('bob').id, 'bob', None),
+            ],
+            self.adapter.get_summaries(),
+        )
+
+    def test_get_summaries_table_empty(self):
+        self.assertEqual([], self.adapter.get_summaries())
+
+    def test_iter_all(self):
+        for username in ['alice', 'bob', 'carol']:
+            self.adapter.create(UserDB(username=username, password='fakepass390'))
+
+        returned = self.adapter.iter_all(chunk_size=2)
+        self.assertIsInstance(returned, types.GeneratorType)
+        self.assertEqual(self.adapter.get_all(), list(returned))
+
+    def test_iter_all_table_empty(self):
+        self.assertEqual([], list(self.adapter.iter_all()))
+
+    def test_get_cursor_page(self):
+        for username in ['carol', 'alice', 'dave', 'bob', 'eve']:
+            self.adapter.create(UserDB(username=username, password='fakepass390'))
+
+        page = self.adapter.get_cursor_page(limit=2)
+        usernames = [user.username for user in page.items]
+        while page.next_cursor:
+            page = self.adapter.get_cursor_page(page.next_cursor, limit=2)
+            usernames.extend(user.username for user in page.items)
+
+        self.assertEqual(['alice', 'bob', 'carol', 'dave', 'eve'], usernames)
+        self.assertIsNone(page.items[0].password)
+
+    def test_get_cursor_page_invalid_cursor(self):
+        cursor = encode_cursor('documents', ['de', 'Some document', 'id'])
+        with self.assertRaises(CursorError):
+            self.adapter.get_cursor_page(cursor)
+
     def test_get_password(self):
         user = UserDB(
             username='foo',
@@ -0,0 +1,225 @@
+"""
+Copyright (C) J Leadbetter <j@jleadbetter.com>
+Affero GPL v3
+"""
+
+from unittest import TestCase
+
+from common.models.errors import ObjectExistsError, ObjectNotFoundError
+from common.stores.app import AppStore
+from common.utils.cursors import CursorError, encode_cursor
+from tests.utils.words import make_word
+
+
+class TestWordInMemoryAdapter(TestCase):
+    """
+    Tests for common.adapters.in_memory.words.WordInMemoryAdapter
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        AppStore.destroy_all()
+        super().setUpClass()
+
+    def setUp(self):
+        app = AppStore(subsection='dev.in_memory')
+        self.adapter = app.get('AdapterStore').get('WordPort')
+
+    def tearDown(self):
+        AppStore.destroy_all()
+
+    def test_create(self):
+        word = make_word(base_word='lopen', forms=['liep'])
+        created = self.adapter.create(word)
+
+        self.assertIsNotNone(created.id)
+        self.assertIsNotNone(created.type.data[1].id)
+        self.assertIsNone(word.id)
+        self.assertEqual(created, self.adapter.read('nl', 'lopen'))
+
+    def test_create_exists(self):
+        self.adapter.create(make_word(base_word='lopen'))
+        with self.assertRaises(ObjectExistsError):
+            self.adapter.create(make_word(base_word='lopen'))
+
+    def test_create_in_batch(self):
+        self.adapter.create(make_word(base_word='lopen', frequency=1))
+        words = [
+            make_word(base_word='lopen', frequency=2),
+            make_word(base_word='huis', frequency=3),
+            make_word(base_word='huis', frequency=4),
+            make_word(language_code='de', base_word='huis', frequency=5),
+        ]
+        created = self.adapter.create_in_batch(words)
+
+        self.assertEqual(
+            [('nl', 'huis', 3), ('de', 'huis', 5)],
+            [(word.languageCode, word.baseWord, word.frequency) for word in created],
+        )
+        self.assertTrue(all(word.id for word in created))
+        self.assertEqual(1, self.adapter.read('nl', 'lopen').frequency)
+        self.assertEqual(3, len(self.adapter.read_multiple()))
+
+    def test_create_in_batch_empty(self):
+        self.assertEqual([], self.adapter.create_in_batch([]))
+
+    def test_create_or_update(self):
+        created = self.adapter.create_or_update(make_word(base_word='lopen'))
+        updated = self.adapter.create_or_update(
+            make_word(base_word='lopen', frequency=10),
+        )
+        self.assertEqual(created.id, updated.id)
+        self.assertEqual(10, self.adapter.read('nl', 'lopen').frequency)
+
+    def test_read_does_not_exist(self):
+        with self.assertRaises(ObjectNotFoundError):
+            self.adapter.read('nl', 'lopen')
+
+    def test_read_multiple(self):
+        self.adapter.create_in_batch([
+            make_word(base_word=base_word)
+            for base_word in ['c', 'a', 'd', 'b']
+        ])
+        self.assertEqual(
+            ['b', 'c'],
+            [word.baseWord for word in self.adapter.read_multiple(2, 1)],
+        )
+
+    def test_update(self):
+        created = self.adapter.create(make_word(base_word='lopen'))
+        updated = self.adapter.update(make_word(base_word='lopen', frequency=7))
+        self.assertEqual(created.id, updated.id)
+        self.assertEqual(7, updated.frequency)
+
+    def test_update_does_not_exist(self):
+        with self.assertRaises(ObjectNotFoundError):
+            self.adapter.update(make_word(base_word='lopen'))
+
+    def test_delete(self):
+        word = self.adapter.create(make_word(base_word='lopen'))
+        self.assertTrue(self.adapter.delete(word))
+        self.assertFalse(self.adapter.delete(word))
+        with self.assertRaises(ObjectNotFoundError):
+            self.adapter.read('nl', 'lopen')
+
+    def test_merge_existing(self):
+        self.adapter.create_in_batch([
+            make_word(base_word='liep', meanings=['walked'], frequency=20),
+            make_word(base_word='gelopen', meanings=['walked', 'ran']),
+            make_word(base_word='huis'),
+        ])
+        word = make_word(
+            base_word='lopen',
+            forms=['liep', 'gelopen', 'loopt'],
+            meanings=['walk'],
+        )
+        merged = self.adapter.merge_existing(word)
+
+        self.assertEqual(20, merged.frequency)
+        self.assertEqual(
+            ['walk', 'walked', 'ran'],
+            merged.translations[0].meanings,
+        )
+        self.assertEqual(merged, self.adapter.read('nl', 'lopen'))
+        self.assertEqual(
+            ['huis', 'lopen'],
+            [word.baseWord for word in self.adapter.read_multiple()],
+        )
+
+    def test_merge_existing_nothing_to_merge(self):
+        word = make_word(base_word='lopen', forms=['liep'])
+        merged = self.adapter.merge_existing(word)
+        self.assertEqual(merged, self.adapter.read('nl', 'lopen'))
+        self.assertIsNone(merged.translations)
+
+    def test_read_page(self):
+        self.adapter.create_in_batch([
+            make_word(base_word=base_word)
+            for base_word in ['huis', 'lopen', 'appel', 'zijn']
+        ])
+        self.adapter.create(make_word(language_code='de', base_word='haus'))
+
+        page = self.adapter.read_page(2)
+        words = page.items
+        while page.next_cursor:
+            page = self.adapter.read_page(2, cursor=page.next_cursor)
+            words.extend(page.items)
+
+        self.assertEqual(
+            [
+                ('de', 'haus'),
+                ('nl', 'appel'),
+                ('nl', 'huis'),
+                ('nl', 'lopen'),
+                ('nl', 'zijn'),
+            ],
+            [(word.languageCode, word.baseWord) for word in words],
+        )
+        self.assertEqual(words[2], self.adapter.read('nl', 'huis'))
+
+    def test_read_page_invalid_cursor(self):
+        with self.assertRaises(CursorError):
+            self.adapter.read_page(cursor=encode_cursor('users', ['alice']))
+
+    def test_merge_existing_in_batch(self):
+        self.adapter.create_in_batch([
+            make_word(base_word='liep', meanings=['walked']),
+            make_word(base_word='zwom', meanings=['swam']),
+            make_word(base_word='loopt', frequency=30),
+            make_word(base_word='zwemmen', frequency=40),
+        ])
+        words = [
+            make_word(base_word='lopen', forms=['liep', 'loopt']),
+            make_word(base_word='zwemmen', forms=['zwom', 'loopt']),
+            make_word(base_word='liep'),
+        ]
+        merged = self.adapter.merge_existing_in_batch(words)
+
+        self.assertEqual(
+            ['lopen', 'zwemmen', 'liep'],
+            [word.baseWord for word in merged],
+        )
+        # 'liep' is in the batch, so it isn't merged into 'lopen',
+        # and 'loopt' is only merged into the first word that has it
+        self.assertIsNone(merged[0].translations)
+        self.assertEqual(30, merged[0].frequency)
+        self.assertEqual(['swam'], merged[1].translations[0].meanings)
+        self.assertEqual(merged[1].id, merged[1].translations[0].word)
+        self.assertEqual(
+            ['liep', 'lopen', 'zwemmen'],
+            [word.baseWord for word in self.adapter.read_multiple()],
+        )
+        self.assertEqual(merged[1], self.adapter.read('nl', 'zwemmen'))
+
+    def test_find_by_form(self):
+        self.adapter.create_in_batch([
+            make_word(base_word='zijn', forms=['was', 'ben']),
+            make_word(base_word='wassen', forms=['was', 'waste']),
+            make_word(language_code='de', base_word='was'),
+        ])
+
+        self.assertEqual(
+            ['wassen', 'zijn'],
+            [word.baseWord for word in self.adapter.find_by_form('nl', 'was')],
+        )
+        self.assertEqual(
+            ['zijn'],
+            [word.baseWord for word in self.adapter.find_by_form('nl', 'zijn')],
+        )
+        self.assertEqual([], self.adapter.find_by_form('nl', 'is'))
+
+    def test_find_by_form_after_changes(self):
+        word = self.adapter.create(make_word(base_word='zijn', forms=['was']))
+        self.adapter.update(make_word(base_word='zijn', forms=['ben']))
+        self.assertEqual([], self.adapter.find_by_form('nl', 'was'))
+        self.assertEqual(1, len(self.adapter.find_by_form('nl', 'ben')))
+
+        self.adapter.delete(word)
+        self.assertEqual([], self.adapter.find_by_form('nl', 'ben'))
+
+        self.adapter.create(make_word(base_word='ben'))
+        self.adapter.merge_existing(make_word(base_word='zijn', forms=['ben']))
+        self.assertEqual(
+            ['zijn'],
+            [word.baseWord for word in self.adapter.find_by_form('nl', 'ben')],
+        )
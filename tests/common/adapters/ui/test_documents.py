@@ -8,8 +8,15 @@ from unittest import TestCase
 
 from common.adapters.ui.documents import DocumentUIAdapter
 from common.adapters.ui.users import UserUIAdapter
-from common.models.documents import DocumentDB, DocumentUI
+from common.models.documents import (
+    DocumentDB,
+    DocumentSummary,
+    DocumentUI,
+    DocumentUISummary,
+)
+from common.models.sentences import SentenceUI
 from tests.utils.documents import make_document_db
+from tests.utils.sentences import make_sentence_db
 from tests.utils.users import make_user_ui
 
 
@@ -75,6 +82,21 @@ class TestDocumentUIAdapter(TestCase):
         returned = self.adapter.get_all(docdbs, user)
         self.assertEqual(expected, returned)
 
+    def test_get_summaries(self):
+        summaries = [
+            DocumentSummary(uuid.uuid4(), 'Roodkapje', 'nl'),
+            DocumentSummary(uuid.uuid4(), 'Unknown language', 'xx'),
+        ]
+        returned = self.adapter.get_summaries(summaries)
+
+        self.assertEqual(
+            [
+                DocumentUISummary(summaries[0].id, 'Roodkapje', 'Dutch'),
+                DocumentUISummary(summaries[1].id, 'Unknown language', 'Unknown'),
+            ],
+            returned,
+        )
+
     def test_get_all_with_attributes(self):
         lang_codes = ('fr', 'es', 'de')
         langs = ('French', 'Spanish', 'German')
@@ -108,3 +130,25 @@ class TestDocumentUIAdapter(TestCase):
         expected = docdbs
         returned = self.adapter.get_all(docdbs, user)
         self.assertEqual(expected, returned)
+
+    def test_get_sentences(self):
+        sentencedbs = [
+            make_sentence_db(
+                id=uuid.uuid4(),
+                ordering=i,
+                language_code='de',
+            )
+            for i in range(3)
+        ]
+        expected = [
+            SentenceUI(
+                id=sentencedb.id,
+                language='German',
+                ordering=sentencedb.ordering,
+                text=sentencedb.text,
+                enabledForStudy=False,
+                displayText=[],
+            )
+            for sentencedb in sentencedbs
+        ]
+        self.assertEqual(expected, self.adapter.get_sentences(sentencedbs))
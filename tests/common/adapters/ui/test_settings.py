@@ -3,23 +3,34 @@ Copyright (C) J Leadbetter <j@jleadbetter.com>
 Affero GPL v3
 """
 
-from unittest import TestCase
+from pathlib import Path
+from unittest import TestCase, mock
 
 from common.adapters.in_memory.users import UserDBInMemoryAdapter
 from common.adapters.ui.settings import AppSettingsUIAdapter
 from common.models.settings import AppSettingsDB, AppSettingsUI
-from common.stores.data.in_memory import InMemoryDBStore
-from common.utils.singleton import Singleton
+from common.stores.app import AppStore
 from tests.utils.users import make_user_db
 
+TEST_CONFIG_DIR = Path(__file__).resolve().parent.parent.parent.parent
+TEST_CONFIG = TEST_CONFIG_DIR / 'setup.cfg'
+
 
 class TestAppSettingsUIAdapter(TestCase):
     """
     Tests for common.adapters.ui.settings.AppSettingsUIAdapter
     """
 
+    @classmethod
+    def setUpClass(cls):
+        AppStore.destroy_all()
+        super().setUpClass()
+
+    def setUp(self):
+        AppStore(config=TEST_CONFIG, subsection='dev.in_memory')
+
     def tearDown(self):
-        Singleton.destroy(InMemoryDBStore)
+        AppStore.destroy_all()
 
     def test_get_settings_does_not_exist(self):
         settings = AppSettingsUIAdapter()
@@ -278,3 +289,67 @@ class TestAppSettingsUIAdapter(TestCase):
         )
         returned = settings.get(settings_db)
         self.assertEqual(expected, returned)
+
+    def test_get_uses_configured_user_port(self):
+        settings = AppSettingsUIAdapter()
+        user_db_adapter = AppStore().get('AdapterStore').get('UserDBPort')
+        self.assertEqual(user_db_adapter, settings.user_db_adapter)
+
+    def test_get_reuses_snapshot(self):
+        UserDBInMemoryAdapter().create(make_user_db())
+        settings_db = AppSettingsDB(passwordless_login=True)
+        settings = AppSettingsUIAdapter()
+
+        with mock.patch.object(
+            settings,
+            '_build',
+            wraps=settings._build,
+        ) as mock_build:
+            returned1 = settings.get(settings_db)
+            returned2 = settings.get(AppSettingsDB(passwordless_login=True))
+            self.assertEqual(returned1, returned2)
+            self.assertTrue(returned2.automatic_login)
+            mock_build.assert_called_once()
+
+    def test_get_snapshot_is_copy(self):
+        settings_db = AppSettingsDB()
+        settings = AppSettingsUIAdapter()
+        returned = settings.get(settings_db)
+        returned.show_login = False
+        self.assertTrue(settings.get(settings_db).show_login)
+
+    def test_get_settings_changed(self):
+        UserDBInMemoryAdapter().create(make_user_db())
+        settings = AppSettingsUIAdapter()
+
+        returned1 = settings.get(AppSettingsDB(multiuser_mode=True))
+        self.assertTrue(returned1.show_registration)
+        returned2 = settings.get(AppSettingsDB(multiuser_mode=False))
+        self.assertFalse(returned2.show_registration)
+
+    def test_get_first_user_added(self):
+        settings_db = AppSettingsDB(passwordless_login=True)
+        settings = AppSettingsUIAdapter()
+
+        returned1 = settings.get(settings_db)
+        self.assertTrue(returned1.show_registration)
+        self.assertFalse(returned1.automatic_login)
+
+        UserDBInMemoryAdapter().create(make_user_db())
+        returned2 = settings.get(settings_db)
+        self.assertFalse(returned2.show_registration)
+        self.assertTrue(returned2.automatic_login)
+
+    def test_get_users_dropped(self):
+        settings_db = AppSettingsDB(passwordless_login=True)
+        settings = AppSettingsUIAdapter()
+        UserDBInMemoryAdapter().create(make_user_db())
+
+        returned1 = settings.get(settings_db)
+        self.assertFalse(returned1.show_registration)
+        self.assertTrue(returned1.automatic_login)
+
+        AppStore().get('DataStore').drop()
+        returned2 = settings.get(settings_db)
+        self.assertTrue(returned2.show_registration)
+        self.assertFalse(returned2.automatic_login)
@@ -3,6 +3,7 @@ Copyright (C) J Leadbetter <j@jleadbetter.com>
 Affero GPL v3
 """
 
+import types
 import uuid
 
 from django.test import TestCase
@@ -88,3 +89,15 @@ class TestUserUIAdapter(TestCase):
         expected = []
         returned = self.adapter.get_all([])
         self.assertEqual(expected, returned)
+
+    def test_iter_all(self):
+        users = (
+            UserDB(id=uuid.uuid4(), username=f'test_iter_all{i}')
+            for i in range(3)
+        )
+        returned = self.adapter.iter_all(users)
+        self.assertIsInstance(returned, types.GeneratorType)
+        self.assertEqual(
+            ['test_iter_all0', 'test_iter_all1', 'test_iter_all2'],
+            [user.displayName for user in returned],
+        )
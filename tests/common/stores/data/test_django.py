@@ -46,7 +46,12 @@ class TestDjangDBStore(TestCase):
     def test_setup(self):
         # Verify that the command we expect is getting called
         with mock.patch('common.stores.data.django.call_command') as call_command:
-            store = DjangoDBStore()
+            with mock.patch.object(
+                DjangoDBStore,
+                'schema_is_current',
+                return_value=False,
+            ):
+                store = DjangoDBStore()
             call_command.assert_called_once_with('migrate')
 
         # Just ensure this doesn't error
@@ -56,6 +61,44 @@ class TestDjangDBStore(TestCase):
         except Exception:
             self.assertEqual('Unexpected failure in DjangoDBStore.setup', False)
 
+    def test_setup_schema_is_current(self):
+        with mock.patch('common.stores.data.django.call_command') as call_command:
+            store = DjangoDBStore()
+            call_command.assert_not_called()
+
+    def test_schema_is_current(self):
+        store = DjangoDBStore()
+        self.assertTrue(store.schema_is_current())
+        self.assertIn(
+            ('words', '0002_document_attrs'),
+            common.stores.data.django.get_migration_files(),
+        )
+
+    def test_schema_is_current_unapplied_migration(self):
+        store = DjangoDBStore()
+        with mock.patch(
+            'common.stores.data.django.get_migration_files',
+            return_value=frozenset([('words', '9999_not_applied')]),
+        ):
+            self.assertFalse(store.schema_is_current())
+
+    def test_schema_is_current_extra_applied_migration(self):
+        store = DjangoDBStore()
+        with mock.patch(
+            'common.stores.data.django.get_applied_migrations',
+            return_value=(
+                common.stores.data.django.get_applied_migrations()
+                | {('words', '0001_squashed_away')}
+            ),
+        ):
+            self.assertTrue(store.schema_is_current())
+
+    def test_upgrade(self):
+        with mock.patch('common.stores.data.django.call_command') as call_command:
+            store = DjangoDBStore()
+            store.upgrade()
+            call_command.assert_called_once_with('migrate')
+
     def test_drop(self):
         # Verify that the command we expect is getting called
         with mock.patch('common.stores.data.django.call_command') as call_command:
@@ -63,6 +63,18 @@ class TestInMemoryDBStore(TestCase):
         self.assertEqual(0, len(store.db.users))
         self.assertEqual(0, len(store.db.documents))
 
+    def test_version_changes_with_database(self):
+        app = AppStore(config=TEST_CONF, subsection='dev.in_memory')
+        store = app.get('DataStore')
+        versions = [store.version]
+        store.drop()
+        versions.append(store.version)
+        store.drop()
+        versions.append(store.version)
+        store.load_data(force=True)
+        versions.append(store.version)
+        self.assertEqual(len(versions), len(set(versions)))
+
     def test_load_data(self):
         app = AppStore(config=TEST_CONF, subsection='dev.in_memory')
         store = app.get('DataStore')
@@ -3,7 +3,9 @@ Copyright (C) J Leadbetter <j@jleadbetter.com>
 Affero GPL v3
 """
 
+import threading
 from pathlib import Path
+from unittest import mock
 
 import pytest
 from django.test import TestCase
@@ -49,13 +51,31 @@ class TestAdapterStore(TestCase):
             adapter_store2._adapters['foo'],
         )
 
-    def test_initialize_at_init(self):
+    def test_adapters_are_lazy(self):
         adapter_store = AdapterStore()
+        self.assertEqual({}, adapter_store._adapters)
+
+        adapter_store.get('UserUIPort')
+        self.assertEqual(['useruiport'], list(adapter_store._adapters.keys()))
+
+    def test_initialize_warmup_at_init(self):
+        AppStore.destroy_all()
+        adapter_store = AdapterStore(warmup='UserUIPort, AuthPort')
+        self.assertEqual(['useruiport', 'authport'], adapter_store.warmup)
+        self.assertEqual(
+            {'useruiport', 'authport'},
+            set(adapter_store._adapters.keys()),
+        )
+
+    def test_initialize_warmup_all(self):
+        adapter_store = AdapterStore()
+        adapter_store.initialize(ports=['*'])
         for port in adapter_store._config.get('ports'):
             self.assertTrue(port in adapter_store._adapters)
 
     def test_initialize_doesnt_override_existing_adapters(self):
         adapter_store = AdapterStore()
+        adapter_store.initialize(ports=['*'])
 
         expected_value = 'override'
         for key in adapter_store._adapters.keys():
@@ -78,7 +98,7 @@ class TestAdapterStore(TestCase):
                 overridden_ports.append(port)
                 adapter_store._adapters[port] = 'override'
 
-        adapter_store.initialize()
+        adapter_store.initialize(ports=ports)
         for port in ports:
             if port in overridden_ports:
                 self.assertEqual(
@@ -99,7 +119,7 @@ class TestAdapterStore(TestCase):
         for port in ports:
             adapter_store._adapters[port] = 'override'
 
-        adapter_store.initialize(force=True)
+        adapter_store.initialize(force=True, ports=ports)
         for port in ports:
             adapter_cls = adapter_store._get_adapter_cls(port)
             self.assertEqual(
@@ -118,9 +138,10 @@ class TestAdapterStore(TestCase):
                 adapter_store._config._config[
                     f'{adapter_store._config.subsection}.ports'
                 ][port] = 'override'
+        adapter_store._config._compile()
 
         with self.assertRaises(Exception) as exc:
-            adapter_store.initialize(force=True)
+            adapter_store.initialize(force=True, ports=ports)
         self.assertEqual(
             AdapterInitializationError,
             type(exc.exception),
@@ -156,3 +177,32 @@ class TestAdapterStore(TestCase):
         adapter_store = AdapterStore()
         with self.assertRaises(AdapterNotFoundError):
             adapter_store.get('FooBarPort')
+
+    def test_get_builds_once(self):
+        adapter_store = AdapterStore()
+        with mock.patch.object(
+            adapter_store,
+            '_make_adapter',
+            wraps=adapter_store._make_adapter,
+        ) as mock_make:
+            threads = [
+                threading.Thread(target=adapter_store.get, args=['UserUIPort'])
+                for _ in range(8)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        mock_make.assert_called_once_with('useruiport')
+
+    def test_get_throws_error_if_adapter_fails(self):
+        adapter_store = AdapterStore()
+        adapter_store._config._config[
+            f'{adapter_store._config.subsection}.ports'
+        ]['UserUIPort'] = 'override'
+        adapter_store._config._compile()
+
+        with self.assertRaises(AdapterInitializationError):
+            adapter_store.get('UserUIPort')
+        self.assertFalse('useruiport' in adapter_store._adapters)
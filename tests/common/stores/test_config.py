@@ -8,7 +8,7 @@ from pathlib import Path
 from unittest import TestCase
 
 from common.stores.app import AppStore
-from common.stores.config import ConfigStore
+from common.stores.config import ConfigSnapshot, ConfigStore
 from common.utils.singleton import Singleton
 
 
@@ -222,3 +222,73 @@ class TestConfigStore(TestCase):
         self.assertIsNone(
             settings_store.get('data', 'foo', int),
         )
+
+    def test_get_root_section(self):
+        settings_store = ConfigStore(config=TEST_CONFIG, subsection='test')
+        self.assertEqual(
+            'tests.utils.stores.init_foo',
+            settings_store.get('', 'InitScript'),
+        )
+
+    def test_get_section_is_case_insensitive(self):
+        settings_store = ConfigStore(config=TEST_CONFIG, subsection='test')
+        self.assertEqual('bar', settings_store.get('Data', 'Foo'))
+
+    def test_get_typed_key_is_memoized(self):
+        settings_store = ConfigStore(config=TEST_CONFIG, subsection='test')
+        settings_store.get('data', 'baz', int)
+        self.assertEqual(
+            1,
+            settings_store.snapshot._converted[('data.baz', int)],
+        )
+
+    def test_initialize_forced_replaces_snapshot(self):
+        settings_store = ConfigStore(config=TEST_CONFIG, subsection='test')
+        snapshot = settings_store.snapshot
+
+        settings_store._subsection_name = 'test2'
+        settings_store.initialize(force=True)
+
+        self.assertIsNot(snapshot, settings_store.snapshot)
+        self.assertEqual([], settings_store.get('data'))
+        # The old snapshot still works for anyone holding on to it
+        self.assertEqual('bar', snapshot.get('data.foo'))
+
+
+class TestConfigSnapshot(TestCase):
+    """
+    Tests for common.stores.config.ConfigSnapshot
+    """
+
+    def setUp(self):
+        parser = configparser.ConfigParser()
+        parser.read(TEST_CONFIG)
+        self.snapshot = ConfigSnapshot(parser, 'test')
+
+    def test_section(self):
+        self.assertEqual('/tmp/foo', self.snapshot.section('common')['uploaddir'])
+
+    def test_section_missing(self):
+        self.assertEqual({}, dict(self.snapshot.section('foo')))
+
+    def test_section_is_read_only(self):
+        with self.assertRaises(TypeError):
+            self.snapshot.section('data')['foo'] = 'override'
+
+    def test_get(self):
+        self.assertEqual('bar', self.snapshot.get('data.foo'))
+        self.assertEqual(1, self.snapshot.get('data.baz', int))
+        self.assertTrue(self.snapshot.get('data.buz', bool))
+        self.assertFalse(self.snapshot.get('data.fuz', bool))
+
+    def test_get_missing(self):
+        self.assertIsNone(self.snapshot.get('data.boz'))
+        self.assertEqual(3, self.snapshot.get('data.boz', int, default=3))
+
+    def test_get_invalid_type(self):
+        self.assertIsNone(self.snapshot.get('data.foo', bool))
+        self.assertEqual(3, self.snapshot.get('data.foo', int, default=3))
+
+    def test_other_subsections_excluded(self):
+        self.assertEqual({}, dict(self.snapshot.section('stores.datastore')))
+        self.assertIsNone(self.snapshot.get('dev.django.ports.authport'))
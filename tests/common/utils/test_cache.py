@@ -0,0 +1,121 @@
+"""
+Copyright (C) J Leadbetter <j@jleadbetter.com>
+Affero GPL v3
+"""
+
+import os
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+
+from common.utils.cache import ChangeSignal, SettingsCache
+
+
+class TestChangeSignal(TestCase):
+    """
+    Tests for common.utils.cache.ChangeSignal
+    """
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmpdir.name) / 'test.signal'
+
+    def tearDown(self):
+        ChangeSignal._local_versions.pop(str(self.path), None)
+        self.tmpdir.cleanup()
+
+    def test_no_change(self):
+        signal = ChangeSignal(self.path, check_interval=0)
+        self.assertFalse(signal.has_changed())
+
+    def test_notify_does_not_signal_sender(self):
+        signal = ChangeSignal(self.path, check_interval=0)
+        signal.notify()
+        self.assertTrue(self.path.exists())
+        self.assertFalse(signal.has_changed())
+
+    def test_notify_same_process(self):
+        listener = ChangeSignal(self.path, check_interval=60)
+        ChangeSignal(self.path).notify()
+        # Seen right away, without waiting for the check interval
+        self.assertTrue(listener.has_changed())
+        self.assertFalse(listener.has_changed())
+
+    def test_notify_other_process(self):
+        listener = ChangeSignal(self.path, check_interval=0)
+        # Simulate another process writing the file
+        self.path.write_text('changed')
+        os.utime(self.path, ns=(1, 1))
+        self.assertTrue(listener.has_changed())
+        self.assertFalse(listener.has_changed())
+
+    def test_check_interval(self):
+        listener = ChangeSignal(self.path, check_interval=60)
+        self.path.write_text('changed')
+        self.assertFalse(listener.has_changed())
+
+
+class TestSettingsCache(TestCase):
+    """
+    Tests for common.utils.cache.SettingsCache
+    """
+
+    def setUp(self):
+        self.loads = 0
+
+    def _loader(self):
+        self.loads += 1
+        return self.loads
+
+    def test_get_loads_once(self):
+        cache = SettingsCache()
+        self.assertEqual(1, cache.get(self._loader))
+        self.assertEqual(1, cache.get(self._loader))
+        self.assertEqual(1, self.loads)
+
+    def test_get_caches_none(self):
+        cache = SettingsCache()
+        loads = []
+
+        def _loader():
+            loads.append(True)
+            return None
+
+        self.assertIsNone(cache.get(_loader))
+        self.assertIsNone(cache.get(_loader))
+        self.assertEqual(1, len(loads))
+
+    def test_set(self):
+        cache = SettingsCache()
+        cache.get(self._loader)
+        cache.set('foo')
+        self.assertEqual('foo', cache.get(self._loader))
+        self.assertEqual(1, self.loads)
+
+    def test_invalidate(self):
+        cache = SettingsCache()
+        cache.get(self._loader)
+        cache.invalidate()
+        self.assertEqual(2, cache.get(self._loader))
+
+    def test_version_changed(self):
+        version = [1]
+        cache = SettingsCache(version=lambda: version[0])
+        cache.get(self._loader)
+        version[0] = 2
+        self.assertEqual(2, cache.get(self._loader))
+        self.assertEqual(2, cache.get(self._loader))
+
+    def test_signal(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / 'test.signal'
+            cache1 = SettingsCache(signal=ChangeSignal(path))
+            cache2 = SettingsCache(signal=ChangeSignal(path))
+            cache1.get(self._loader)
+            cache2.get(self._loader)
+
+            cache1.set('foo')
+            self.assertEqual('foo', cache1.get(self._loader))
+            # The other cache reloads from storage
+            self.assertEqual(3, cache2.get(self._loader))
+            ChangeSignal._local_versions.pop(str(path), None)
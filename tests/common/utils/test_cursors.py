@@ -0,0 +1,75 @@
+"""
+Copyright (C) J Leadbetter <j@jleadbetter.com>
+Affero GPL v3
+"""
+
+import random
+from unittest import TestCase
+
+from common.utils.cursors import (
+    CursorError,
+    decode_cursor,
+    encode_cursor,
+    make_page,
+    paginate,
+)
+
+
+class TestCursors(TestCase):
+    """
+    Tests for common.utils.cursors
+    """
+
+    def test_encode_decode(self):
+        cursor = encode_cursor('words', ['nl', 'één/twee?'])
+        self.assertRegex(cursor, r'^[A-Za-z0-9_=-]+$')
+        self.assertEqual(('nl', 'één/twee?'), decode_cursor('words', cursor, 2))
+
+    def test_decode_invalid(self):
+        for cursor in ['', 'not a cursor', encode_cursor('words', [])[:-3], None]:
+            with self.subTest(cursor=cursor):
+                with self.assertRaises(CursorError):
+                    decode_cursor('words', cursor)
+
+    def test_decode_other_list(self):
+        cursor = encode_cursor('users', ['alice'])
+        with self.assertRaises(CursorError):
+            decode_cursor('words', cursor)
+        with self.assertRaises(CursorError):
+            decode_cursor('users', cursor, 2)
+
+    def test_make_page(self):
+        page = make_page([1, 2, 3], 2, 'numbers', lambda x: [x])
+        self.assertEqual([1, 2], page.items)
+        self.assertEqual(('2',), decode_cursor('numbers', page.next_cursor))
+
+        page = make_page([1, 2], 2, 'numbers', lambda x: [x])
+        self.assertEqual([1, 2], page.items)
+        self.assertIsNone(page.next_cursor)
+
+    def test_make_page_invalid_limit(self):
+        for limit in [0, -1]:
+            with self.subTest(limit=limit):
+                with self.assertRaises(ValueError):
+                    make_page([1, 2, 3], limit, 'numbers', lambda x: [x])
+
+    def test_paginate_invalid_limit(self):
+        for limit in [0, -1, None]:
+            with self.subTest(limit=limit):
+                with self.assertRaises(ValueError):
+                    paginate([1, 2, 3], lambda x: (x,), 'numbers', None, limit)
+
+    def test_paginate(self):
+        items = [f'item{i:03}' for i in range(250)]
+        shuffled = random.sample(items, len(items))
+
+        returned = []
+        cursor = None
+        while True:
+            page = paginate(shuffled, lambda x: (x,), 'items', cursor, 100)
+            returned.extend(page.items)
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+
+        self.assertEqual(items, returned)
@@ -10,7 +10,7 @@ from unittest import TestCase
 
 from common.models.documents import DocumentDB
 from common.stores.config import ConfigStore
-from common.utils.files import get_project_dir, get_upload_dir
+from common.utils.files import get_project_dir, get_upload_dir, read_upload_dir
 from common.utils.singleton import Singleton
 
 
@@ -51,3 +51,28 @@ class TestGetUploadDir(TestCase):
         expected_path = TEST_DIR.parent / config.get('common', 'UploadDir')
         returned_path = get_upload_dir()
         self.assertEqual(expected_path, returned_path)
+
+
+class TestReadUploadDir(TestCase):
+    """
+    Tests for common.utils.files.read_upload_dir
+    """
+
+    def setUp(self):
+        Singleton.destroy(ConfigStore)
+
+    def tearDown(self):
+        Singleton.destroy(ConfigStore)
+
+    def test_read_absolute_path(self):
+        self.assertEqual(Path('/tmp/foo'), read_upload_dir(TEST_CONFIG, 'test'))
+
+    def test_read_from_relative_path(self):
+        # Uses the DefaultConfig, dev.django
+        expected_path = TEST_DIR.parent / 'data' / 'uploads'
+        self.assertEqual(expected_path, read_upload_dir(TEST_CONFIG))
+
+    def test_read_does_not_create_config_store(self):
+        read_upload_dir(TEST_CONFIG)
+        config = ConfigStore(TEST_CONFIG, 'dev.in_memory')
+        self.assertEqual('dev.in_memory', config.subsection)
@@ -0,0 +1,156 @@
+"""
+Copyright (C) J Leadbetter <j@jleadbetter.com>
+Affero GPL v3
+"""
+
+import os
+import sys
+import tempfile
+from contextlib import nullcontext
+from pathlib import Path
+from unittest import TestCase, mock
+
+from common.utils import profiler
+from common.utils.profiler import (
+    PROFILE_ENV_VAR,
+    PROFILE_FLAG,
+    StartupProfiler,
+    enable_from_env,
+    get_report_path,
+    measure,
+)
+
+
+class TestStartupProfiler(TestCase):
+    """
+    Tests for common.utils.profiler.StartupProfiler
+    """
+
+    def setUp(self):
+        self.profiler = StartupProfiler()
+        self.tmpdir = tempfile.TemporaryDirectory()
+        sys.path.insert(0, self.tmpdir.name)
+
+    def tearDown(self):
+        self.profiler.disable()
+        sys.path.remove(self.tmpdir.name)
+        for name in ['profiled_outer', 'profiled_inner']:
+            sys.modules.pop(name, None)
+        self.tmpdir.cleanup()
+
+    def _write_module(self, name: str, code: str):
+        (Path(self.tmpdir.name) / f'{name}.py').write_text(code)
+
+    def test_measure(self):
+        with self.profiler.measure('adapter', 'fooport'):
+            pass
+
+        self.assertEqual(1, len(self.profiler.steps))
+        category, name, seconds = self.profiler.steps[0]
+        self.assertEqual(('adapter', 'fooport'), (category, name))
+        self.assertTrue(seconds >= 0)
+
+    def test_time_imports(self):
+        self._write_module('profiled_inner', 'import time\ntime.sleep(0.05)\n')
+        self._write_module('profiled_outer', 'import profiled_inner\n')
+
+        self.profiler.enable()
+        import profiled_outer
+
+        outer_total, outer_self = self.profiler.imports['profiled_outer']
+        inner_total, inner_self = self.profiler.imports['profiled_inner']
+        self.assertTrue(inner_total >= 0.05)
+        self.assertTrue(outer_total >= inner_total)
+        # The sleep belongs to the inner module
+        self.assertTrue(outer_self < 0.05)
+
+    def test_imported_module_keeps_original_loader(self):
+        self._write_module('profiled_inner', '')
+
+        self.profiler.enable()
+        import profiled_inner
+
+        self.assertNotEqual(
+            '_TimedLoader',
+            type(profiled_inner.__loader__).__name__,
+        )
+        self.assertEqual(profiled_inner.__loader__, profiled_inner.__spec__.loader)
+
+    def test_disable(self):
+        self.profiler.enable()
+        self.profiler.disable()
+        self._write_module('profiled_inner', '')
+        import profiled_inner
+        self.assertEqual({}, self.profiler.imports)
+
+    def test_report_is_sorted(self):
+        self.profiler.steps = [
+            ('store', 'fast', 0.001),
+            ('store', 'slow', 0.5),
+        ]
+        self.profiler.imports = {
+            'fast_module': (0.002, 0.002),
+            'slow_module': (0.3, 0.1),
+        }
+
+        report = self.profiler.report()
+        self.assertTrue(report.index('slow') < report.index('fast'))
+        self.assertTrue(report.index('slow_module') < report.index('fast_module'))
+
+    def test_write_report(self):
+        self.profiler.steps = [('store', 'datastore', 0.1)]
+        report_file = Path(self.tmpdir.name) / 'report.txt'
+        self.profiler.write_report(report_file)
+        self.assertIn('datastore', report_file.read_text())
+
+
+class TestProfilerFunctions(TestCase):
+    """
+    Tests for the module-level functions in common.utils.profiler
+    """
+
+    def tearDown(self):
+        profiler.get_profiler().disable()
+        profiler.get_profiler().clear()
+
+    def test_measure_disabled(self):
+        self.assertIsInstance(measure('store', 'foo'), nullcontext)
+
+    def test_measure_enabled(self):
+        profiler.get_profiler().enable()
+        with measure('store', 'foo'):
+            pass
+        self.assertEqual('foo', profiler.get_profiler().steps[0][1])
+
+    def test_enable_from_env_flag(self):
+        argv = ['main.py', PROFILE_FLAG]
+        with mock.patch.dict(os.environ, {}, clear=True):
+            self.assertTrue(enable_from_env(argv))
+        self.assertEqual(['main.py'], argv)
+
+    def test_enable_from_env_var(self):
+        with mock.patch.dict(os.environ, {PROFILE_ENV_VAR: '1'}):
+            self.assertTrue(enable_from_env(['main.py']))
+
+    def test_enable_from_env_var_path(self):
+        with mock.patch.dict(os.environ, {PROFILE_ENV_VAR: 'report.txt'}):
+            self.assertTrue(enable_from_env(['main.py']))
+
+    def test_enable_from_env_off(self):
+        with mock.patch.dict(os.environ, {}, clear=True):
+            self.assertFalse(enable_from_env(['main.py']))
+
+    def test_enable_from_env_var_false(self):
+        for value in ['0', 'false', 'False', 'no', 'off', '']:
+            with self.subTest(value=value):
+                with mock.patch.dict(os.environ, {PROFILE_ENV_VAR: value}):
+                    self.assertFalse(enable_from_env(['main.py']))
+
+    def test_get_report_path(self):
+        with mock.patch.dict(os.environ, {PROFILE_ENV_VAR: 'yes'}):
+            self.assertEqual(Path('foo.txt'), get_report_path('foo.txt'))
+        with mock.patch.dict(os.environ, {PROFILE_ENV_VAR: '/tmp/report.txt'}):
+            self.assertEqual(Path('/tmp/report.txt'), get_report_path('foo.txt'))
+        for value in ['0', 'false', '']:
+            with mock.patch.dict(os.environ, {PROFILE_ENV_VAR: value}):
+                self.assertEqual(Path('foo.txt'), get_report_path('foo.txt'))
@@ -0,0 +1,230 @@
+"""
+Copyright (C) J Leadbetter <j@jleadbetter.com>
+Affero GPL v3
+"""
+
+import io
+import tempfile
+import uuid
+from pathlib import Path
+from unittest import TestCase, mock
+
+from common.models.documents import DocumentDB
+from common.ports.documents import is_attr_line
+from common.utils.files import get_project_dir
+from common.utils.segmenter import (
+    SegmentRules,
+    chunk_ranges,
+    get_rules,
+    register_rules,
+    segment_file,
+    segment_stream,
+    split_sentences,
+)
+
+
+TEST_DATA_DIR = get_project_dir() / 'scripts' / 'data'
+
+TEXT = '''\
+:Title: Roodkapje
+:Author: Grimm
+
+Er was eens een meisje.
+
+Ze had een rood kapje. Iedereen hield van haar.
+'''
+
+
+def make_document(language_code='nl'):
+    return DocumentDB(
+        user_id=uuid.uuid4(),
+        display_name='Foo',
+        language_code=language_code,
+    )
+
+
+class TestSplitSentences(TestCase):
+    """
+    Tests for common.utils.segmenter.split_sentences
+    """
+
+    def test_split(self):
+        self.assertEqual(
+            ['Er was eens een meisje.', 'Waar ging ze heen?', 'Naar oma!'],
+            split_sentences('Er was eens een meisje. Waar ging ze heen? Naar oma!'),
+        )
+
+    def test_no_end(self):
+        self.assertEqual(['Roodkapje'], split_sentences('  Roodkapje '))
+        self.assertEqual([], split_sentences(''))
+
+    def test_ellipsis_and_numbers(self):
+        self.assertEqual(
+            ['Het kost 3.50 euro...', 'Echt waar…', 'Ja.'],
+            split_sentences('Het kost 3.50 euro... Echt waar… Ja.'),
+        )
+
+    def test_closing_quotes(self):
+        self.assertEqual(
+            ['Sie sagte: "Ich komme."', 'Dann ging sie.'],
+            split_sentences('Sie sagte: "Ich komme." Dann ging sie.'),
+        )
+        self.assertEqual(
+            ['"Ach!" rief das Mädchen.'],
+            split_sentences('"Ach!" rief das Mädchen.'),
+        )
+        self.assertEqual(
+            ['„Wer bist du?“', '„Ich bin der Wolf.“'],
+            split_sentences('„Wer bist du?“ „Ich bin der Wolf.“'),
+        )
+
+    def test_stray_closing_quote(self):
+        self.assertEqual(
+            ['Hij zei: "Dag.', 'Tot morgen."'],
+            split_sentences('Hij zei: "Dag. Tot morgen. "'),
+        )
+
+    def test_initials(self):
+        self.assertEqual(
+            ['J. Grimm schreef het.', 'W. Grimm ook.'],
+            split_sentences('J. Grimm schreef het. W. Grimm ook.'),
+        )
+
+    def test_language_rules(self):
+        text = 'Er kam am 3. Mai zu Dr. Müller, z.B. um Geld zu leihen. Gut.'
+        self.assertEqual(
+            [
+                'Er kam am 3. Mai zu Dr. Müller, z.B. um Geld zu leihen.',
+                'Gut.',
+            ],
+            split_sentences(text, get_rules('de')),
+        )
+        self.assertEqual(
+            ['Er kam am 3.', 'Mai zu Dr.', 'Müller, z.B. um Geld zu leihen.', 'Gut.'],
+            split_sentences(text),
+        )
+
+
+class TestRules(TestCase):
+    """
+    Tests for common.utils.segmenter.get_rules and register_rules
+    """
+
+    def test_get_rules_unknown_language(self):
+        rules = get_rules('zz')
+        self.assertTrue(rules.is_abbreviation('J'))
+        self.assertFalse(rules.is_abbreviation('Dr'))
+
+    def test_register_rules(self):
+        rules = SegmentRules(abbreviations=['Sr.'])
+        with mock.patch.dict('common.utils.segmenter._RULES'):
+            register_rules('zz', rules)
+            self.assertEqual(rules, get_rules('zz'))
+            self.assertEqual(
+                ['Sr. Pérez llegó.'],
+                split_sentences('Sr. Pérez llegó.', get_rules('zz')),
+            )
+        self.assertNotEqual(rules, get_rules('zz'))
+
+
+class TestSegmentStream(TestCase):
+    """
+    Tests for common.utils.segmenter.segment_stream
+    """
+
+    def test_segment_stream(self):
+        document = make_document()
+        stream = io.BytesIO(TEXT.encode('utf-8'))
+        sentences = list(segment_stream(stream, document))
+
+        self.assertEqual(
+            [
+                'Er was eens een meisje.',
+                'Ze had een rood kapje.',
+                'Iedereen hield van haar.',
+            ],
+            [sentence.text for sentence in sentences],
+        )
+        self.assertEqual([0, 1, 2], [sentence.ordering for sentence in sentences])
+        for sentence in sentences:
+            self.assertEqual(document.user_id, sentence.user_id)
+            self.assertEqual('nl', sentence.language_code)
+        self.assertFalse(stream.closed)
+
+    def test_colons_after_header_are_text(self):
+        stream = io.BytesIO(b'Hallo.\r\n:Niet: een attribuut\r\n')
+        sentences = list(segment_stream(stream, make_document(), start=5))
+        self.assertEqual(
+            ['Hallo.', ':Niet: een attribuut'],
+            [sentence.text for sentence in sentences],
+        )
+        self.assertEqual([5, 6], [sentence.ordering for sentence in sentences])
+
+    def test_header_matches_parsed_attributes(self):
+        data = ':Title: Roodkapje\n:-) Er was eens een meisje.\n'.encode('utf-8')
+        sentences = list(segment_stream(io.BytesIO(data), make_document()))
+        self.assertEqual(
+            [':-) Er was eens een meisje.'],
+            [sentence.text for sentence in sentences],
+        )
+        # The same check that decides what the document's attributes are
+        self.assertTrue(is_attr_line(':Title: Roodkapje\n'))
+        self.assertFalse(is_attr_line(':-) Er was eens een meisje.\n'))
+
+    def test_progress(self):
+        data = TEXT.encode('utf-8')
+        progress = []
+        stream = io.BytesIO(data)
+        list(segment_stream(stream, make_document(), on_progress=progress.append))
+        self.assertEqual(3, len(progress))
+        self.assertEqual(len(data), progress[-1])
+
+    def test_not_utf8(self):
+        stream = io.BytesIO('Ça va?'.encode('latin-1'))
+        with self.assertRaises(UnicodeDecodeError):
+            list(segment_stream(stream, make_document()))
+
+
+class TestSegmentFile(TestCase):
+    """
+    Tests for common.utils.segmenter.segment_file
+    """
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        # Every story in every language, as one long document
+        stories = sorted(TEST_DATA_DIR.glob('*/*.txt'))
+        self.path = Path(self.tmpdir.name) / 'stories.txt'
+        self.path.write_bytes(
+            b'\n'.join(story.read_bytes() for story in stories),
+        )
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_chunk_ranges(self):
+        data = self.path.read_bytes()
+        ranges = chunk_ranges(self.path, chunk_size=1000)
+
+        self.assertGreater(len(ranges), 10)
+        self.assertEqual(0, ranges[0][0])
+        self.assertEqual(len(data), ranges[-1][1])
+        for (_, end), (start, _) in zip(ranges, ranges[1:]):
+            self.assertEqual(end, start)
+            self.assertEqual(b'\n', data[end - 1:end])
+
+    def test_same_as_segment_stream(self):
+        document = make_document('de')
+        with self.path.open('rb') as stream:
+            expected = list(segment_stream(stream, document))
+
+        progress = []
+        sentences = list(segment_file(
+            self.path,
+            document,
+            workers=2,
+            chunk_size=1000,
+            on_progress=progress.append,
+        ))
+        self.assertEqual(expected, sentences)
+        self.assertEqual(self.path.stat().st_size, progress[-1])
@@ -3,6 +3,9 @@ Copyright (C) J Leadbetter <j@jleadbetter.com>
 Affero GPL v3
 """
 
+import asyncio
+import threading
+import time
 from unittest import TestCase
 
 from common.utils.singleton import Singleton
@@ -81,3 +84,97 @@ class TestSingleton(TestCase):
         bar3 = Bar('test3')
         self.assertEqual(6, foo3.foo)
         self.assertEqual('test3', bar3.bar)
+
+    def test_destroy_all_while_creating(self):
+        class Slow(metaclass=Singleton):
+            pass
+
+        instances = []
+        thread = threading.Thread(target=lambda: instances.append(Slow()))
+        try:
+            with Singleton._lock:
+                # The thread finds no instance, then waits for the lock
+                thread.start()
+                time.sleep(0.05)
+                Singleton.destroy_all()
+            thread.join()
+
+            # The instance made after destroy_all must not be lost
+            self.assertIs(instances[0], Slow())
+        finally:
+            Singleton.destroy(Slow)
+
+    def test_concurrent_creation(self):
+        created = []
+
+        class Slow(metaclass=Singleton):
+            def __init__(self):
+                created.append(self)
+                time.sleep(0.05)
+
+        try:
+            instances = []
+            threads = [
+                threading.Thread(target=lambda: instances.append(Slow()))
+                for _ in range(8)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            self.assertEqual(1, len(created))
+            self.assertEqual({id(created[0])}, {id(x) for x in instances})
+        finally:
+            Singleton.destroy(Slow)
+
+    def test_nested_creation(self):
+        class Outer(metaclass=Singleton):
+            def __init__(self):
+                self.foo = Foo(7)
+
+        try:
+            outer = Outer()
+            self.assertEqual(Foo(8), outer.foo)
+        finally:
+            Singleton.destroy(Outer)
+
+    def test_scope(self):
+        foo = Foo(1)
+        with Singleton.scope() as instances:
+            scoped_foo = Foo(2)
+            self.assertNotEqual(foo, scoped_foo)
+            self.assertEqual(2, scoped_foo.foo)
+            self.assertEqual({Foo: scoped_foo}, instances)
+
+        self.assertEqual(foo, Foo(3))
+
+    def test_scope_reentered(self):
+        tenant_instances = {}
+        with Singleton.scope(tenant_instances):
+            foo = Foo(1)
+        with Singleton.scope(tenant_instances):
+            self.assertEqual(foo, Foo(2))
+
+    def test_scope_destroy_all(self):
+        foo = Foo(1)
+        with Singleton.scope() as instances:
+            Foo(2)
+            Singleton.destroy_all()
+            self.assertEqual({}, instances)
+
+        # The process-wide registry is untouched
+        self.assertEqual(foo, Foo(3))
+
+    def test_scope_in_asyncio_tasks(self):
+        async def make_foo(num):
+            with Singleton.scope():
+                await asyncio.sleep(0)
+                return Foo(num)
+
+        async def main():
+            return await asyncio.gather(make_foo(1), make_foo(2))
+
+        foo1, foo2 = asyncio.run(main())
+        self.assertEqual(1, foo1.foo)
+        self.assertEqual(2, foo2.foo)
@@ -0,0 +1,137 @@
+"""
+Copyright (C) J Leadbetter <j@jleadbetter.com>
+Affero GPL v3
+"""
+
+import uuid
+from unittest import TestCase
+
+from common.models.sentences import SentenceDB
+from common.utils.tokenizer import (
+    BatchTokenizer,
+    TokenizerError,
+    tokenize,
+)
+
+
+class TestTokenize(TestCase):
+    """
+    Tests for common.utils.tokenizer.tokenize
+    """
+
+    def test_tokenize(self):
+        self.assertEqual(
+            ['Zo', "n", 'meisje', 'Dat', 'is', "Roodkapje's", 'mand'],
+            tokenize("Zo 'n meisje! \"Dat is Roodkapje's mand.\""),
+        )
+
+    def test_tokenize_hyphens_and_numbers(self):
+        self.assertEqual(
+            ['Het', 'well-known', 'huis', 'nr', '3'],
+            tokenize('Het well-known huis -- nr. 3'),
+        )
+
+    def test_tokenize_no_words(self):
+        self.assertEqual([], tokenize('... !?'))
+
+
+class TestBatchTokenizer(TestCase):
+    """
+    Tests for common.utils.tokenizer.BatchTokenizer
+    """
+
+    def setUp(self):
+        self.user_id = uuid.uuid4()
+
+    def make_sentence(self, text, **kwargs):
+        return SentenceDB(
+            **{
+                'id': uuid.uuid4(),
+                'user_id': self.user_id,
+                'language_code': 'nl',
+                'text': text,
+                **kwargs,
+            },
+        )
+
+    def test_tokenize(self):
+        sentences = [
+            self.make_sentence('De wolf at oma op.'),
+            self.make_sentence('Toen at de Wolf Roodkapje op.'),
+        ]
+        batch = BatchTokenizer(self.user_id, 'nl').tokenize(sentences)
+
+        words = batch.word_models()
+        self.assertEqual(
+            ['de', 'wolf', 'at', 'oma', 'op', 'toen', 'roodkapje'],
+            [word.text for word in words],
+        )
+        for word in words:
+            self.assertEqual(self.user_id, word.user_id)
+            self.assertEqual('nl', word.language_code)
+
+        display_text = batch.display_text_models()
+        self.assertEqual(
+            [
+                'De', 'wolf', 'at', 'oma', 'op',
+                'Toen', 'at', 'de', 'Wolf', 'Roodkapje', 'op',
+            ],
+            [item.text for item in display_text],
+        )
+        self.assertEqual(
+            [0, 1, 2, 3, 4, 0, 1, 2, 3, 4, 5],
+            [item.ordering for item in display_text],
+        )
+        self.assertEqual(
+            [sentences[0].id] * 5 + [sentences[1].id] * 6,
+            [item.sentence_id for item in display_text],
+        )
+
+        word_ids = {word.text: word.id for word in words}
+        for item in display_text:
+            self.assertEqual(word_ids[item.text.lower()], item.word_id)
+            self.assertIsNone(item.id)
+
+    def test_tokenize_interns_words(self):
+        batch = BatchTokenizer(self.user_id, 'nl').tokenize([
+            self.make_sentence('Wolf, wolf!'),
+            self.make_sentence('WOLF.'),
+        ])
+        forms = [row[-1] for row in batch.display_text]
+        self.assertEqual(['Wolf', 'wolf', 'WOLF'], forms)
+        # The display text of the second 'wolf' is the word's own string
+        self.assertIs(batch.words[0][-1], forms[1])
+
+    def test_tokenize_looks_up_once_per_batch(self):
+        existing_id = uuid.uuid4()
+        lookups = []
+
+        def _lookup(words):
+            lookups.append(words)
+            return {'wolf': existing_id} if 'wolf' in words else {}
+
+        tokenizer = BatchTokenizer(self.user_id, 'nl', _lookup)
+        batch1 = tokenizer.tokenize([
+            self.make_sentence('De wolf.'),
+            self.make_sentence('De oma.'),
+        ])
+        batch2 = tokenizer.tokenize([self.make_sentence('Oma en de wolf.')])
+        batch3 = tokenizer.tokenize([self.make_sentence('De wolf!')])
+
+        self.assertEqual([{'de', 'wolf', 'oma'}, {'en'}], lookups)
+        self.assertEqual(['de', 'oma'], [row[-1] for row in batch1.words])
+        self.assertEqual(['en'], [row[-1] for row in batch2.words])
+        self.assertEqual([], batch3.words)
+        self.assertEqual(existing_id, batch3.display_text[1][2])
+
+    def test_tokenize_unsaved_sentence(self):
+        with self.assertRaises(TokenizerError):
+            BatchTokenizer(self.user_id, 'nl').tokenize([
+                self.make_sentence('Hallo.', id=None),
+            ])
+
+    def test_tokenize_wrong_language(self):
+        with self.assertRaises(TokenizerError):
+            BatchTokenizer(self.user_id, 'nl').tokenize([
+                self.make_sentence('Hallo.', language_code='de'),
+            ])
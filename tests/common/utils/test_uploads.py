@@ -0,0 +1,319 @@
+"""
+Copyright (C) J Leadbetter <j@jleadbetter.com>
+Affero GPL v3
+"""
+
+import io
+import tempfile
+import threading
+from pathlib import Path
+from unittest import TestCase, mock
+
+from common.models.documents import DocumentDB
+from common.stores.app import AppStore
+from common.utils.segmenter import segment_file
+from common.utils.singleton import Singleton
+from common.utils.uploads import (
+    READ_CHUNK_SIZE,
+    UploadError,
+    UploadJob,
+    UploadPipeline,
+    UploadQueue,
+    UploadStage,
+    UploadStatus,
+)
+from tests.utils.users import create_user_db
+
+
+TEXT = '''\
+:Title: Roodkapje
+:Author: Grimm
+
+Er was eens een meisje.
+
+Ze had een rood kapje.
+'''
+
+
+class UploadTestCase(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        AppStore.destroy_all()
+        super().setUpClass()
+
+    def setUp(self):
+        apps = AppStore(subsection='dev.in_memory')
+        self.document_port = apps.get('AdapterStore').get('DocumentDBPort')
+        self.user = create_user_db()
+
+        self.tmpdir = tempfile.TemporaryDirectory()
+        upload_dir_patch = mock.patch(
+            'common.utils.uploads.get_upload_dir',
+            return_value=Path(self.tmpdir.name),
+        )
+        upload_dir_patch.start()
+        self.addCleanup(upload_dir_patch.stop)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+        AppStore.destroy_all()
+
+    @property
+    def spooled_files(self):
+        return list(Path(self.tmpdir.name).glob('**/*.txt'))
+
+    def make_job(self, data: bytes=TEXT.encode('utf-8'), name='Roodkapje'):
+        document = DocumentDB(
+            user_id=self.user.id,
+            display_name=name,
+            language_code='nl',
+        )
+        return UploadJob(document, 'roodkapje.txt', io.BytesIO(data))
+
+
+class TestUploadPipeline(UploadTestCase):
+    """
+    Tests for common.utils.uploads.UploadPipeline
+    """
+
+    def test_run(self):
+        job = self.make_job()
+        document = UploadPipeline().run(job)
+
+        self.assertEqual(UploadStatus.done, job.status)
+        self.assertEqual(1.0, job.progress)
+        self.assertEqual(document, job.wait(0))
+        self.assertEqual({'Title': 'Roodkapje', 'Author': 'Grimm'}, document.attrs)
+        self.assertEqual(2, job.sentence_count)
+
+        sentences = self.document_port.get_sentences(document.id, self.user.id)
+        self.assertEqual(
+            ['Er was eens een meisje.', 'Ze had een rood kapje.'],
+            [sentence.text for sentence in sentences],
+        )
+
+    def test_run_created(self):
+        job = self.make_job()
+        UploadPipeline().run(job)
+        self.assertTrue(job.created)
+
+    def test_run_fills_in_existing_document(self):
+        existing = self.document_port.create_or_update(DocumentDB(
+            user_id=self.user.id,
+            display_name='Roodkapje',
+            language_code='nl',
+        ))
+
+        job = self.make_job()
+        document = UploadPipeline().run(job)
+        self.assertFalse(job.created)
+        self.assertEqual(existing.id, document.id)
+        self.assertEqual(
+            2,
+            self.document_port.count_sentences(existing.id, self.user.id),
+        )
+
+    def test_run_reports_every_stage(self):
+        job = self.make_job()
+        stages = []
+        original_report = job.report
+
+        def _report(stage, progress):
+            stages.append(stage)
+            original_report(stage, progress)
+
+        with mock.patch.object(job, 'report', _report):
+            UploadPipeline().run(job)
+
+        self.assertEqual(list(UploadStage), list(dict.fromkeys(stages)))
+
+    def test_run_not_utf8(self):
+        job = self.make_job(data='Ça va?'.encode('latin-1'))
+        self.assertIsNone(UploadPipeline().run(job))
+        self.assertEqual(UploadStatus.failed, job.status)
+        with self.assertRaises(UploadError):
+            job.wait(0)
+
+    def test_run_streams_large_files(self):
+        # Multi-byte characters will straddle the chunk boundaries
+        line = 'Één zin met een lange ij, ĳ, en nog wat tekst.'
+        count = 3 * READ_CHUNK_SIZE // len(line.encode('utf-8'))
+        data = ('\r\n'.join([':Title: Groot'] + [line] * count)).encode('utf-8')
+
+        job = self.make_job(data=data)
+        document = UploadPipeline().run(job)
+
+        self.assertEqual(UploadStatus.done, job.status)
+        self.assertEqual({'Title': 'Groot'}, document.attrs)
+        self.assertEqual(count, job.sentence_count)
+        sentences = self.document_port.get_sentences(
+            document.id,
+            self.user.id,
+            start=count - 1,
+        )
+        self.assertEqual([line], [sentence.text for sentence in sentences])
+
+    def test_run_large_file_in_processes(self):
+        job = self.make_job()
+        with (
+            mock.patch('common.utils.uploads.PARALLEL_SEGMENT_SIZE', 0),
+            mock.patch('common.utils.uploads.os.cpu_count', return_value=2),
+            mock.patch(
+                'common.utils.uploads.segment_file',
+                wraps=segment_file,
+            ) as mock_segment_file,
+        ):
+            document = UploadPipeline().run(job)
+
+        mock_segment_file.assert_called_once()
+        sentences = self.document_port.get_sentences(document.id, self.user.id)
+        self.assertEqual(
+            ['Er was eens een meisje.', 'Ze had een rood kapje.'],
+            [sentence.text for sentence in sentences],
+        )
+        self.assertEqual([0, 1], [sentence.ordering for sentence in sentences])
+
+    def test_run_removes_spooled_file(self):
+        job = self.make_job()
+        UploadPipeline().run(job)
+        self.assertFalse(job.path.exists())
+        self.assertEqual([], self.spooled_files)
+
+        job = self.make_job(data='Ça va?'.encode('latin-1'))
+        UploadPipeline().run(job)
+        self.assertEqual([], self.spooled_files)
+
+    def test_run_too_large(self):
+        job = self.make_job()
+        with mock.patch('common.utils.uploads.MAX_UPLOAD_SIZE', 10):
+            UploadPipeline().run(job)
+        self.assertEqual(UploadStatus.failed, job.status)
+        self.assertIn('larger than', job.error)
+        self.assertEqual([], self.document_port.get_all(self.user.id))
+
+    def test_run_not_utf8_creates_nothing(self):
+        data = TEXT.encode('utf-8') + 'Ça va?'.encode('latin-1')
+        UploadPipeline().run(self.make_job(data=data))
+        self.assertEqual([], self.document_port.get_all(self.user.id))
+
+    def test_run_already_uploaded(self):
+        UploadPipeline().run(self.make_job())
+
+        job = self.make_job()
+        UploadPipeline().run(job)
+        self.assertEqual(UploadStatus.failed, job.status)
+        self.assertIn('already uploaded', job.error)
+
+    def test_run_already_uploaded_changes_nothing(self):
+        first = UploadPipeline().run(self.make_job())
+
+        data = TEXT.replace('Grimm', 'Perrault').encode('utf-8')
+        UploadPipeline().run(self.make_job(data=data))
+
+        document = self.document_port.get(first.id, self.user.id)
+        self.assertEqual({'Title': 'Roodkapje', 'Author': 'Grimm'}, document.attrs)
+        self.assertEqual(
+            2,
+            self.document_port.count_sentences(first.id, self.user.id),
+        )
+
+    def test_run_persist_fails_deletes_new_document(self):
+        job = self.make_job()
+        original_add_sentences = self.document_port.add_sentences
+        calls = []
+
+        def _add_sentences(*args):
+            calls.append(args)
+            if len(calls) > 1:
+                raise RuntimeError('Database went away')
+            return original_add_sentences(*args)
+
+        with (
+            mock.patch('common.utils.uploads.PERSIST_BATCH_SIZE', 1),
+            mock.patch.object(
+                self.document_port,
+                'add_sentences',
+                _add_sentences,
+            ),
+        ):
+            self.assertIsNone(UploadPipeline().run(job))
+
+        self.assertEqual(UploadStatus.failed, job.status)
+        self.assertEqual(2, len(calls))
+        self.assertEqual([], self.document_port.get_all(self.user.id))
+        document_id = calls[0][0]
+        self.assertEqual(
+            0,
+            self.document_port.count_sentences(document_id, self.user.id),
+        )
+
+    def test_run_persist_fails_restores_existing_document(self):
+        existing = self.document_port.create_or_update(DocumentDB(
+            user_id=self.user.id,
+            display_name='Roodkapje',
+            language_code='nl',
+            attrs={'Title': 'Old title'},
+        ))
+
+        job = self.make_job()
+        with mock.patch.object(
+            self.document_port,
+            'add_sentences',
+            side_effect=RuntimeError('Database went away'),
+        ):
+            self.assertIsNone(UploadPipeline().run(job))
+
+        self.assertEqual(UploadStatus.failed, job.status)
+        document = self.document_port.get(existing.id, self.user.id)
+        self.assertEqual({'Title': 'Old title'}, document.attrs)
+
+
+class TestUploadQueue(UploadTestCase):
+    """
+    Tests for common.utils.uploads.UploadQueue
+    """
+
+    def tearDown(self):
+        UploadQueue().shutdown()
+        Singleton.destroy(UploadQueue)
+        super().tearDown()
+
+    def test_is_singleton(self):
+        self.assertEqual(UploadQueue(workers=1), UploadQueue(workers=3))
+        self.assertEqual(1, UploadQueue().workers)
+
+    def test_submit_runs_in_background(self):
+        thread_names = []
+        pipeline = UploadPipeline()
+        original_run = pipeline.run
+
+        def _run(job):
+            thread_names.append(threading.current_thread().name)
+            return original_run(job)
+
+        pipeline.run = _run
+        job = UploadQueue().submit(self.make_job(), pipeline)
+        document = job.wait(5)
+
+        self.assertTrue(thread_names[0].startswith('upload'))
+        self.assertEqual(
+            2,
+            self.document_port.count_sentences(document.id, self.user.id),
+        )
+
+    def test_submit_keeps_singleton_scope(self):
+        with Singleton.scope():
+            apps = AppStore(subsection='dev.in_memory')
+            scoped_port = apps.get('AdapterStore').get('DocumentDBPort')
+            user = create_user_db()
+            document = DocumentDB(
+                user_id=user.id,
+                display_name='Scoped',
+                language_code='nl',
+            )
+            job = UploadJob(document, 'scoped.txt', io.BytesIO(b'Hallo.'))
+            UploadQueue().submit(job).wait(5)
+
+            self.assertEqual(1, len(scoped_port.get_all(user.id)))
+        self.assertEqual([], self.document_port.get_all(user.id))
@@ -9,11 +9,13 @@ from unittest import TestCase, mock
 
 from nicegui.observables import ObservableDict
 
-from common.models.documents import DocumentDB, DocumentUI
+from common.models.documents import DocumentDB, DocumentUI, DocumentUISummary
 from common.stores.app import AppStore
 from common.utils.files import get_project_dir
 from frontend.controllers.documents import DocumentController
+from frontend.controllers.state import DocumentState
 from tests.utils.documents import create_document_db, make_document_ui
+from tests.utils.sentences import create_document_sentences
 from tests.utils.users import create_user_db, make_user_ui
 
 
@@ -21,6 +23,15 @@ DATA_DIR = get_project_dir() / 'scripts' / 'data' / 'en'
 DATA_FILE = DATA_DIR / 'Little-Red-Riding-Hood.txt'
 
 
+def make_client_storage(docs, current=None):
+    client = ObservableDict()
+    state = DocumentState(client)
+    state.reset(docs[0].user if docs else None, docs)
+    if current:
+        state.set_current(current)
+    return client
+
+
 class TestDocumentController(TestCase):
     """
     Tests for frontend.controllers.document.DocumentController
@@ -42,7 +53,7 @@ class TestDocumentController(TestCase):
     def tearDown(self):
         AppStore.destroy_all()
 
-    def test_create(self):
+    def test_start_and_finish_upload(self):
         userdb = create_user_db()
         user = self.userui_adapter.get(userdb)
 
@@ -66,14 +77,10 @@ class TestDocumentController(TestCase):
             )
             with mock.patch('frontend.controllers.documents.app') as mock_app:
                 mock_app.storage = mock.Mock()
-                mock_app.storage.client = ObservableDict()
-                mock_app.storage.client.update({
-                    'documents': {
-                        'current_document': None,
-                        'all_documents': [],
-                    },
-                })
-                self.controller.create(document_dict)
+                mock_app.storage.client = make_client_storage([])
+                job = self.controller.start_upload(document_dict)
+                job.wait(5)
+                self.controller.finish_upload(job, user)
                 returned_docui = self.controller.get_current_document()
                 for attr in ('user', 'displayName', 'language'):
                     expected = getattr(expected_docui, attr)
@@ -84,31 +91,54 @@ class TestDocumentController(TestCase):
         self.assertEqual('Test Create', returned_docdb.display_name)
         self.assertEqual('es', returned_docdb.language_code)
 
+    def test_finish_upload_existing_document_not_loaded(self):
+        userdb = create_user_db()
+        user = self.userui_adapter.get(userdb)
+        existing = self.backend_adapter.create_or_update(DocumentDB(
+            user_id=user.id,
+            display_name='Test Create',
+            language_code='es',
+        ))
+
+        with open(DATA_FILE, 'rb') as datafile:
+            mock_upload = mock.Mock()
+            mock_upload.name = 'foo.txt'
+            mock_upload.content = datafile
+            document_dict = {
+                'user': user,
+                'display_name': 'Test Create',
+                'language': 'Spanish',
+                'upload': mock_upload,
+            }
+
+            with mock.patch('frontend.controllers.documents.app') as mock_app:
+                mock_app.storage = mock.Mock()
+                # The client knows about the document, but hasn't loaded it
+                mock_app.storage.client = ObservableDict()
+                DocumentState(mock_app.storage.client).reset(
+                    user,
+                    languages={'es': 1},
+                )
+                job = self.controller.start_upload(document_dict)
+                job.wait(5)
+                returned_docui = self.controller.finish_upload(job, user)
+
+                self.assertEqual(existing.id, returned_docui.id)
+                self.assertEqual({'es': 1}, dict(self.controller.state.languages))
+
     def test_get_all(self):
         userui = make_user_ui()
         expected_docsui = [make_document_ui(user=userui) for i in range(3)]
         with mock.patch('frontend.controllers.documents.app') as mock_app:
             mock_app.storage = mock.Mock()
-            mock_app.storage.client = ObservableDict()
-            mock_app.storage.client.update({
-                'documents': {
-                    'current_document': None,
-                    'all_documents': [doc.model_dump() for doc in expected_docsui],
-                },
-            })
+            mock_app.storage.client = make_client_storage(expected_docsui)
             returned_docsui = self.controller.get_all()
             self.assertEqual(expected_docsui, returned_docsui)
 
     def test_get_all_no_documents(self):
         with mock.patch('frontend.controllers.documents.app') as mock_app:
             mock_app.storage = mock.Mock()
-            mock_app.storage.client = ObservableDict()
-            mock_app.storage.client.update({
-                'documents': {
-                    'current_document': None,
-                    'all_documents': [],
-                },
-            })
+            mock_app.storage.client = make_client_storage([])
             returned_docsui = self.controller.get_all()
             self.assertEqual([], returned_docsui)
 
@@ -116,38 +146,33 @@ class TestDocumentController(TestCase):
         expected_docui = make_document_ui()
         with mock.patch('frontend.controllers.documents.app') as mock_app:
             mock_app.storage = mock.Mock()
-            mock_app.storage.client = ObservableDict()
-            mock_app.storage.client.update({
-                'documents': {
-                    'current_document': expected_docui.model_dump(),
-                    'all_documents': [expected_docui.model_dump()],
-                },
-            })
+            mock_app.storage.client = make_client_storage(
+                [expected_docui],
+                current=expected_docui,
+            )
             returned_docui = self.controller.get_current_document()
             self.assertEqual(expected_docui, returned_docui)
 
     def test_get_current_document_no_document(self):
         with mock.patch('frontend.controllers.documents.app') as mock_app:
             mock_app.storage = mock.Mock()
-            mock_app.storage.client = ObservableDict()
-            mock_app.storage.client.update({
-                'documents': {
-                    'current_document': None,
-                    'all_documents': [],
-                },
-            })
+            mock_app.storage.client = make_client_storage([])
             returned_docui = self.controller.get_current_document()
             self.assertIsNone(returned_docui)
 
     def test_set(self):
         userdb = create_user_db()
         user = self.userui_adapter.get(userdb)
-        docdbs = [create_document_db(user_id=userdb.id) for i in range(3)]
-        docs = self.frontend_adapter.get_all(docdbs, user)
+        for code in ('de', 'de', 'fr'):
+            create_document_db(user_id=userdb.id, language_code=code)
 
+        # Documents are only loaded when a page is requested
         expected_data = {
-            'current_document': None,
-            'all_documents': [doc.model_dump() for doc in docs],
+            'user': user.model_dump(),
+            'order': [],
+            'records': {},
+            'current': None,
+            'languages': {'de': 2, 'fr': 1},
         }
         with mock.patch('frontend.controllers.documents.app') as mock_app:
             mock_app.storage = mock.Mock()
@@ -162,8 +187,11 @@ class TestDocumentController(TestCase):
         user = self.userui_adapter.get(userdb)
 
         expected_data = {
-            'current_document': None,
-            'all_documents': [],
+            'user': user.model_dump(),
+            'order': [],
+            'records': {},
+            'current': None,
+            'languages': {},
         }
         with mock.patch('frontend.controllers.documents.app') as mock_app:
             mock_app.storage = mock.Mock()
@@ -178,13 +206,213 @@ class TestDocumentController(TestCase):
 
         with mock.patch('frontend.controllers.documents.app') as mock_app:
             mock_app.storage = mock.Mock()
-            mock_app.storage.client = ObservableDict()
-            mock_app.storage.client.update({
-                'documents': {
-                    'current_document': None,
-                    'all_documents': [],
-                },
-            })
+            mock_app.storage.client = make_client_storage([])
             self.controller.set_current_document(document)
             returned = self.controller.get_current_document()
             self.assertEqual(document, returned)
+
+    def test_get_all_is_cached(self):
+        userui = make_user_ui()
+        docs = [make_document_ui(user=userui) for i in range(3)]
+        with mock.patch('frontend.controllers.documents.app') as mock_app:
+            mock_app.storage = mock.Mock()
+            mock_app.storage.client = make_client_storage(docs)
+
+            with mock.patch(
+                'frontend.controllers.state.DocumentUI',
+                wraps=DocumentUI,
+            ) as mock_docui:
+                self.controller.get_all()
+                self.controller.get_all()
+                self.controller.get_by_language()
+                self.controller.get(docs[0].id)
+                self.assertEqual(3, mock_docui.call_count)
+
+    def test_get(self):
+        docs = [make_document_ui() for i in range(3)]
+        with mock.patch('frontend.controllers.documents.app') as mock_app:
+            mock_app.storage = mock.Mock()
+            mock_app.storage.client = make_client_storage(docs)
+
+            self.assertEqual(docs[1], self.controller.get(docs[1].id))
+            self.assertIsNone(self.controller.get(uuid.uuid4()))
+
+    def test_get_by_language(self):
+        spanish = [make_document_ui(language='Spanish') for i in range(2)]
+        german = [make_document_ui(language='German')]
+        with mock.patch('frontend.controllers.documents.app') as mock_app:
+            mock_app.storage = mock.Mock()
+            mock_app.storage.client = make_client_storage(spanish + german)
+
+            self.assertEqual(
+                {'Spanish': spanish, 'German': german},
+                self.controller.get_by_language(),
+            )
+
+    def test_set_invalidates_cache(self):
+        userdb = create_user_db()
+        user = self.userui_adapter.get(userdb)
+        with mock.patch('frontend.controllers.documents.app') as mock_app:
+            mock_app.storage = mock.Mock()
+            mock_app.storage.client = make_client_storage(
+                [make_document_ui(user=user)],
+            )
+            self.assertEqual(1, len(self.controller.get_all()))
+
+            docdb = create_document_db(user_id=userdb.id, language_code='de')
+            self.controller.set(user)
+            self.assertEqual([], self.controller.get_all())
+
+            self.controller.load_document(docdb.id)
+            self.assertEqual(
+                [docdb.id],
+                [doc.id for doc in self.controller.get_all()],
+            )
+
+    def test_cache_notices_new_documents(self):
+        docs = [make_document_ui() for i in range(2)]
+        with mock.patch('frontend.controllers.documents.app') as mock_app:
+            mock_app.storage = mock.Mock()
+            mock_app.storage.client = make_client_storage(docs[:1])
+            self.assertEqual(1, len(self.controller.get_all()))
+
+            DocumentState(mock_app.storage.client).add(docs[1])
+            self.assertEqual(docs, self.controller.get_all())
+
+    def test_get_languages(self):
+        userdb = create_user_db()
+        user = self.userui_adapter.get(userdb)
+        for code in ('fr', 'de', 'de'):
+            create_document_db(user_id=userdb.id, language_code=code)
+
+        with mock.patch('frontend.controllers.documents.app') as mock_app:
+            mock_app.storage = mock.Mock()
+            mock_app.storage.client = ObservableDict()
+            self.controller.set(user)
+
+            self.assertEqual(
+                {'French': 1, 'German': 2},
+                self.controller.get_languages(),
+            )
+            self.assertTrue(self.controller.has_documents())
+
+    def test_has_documents_no_documents(self):
+        userdb = create_user_db()
+        user = self.userui_adapter.get(userdb)
+        with mock.patch('frontend.controllers.documents.app') as mock_app:
+            mock_app.storage = mock.Mock()
+            mock_app.storage.client = ObservableDict()
+            self.controller.set(user)
+
+            self.assertEqual({}, self.controller.get_languages())
+            self.assertFalse(self.controller.has_documents())
+
+    def test_get_page(self):
+        userdb = create_user_db()
+        user = self.userui_adapter.get(userdb)
+        docdbs = [
+            create_document_db(
+                user_id=userdb.id,
+                display_name=f'Document {i:02}',
+                language_code='de',
+            )
+            for i in range(5)
+        ]
+        create_document_db(user_id=userdb.id, language_code='fr')
+        expected = [
+            DocumentUISummary(docdb.id, docdb.display_name, 'German')
+            for docdb in docdbs
+        ]
+
+        with mock.patch('frontend.controllers.documents.app') as mock_app:
+            mock_app.storage = mock.Mock()
+            mock_app.storage.client = ObservableDict()
+            self.controller.set(user)
+
+            with mock.patch.object(self.controller, 'PAGE_SIZE', 2):
+                self.assertEqual(3, self.controller.count_pages('German'))
+                self.assertEqual(
+                    expected[2:4],
+                    self.controller.get_page('German', 2),
+                )
+                self.assertEqual(
+                    expected[4:],
+                    self.controller.get_page('German', 3),
+                )
+
+            # Pages are only for listing, so nothing is stored
+            self.assertEqual([], self.controller.get_all())
+
+    def test_get_page_keeps_cached_documents(self):
+        userdb = create_user_db()
+        user = self.userui_adapter.get(userdb)
+        docdb = create_document_db(user_id=userdb.id, language_code='de')
+
+        with mock.patch('frontend.controllers.documents.app') as mock_app:
+            mock_app.storage = mock.Mock()
+            mock_app.storage.client = ObservableDict()
+            self.controller.set(user)
+            self.controller.load_document(docdb.id)
+            cached = self.controller.get_all()
+
+            with mock.patch.object(
+                DocumentState,
+                'get_all',
+                side_effect=AssertionError('Views were rebuilt'),
+            ):
+                self.controller.get_page('German')
+                returned = self.controller.get_all()
+
+        self.assertIs(cached[0], returned[0])
+
+    def test_load_document(self):
+        userdb = create_user_db()
+        user = self.userui_adapter.get(userdb)
+        docdb = create_document_db(
+            user_id=userdb.id,
+            language_code='de',
+            attrs={'Title': 'Rotkäppchen'},
+        )
+
+        with mock.patch('frontend.controllers.documents.app') as mock_app:
+            mock_app.storage = mock.Mock()
+            mock_app.storage.client = ObservableDict()
+            self.controller.set(user)
+
+            summary = self.controller.get_page('German')[0]
+            document = self.controller.load_document(summary.id)
+            self.assertEqual({'Title': 'Rotkäppchen'}, document.attrs)
+            self.assertEqual(document, self.controller.get(docdb.id))
+            self.assertEqual(
+                {'Title': 'Rotkäppchen'},
+                self.controller.get(docdb.id).attrs,
+            )
+            self.assertEqual([document], self.controller.get_all())
+
+    def test_get_page_unknown_language(self):
+        userdb = create_user_db()
+        user = self.userui_adapter.get(userdb)
+        create_document_db(user_id=userdb.id, language_code='de')
+
+        with mock.patch('frontend.controllers.documents.app') as mock_app:
+            mock_app.storage = mock.Mock()
+            mock_app.storage.client = ObservableDict()
+            self.controller.set(user)
+
+            self.assertEqual([], self.controller.get_page('French'))
+            self.assertEqual(1, self.controller.count_pages('French'))
+
+    def test_get_sentences(self):
+        userdb = create_user_db()
+        user = self.userui_adapter.get(userdb)
+        docdb = create_document_db(user_id=userdb.id, language_code='de')
+        create_document_sentences(docdb, 10)
+        document = self.frontend_adapter.get(docdb, user)
+
+        self.assertEqual(10, self.controller.count_sentences(document))
+        returned = self.controller.get_sentences(document, 2, 4)
+        self.assertEqual(
+            ['Sentence 2.', 'Sentence 3.'],
+            [sentence.text for sentence in returned],
+        )
+        self.assertEqual('German', returned[0].language)
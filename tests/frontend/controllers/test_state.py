@@ -0,0 +1,98 @@
+"""
+Copyright (C) J Leadbetter <j@jleadbetter.com>
+Affero GPL v3
+"""
+
+import uuid
+from unittest import TestCase
+
+from frontend.controllers.state import DocumentState
+from tests.utils.documents import make_document_ui
+from tests.utils.users import make_user_ui
+
+
+class TestDocumentState(TestCase):
+    """
+    Tests for frontend.controllers.state.DocumentState
+    """
+
+    def setUp(self):
+        self.storage = {}
+        self.state = DocumentState(self.storage)
+        self.user = make_user_ui()
+
+    def test_empty_storage(self):
+        self.assertEqual([], self.state.get_all())
+        self.assertIsNone(self.state.user)
+        self.assertIsNone(self.state.current_id)
+        self.assertEqual(DocumentState.empty(), self.storage['documents'])
+
+    def test_reset_stores_user_once(self):
+        docs = [make_document_ui(user=self.user) for i in range(3)]
+        self.state.reset(self.user, docs)
+
+        data = self.storage['documents']
+        self.assertEqual(self.user.model_dump(), data['user'])
+        self.assertEqual([str(doc.id) for doc in docs], data['order'])
+        for record in data['records'].values():
+            self.assertNotIn('user', record)
+            self.assertNotIn('id', record)
+
+    def test_get_all(self):
+        docs = [make_document_ui(user=self.user) for i in range(3)]
+        self.state.reset(self.user, docs)
+
+        returned = self.state.get_all()
+        self.assertEqual(docs, returned)
+        # One user object is shared by all documents
+        self.assertIs(returned[0].user, returned[1].user)
+
+    def test_get(self):
+        docs = [make_document_ui(user=self.user) for i in range(2)]
+        self.state.reset(self.user, docs)
+
+        self.assertEqual(docs[1], self.state.get(docs[1].id))
+        self.assertIsNone(self.state.get(uuid.uuid4()))
+
+    def test_add(self):
+        self.state.reset(self.user)
+        doc = make_document_ui(user=self.user)
+        self.state.add(doc)
+        self.assertEqual([doc], self.state.get_all())
+
+    def test_add_replaces_existing(self):
+        doc = make_document_ui(user=self.user)
+        self.state.reset(self.user, [doc])
+
+        doc.displayName = 'Renamed'
+        self.state.add(doc)
+        self.assertEqual([doc], self.state.get_all())
+
+    def test_add_without_user(self):
+        doc = make_document_ui(user=self.user)
+        self.state.add(doc)
+        self.assertEqual(self.user, self.state.user)
+
+    def test_set_current(self):
+        docs = [make_document_ui(user=self.user) for i in range(2)]
+        self.state.reset(self.user, docs)
+
+        self.state.set_current(docs[1])
+        self.assertEqual(docs[1].id, self.state.current_id)
+
+        self.state.set_current(None)
+        self.assertIsNone(self.state.current_id)
+
+    def test_set_current_new_document(self):
+        self.state.reset(self.user)
+        doc = make_document_ui(user=self.user)
+
+        self.state.set_current(doc)
+        self.assertEqual(doc.id, self.state.current_id)
+        self.assertEqual([doc], self.state.get_all())
+
+    def test_count_document(self):
+        self.state.reset(self.user, languages={'de': 2})
+        self.state.count_document('de')
+        self.state.count_document('fr')
+        self.assertEqual({'de': 3, 'fr': 1}, self.state.languages)
@@ -62,6 +62,14 @@ class TestUserController(TestCase):
         returned_users = self.controller.get_all()
         self.assertEqual(expected_users, returned_users)
 
+    def test_get_summaries(self):
+        usersdb = [create_user_db() for i in range(3)]
+        returned = self.controller.get_summaries()
+        self.assertEqual(
+            [(user.id, user.username) for user in usersdb],
+            [(user.id, user.username) for user in returned],
+        )
+
     def test_get_first(self):
         usersdb = [create_user_db() for i in range(3)]
         expected_user = self.frontend_adapter.get(usersdb[0])
@@ -0,0 +1,41 @@
+"""
+Copyright (C) J Leadbetter <j@jleadbetter.com>
+Affero GPL v3
+"""
+
+import os
+from pathlib import Path
+from unittest import TestCase, mock
+
+from common.stores.app import AppStore
+from frontend.asgi import WorkerConfigurationError, check_data_store_is_shared
+from frontend.workers import WORKERS_ENV_VAR
+
+
+TEST_CONFIG_DIR = Path(__file__).resolve().parent.parent
+TEST_CONFIG = TEST_CONFIG_DIR / 'setup.cfg'
+
+
+class TestWorkers(TestCase):
+    """
+    Tests for the worker checks in frontend.asgi
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        AppStore.destroy_all()
+        super().setUpClass()
+
+    def tearDown(self):
+        AppStore.destroy_all()
+
+    def test_in_memory_single_worker(self):
+        AppStore(config=TEST_CONFIG, subsection='dev.in_memory')
+        with mock.patch.dict(os.environ, {WORKERS_ENV_VAR: '1'}):
+            check_data_store_is_shared()
+
+    def test_in_memory_several_workers(self):
+        AppStore(config=TEST_CONFIG, subsection='dev.in_memory')
+        with mock.patch.dict(os.environ, {WORKERS_ENV_VAR: '2'}):
+            with self.assertRaises(WorkerConfigurationError):
+                check_data_store_is_shared()
@@ -3,18 +3,27 @@ Copyright (C) J Leadbetter <j@jleadbetter.com>
 Affero GPL v3
 """
 
+from unittest import mock
+
 import pytest
 from nicegui import ui
 from nicegui.testing import User
 
 from common.models.settings import AppSettingsDB
 from common.stores.adapter import AdapterStore
+from common.utils.files import get_project_dir
 from frontend import main
+from frontend.controllers.documents import DocumentController
+from frontend.widgets.edit import DocumentSidebar, SentenceWindow, UploadProgress
 from tests.frontend.utils import login
 from tests.utils.documents import create_document_db
+from tests.utils.sentences import create_document_sentences
 from tests.utils.users import create_user_db
 
 
+DATA_FILE = get_project_dir() / 'scripts' / 'data' / 'en' / 'Little-Red-Riding-Hood.txt'
+
+
 @pytest.mark.asyncio
 @pytest.mark.module_under_test(main)
 async def test_redirects_when_not_logged_in(user: User):
@@ -67,4 +76,261 @@ async def test_existing_documents(user: User):
     user.find('Foo', kind=ui.button).click()
     await user.should_see('Foo', kind=ui.label)
 
+@pytest.mark.asyncio
+@pytest.mark.module_under_test(main)
+async def test_selected_document_shows_attributes(user: User):
+    settings = AdapterStore().get('AppSettingsDBPort')
+    settings.create_or_update(AppSettingsDB())
+    userdb = create_user_db()
+    create_document_db(
+        user_id=userdb.id,
+        display_name='Foo',
+        language_code='de',
+        attrs={'Title': 'Rotkäppchen'},
+    )
+    await login(user, userdb)
+
+    await user.open('/edit')
+    user.find('Foo', kind=ui.button).click()
+    await user.should_see('Title: Rotkäppchen', kind=ui.label)
+
+
+@pytest.mark.asyncio
+@pytest.mark.module_under_test(main)
+async def test_documents_are_paginated(user: User):
+    settings = AdapterStore().get('AppSettingsDBPort')
+    settings.create_or_update(AppSettingsDB())
+    userdb = create_user_db()
+    page_size = DocumentController.PAGE_SIZE
+    for i in range(page_size + 1):
+        create_document_db(
+            user_id=userdb.id,
+            display_name=f'Document {i:03}',
+            language_code='de',
+        )
+    await login(user, userdb)
+
+    await user.open('/edit')
+    await user.should_see(f'Document {page_size - 1:03}', kind=ui.button)
+    await user.should_not_see(f'Document {page_size:03}', kind=ui.button)
+    await user.should_see(kind=ui.pagination)
+
+@pytest.mark.asyncio
+@pytest.mark.module_under_test(main)
+async def test_selecting_document_keeps_sidebar(user: User):
+    settings = AdapterStore().get('AppSettingsDBPort')
+    settings.create_or_update(AppSettingsDB())
+    userdb = create_user_db()
+    for name in ('Bar', 'Foo'):
+        create_document_db(
+            user_id=userdb.id,
+            display_name=name,
+            language_code='de',
+        )
+    await login(user, userdb)
+
+    await user.open('/edit')
+    buttons = user.find(kind=ui.button).elements
+
+    user.find('Foo', kind=ui.button).click()
+    await user.should_see('Foo', kind=ui.label)
+    user.find('Bar', kind=ui.button).click()
+    await user.should_see('Bar', kind=ui.label)
+    await user.should_not_see('Choose an uploaded document', kind=ui.label)
+    labels = [label.text for label in user.find(kind=ui.label).elements]
+    assert 'Foo' not in labels
+
+    # Only the edit area changed
+    assert buttons == user.find(kind=ui.button).elements
+
+
+@pytest.mark.asyncio
+@pytest.mark.module_under_test(main)
+async def test_new_document_is_added_in_place(user: User):
+    settings = AdapterStore().get('AppSettingsDBPort')
+    settings.create_or_update(AppSettingsDB())
+    userdb = create_user_db()
+    for name in ('Doc A', 'Doc C'):
+        create_document_db(
+            user_id=userdb.id,
+            display_name=name,
+            language_code='de',
+        )
+    await login(user, userdb)
+    await user.open('/edit')
+
+    with user.client:
+        sidebar = DocumentSidebar()
+        sidebar.display()
+        section = sidebar.sections['German']
+        buttons = list(section.buttons.default_slot.children)
+
+        with open(DATA_FILE, 'rb') as datafile:
+            upload = mock.Mock()
+            upload.name = 'doc-b.txt'
+            upload.content = datafile
+            for name, language in (('Doc B', 'German'), ('Doc D', 'Spanish')):
+                controller = sidebar.document_controller
+                job = controller.start_upload({
+                    'user': sidebar.user,
+                    'display_name': name,
+                    'language': language,
+                    'upload': upload,
+                })
+                job.wait(5)
+                sidebar.add_document(controller.finish_upload(job))
+
+    children = section.buttons.default_slot.children
+    assert ['Doc A', 'Doc B', 'Doc C'] == [button.text for button in children]
+    # The existing buttons were kept
+    assert buttons == [children[0], children[2]]
+    assert ['German', 'Spanish'] == [
+        expansion.text
+        for expansion in sidebar.section_list.default_slot.children
+    ]
+
+@pytest.mark.asyncio
+@pytest.mark.module_under_test(main)
+async def test_sentences_are_shown(user: User):
+    settings = AdapterStore().get('AppSettingsDBPort')
+    settings.create_or_update(AppSettingsDB())
+    userdb = create_user_db()
+    docdb = create_document_db(
+        user_id=userdb.id,
+        display_name='Foo',
+        language_code='de',
+    )
+    create_document_sentences(docdb, 5)
+    await login(user, userdb)
+
+    await user.open('/edit')
+    user.find('Foo', kind=ui.button).click()
+    await user.should_see('Sentence 0.', kind=ui.label)
+    await user.should_see('Sentence 4.', kind=ui.label)
+
+
+@pytest.mark.asyncio
+@pytest.mark.module_under_test(main)
+async def test_sentence_window_stays_bounded(user: User):
+    settings = AdapterStore().get('AppSettingsDBPort')
+    settings.create_or_update(AppSettingsDB())
+    userdb = create_user_db()
+    docdb = create_document_db(user_id=userdb.id, language_code='de')
+    create_document_sentences(docdb, 1000)
+    await login(user, userdb)
+    await user.open('/edit')
+
+    def scroll(position, percentage):
+        return mock.Mock(
+            vertical_position=position,
+            vertical_percentage=percentage,
+        )
+
+    def shown(window):
+        return [
+            label.text
+            for column in window.container.default_slot.children
+            for label in column.default_slot.children
+        ]
+
+    with user.client:
+        controller = DocumentController()
+        summary = controller.get_page('German')[0]
+        document = controller.load_document(summary.id)
+        window = SentenceWindow(controller, document)
+        window.display()
+
+        size = SentenceWindow.WINDOW_SIZE
+        assert size * SentenceWindow.PREFETCH_WINDOWS == len(shown(window))
+
+        # Scroll to the bottom over and over
+        for position in range(1, 20):
+            window.on_scroll(scroll(position * 1000, 1.0))
+        texts = shown(window)
+        assert size * SentenceWindow.MAX_WINDOWS == len(texts)
+        assert 'Sentence 999.' == texts[-1]
+
+        # And back up again
+        for position in range(19, 0, -1):
+            window.on_scroll(scroll(position * 1000 - 1, 0.0))
+        texts = shown(window)
+        assert size * SentenceWindow.MAX_WINDOWS == len(texts)
+        assert 'Sentence 0.' == texts[0]
+
+@pytest.mark.asyncio
+@pytest.mark.module_under_test(main)
+async def test_upload_progress(user: User):
+    settings = AdapterStore().get('AppSettingsDBPort')
+    settings.create_or_update(AppSettingsDB())
+    userdb = create_user_db()
+    await login(user, userdb)
+    await user.open('/edit')
+
+    created = []
+    with user.client:
+        controller = DocumentController()
+        with open(DATA_FILE, 'rb') as datafile:
+            upload = mock.Mock()
+            upload.name = 'red.txt'
+            upload.content = datafile
+            job = controller.start_upload({
+                'user': controller.state.user,
+                'display_name': 'Red',
+                'language': 'English',
+                'upload': upload,
+            })
+            progress = UploadProgress(controller, job, created.append)
+            progress.display()
+            job.wait(5)
+
+        progress.update()
+
+    assert 1 == progress.progress_bar.value
+    assert progress.card.is_deleted
+    assert ['Red'] == [doc.displayName for doc in created]
+    assert 0 < controller.count_sentences(created[0])
+
+@pytest.mark.asyncio
+@pytest.mark.module_under_test(main)
+async def test_upload_progress_existing_document(user: User):
+    settings = AdapterStore().get('AppSettingsDBPort')
+    settings.create_or_update(AppSettingsDB())
+    userdb = create_user_db()
+    docdb = create_document_db(
+        user_id=userdb.id,
+        display_name='Red',
+        language_code='en',
+    )
+    await login(user, userdb)
+    await user.open('/edit')
+
+    created = []
+    selected = []
+    with user.client:
+        controller = DocumentController()
+        with open(DATA_FILE, 'rb') as datafile:
+            upload = mock.Mock()
+            upload.name = 'red.txt'
+            upload.content = datafile
+            job = controller.start_upload({
+                'user': controller.state.user,
+                'display_name': 'Red',
+                'language': 'English',
+                'upload': upload,
+            })
+            progress = UploadProgress(
+                controller,
+                job,
+                created.append,
+                selected.append,
+            )
+            progress.display()
+            job.wait(5)
+
+        progress.update()
+
+    # It's already in the sidebar, so it's only selected
+    assert [] == created
+    assert [docdb.id] == [doc.id for doc in selected]
+
 # TODO: tests for validation, after validation added
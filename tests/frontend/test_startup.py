@@ -0,0 +1,127 @@
+"""
+Copyright (C) J Leadbetter <j@jleadbetter.com>
+Affero GPL v3
+"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+from unittest import TestCase
+
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent.parent
+TEST_CONFIG = PROJECT_DIR / 'tests' / 'setup.cfg'
+
+# Seconds allowed to import the frontend and start the in-memory stores.
+# Override with STARTUP_IMPORT_BUDGET on slow machines.
+IMPORT_BUDGET = float(os.environ.get('STARTUP_IMPORT_BUDGET', 4.0))
+
+# Modules allowed in sys.modules after startup.
+# NiceGUI accounts for most of them; importing Django adds over 200 more.
+# Override with STARTUP_MODULE_BUDGET after upgrading dependencies.
+MODULE_BUDGET = int(os.environ.get('STARTUP_MODULE_BUDGET', 1250))
+
+# Modules the in-memory configuration must not import
+HEAVY_IMPORTS = [
+    'django',
+    'django.db',
+    'common.adapters.django_orm',
+    'common.stores.data.django',
+]
+
+STARTUP_CODE = '''
+import json
+import sys
+import time
+
+sys.path.insert(0, {project_dir!r})
+start = time.perf_counter()
+from frontend.main import startup
+startup(config={config!r}, subsection='dev.in_memory')
+print(json.dumps({{
+    'seconds': time.perf_counter() - start,
+    'modules': sorted(sys.modules),
+}}))
+'''
+
+SETTINGS_CODE = '''
+import json
+import sys
+
+sys.path.insert(0, {project_dir!r})
+sys.path.insert(0, {backend_dir!r})
+import core.settings
+from common.stores.config import ConfigStore
+config = ConfigStore({config!r}, 'dev.in_memory')
+print(json.dumps({{'subsection': config.subsection}}))
+'''
+
+
+def run_fresh(code: str) -> dict:
+    """
+    Run code in a fresh interpreter,
+    because the test process has already imported everything.
+
+    :code: Python code that prints JSON on its last line.
+
+    :return: The printed JSON.
+    """
+    # Don't let pytest-django's settings pull Django in
+    env = {
+        key: value
+        for key, value in os.environ.items()
+        if key != 'DJANGO_SETTINGS_MODULE'
+    }
+    result = subprocess.run(
+        [sys.executable, '-c', code],
+        capture_output=True,
+        check=True,
+        cwd=PROJECT_DIR,
+        env=env,
+        text=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+class TestInMemoryStartup(TestCase):
+    """
+    Import budget for frontend.main with the dev.in_memory configuration.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.startup = run_fresh(STARTUP_CODE.format(
+            project_dir=PROJECT_DIR.as_posix(),
+            config=TEST_CONFIG.as_posix(),
+        ))
+
+    def test_django_not_imported(self):
+        modules = set(self.startup['modules'])
+        # These used to import the Django data store eagerly
+        self.assertIn('common.stores.data', modules)
+        self.assertIn('common.stores.app', modules)
+        for module in HEAVY_IMPORTS:
+            self.assertNotIn(module, modules)
+
+    def test_module_budget(self):
+        self.assertLessEqual(len(self.startup['modules']), MODULE_BUDGET)
+
+    def test_import_budget(self):
+        self.assertLess(self.startup['seconds'], IMPORT_BUDGET)
+
+
+class TestDjangoSettingsStartup(TestCase):
+    """
+    Imports of the Django settings before the app sets up its stores.
+    """
+
+    def test_settings_do_not_create_config_store(self):
+        result = run_fresh(SETTINGS_CODE.format(
+            project_dir=PROJECT_DIR.as_posix(),
+            backend_dir=(PROJECT_DIR / 'backend').as_posix(),
+            config=TEST_CONFIG.as_posix(),
+        ))
+        self.assertEqual('dev.in_memory', result['subsection'])
@@ -0,0 +1,23 @@
+"""
+Copyright (C) J Leadbetter <j@jleadbetter.com>
+Affero GPL v3
+"""
+
+import os
+from unittest import TestCase, mock
+
+from frontend.workers import WORKERS_ENV_VAR, get_worker_count
+
+
+class TestWorkers(TestCase):
+    """
+    Tests for frontend.workers
+    """
+
+    def test_get_worker_count_default(self):
+        with mock.patch.dict(os.environ, {}, clear=True):
+            self.assertEqual(1, get_worker_count())
+
+    def test_get_worker_count(self):
+        with mock.patch.dict(os.environ, {WORKERS_ENV_VAR: '4'}):
+            self.assertEqual(4, get_worker_count())
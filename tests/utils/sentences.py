@@ -0,0 +1,54 @@
+"""
+Copyright (C) J Leadbetter <j@jleadbetter.com>
+Affero GPL v3
+"""
+
+from typing import List
+
+from common.models.sentences import SentenceDB
+from common.stores.adapter import AdapterStore
+from tests.utils.random_data import (
+    random_language_code,
+    random_string,
+    random_uuid,
+)
+
+
+def make_sentence_db(**kwargs) -> SentenceDB:
+    """
+    Make a SentenceDB object.
+    Not written to database.
+
+    :kwargs: arguments that will be passed to SentenceDB during creation.
+    """
+
+    random_data = {
+        'user_id': random_uuid(),
+        'language_code': random_language_code(),
+        'text': f'{random_string().title()} {random_string()}.',
+    }
+    random_data.update(kwargs)
+
+    sentence = SentenceDB(**random_data)
+    return sentence
+
+
+def create_document_sentences(document, count: int) -> List[SentenceDB]:
+    """
+    Add sentences to a document in the database.
+
+    :document: DocumentDB to add the sentences to.
+    :count: Number of sentences to add.
+    """
+    adapters = AdapterStore()
+    db_adapter = adapters.get('DocumentDBPort')
+
+    sentences = [
+        make_sentence_db(
+            user_id=document.user_id,
+            language_code=document.language_code,
+            text=f'Sentence {i}.',
+        )
+        for i in range(count)
+    ]
+    return db_adapter.add_sentences(document.id, document.user_id, sentences)
@@ -0,0 +1,50 @@
+"""
+Copyright (C) J Leadbetter <j@jleadbetter.com>
+Affero GPL v3
+"""
+
+from typing import Iterable
+
+from common.models.words import (
+    Translation,
+    UnknownBase,
+    UnknownDataBase,
+    Word,
+)
+from tests.utils.random_data import random_string
+
+
+def make_word(
+    language_code: str='nl',
+    base_word: str=None,
+    forms: Iterable[str]=(),
+    meanings: Iterable[str]=(),
+    **kwargs,
+) -> Word:
+    """
+    Make a Word of unknown type.
+    Not written to database.
+
+    :language_code: Language of the word.
+    :base_word: Base word. Defaults to a random string.
+    :forms: Texts of the word's grammar data, besides the base word.
+    :meanings: English translations of the word.
+    :kwargs: arguments that will be passed to Word during creation.
+    """
+    base_word = base_word or random_string().lower()
+    data_model = UnknownDataBase(language_code=language_code)
+    type_model = UnknownBase(language_code=language_code)
+
+    data = [data_model(text=text) for text in [base_word, *forms]]
+    translations = None
+    if meanings:
+        translations = [Translation(languageCode='en', meanings=list(meanings))]
+
+    word_data = {
+        'languageCode': language_code,
+        'baseWord': base_word,
+        'translations': translations,
+        'type': type_model(data=data),
+    }
+    word_data.update(kwargs)
+    return Word(**word_data)